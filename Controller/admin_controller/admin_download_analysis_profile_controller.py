@@ -0,0 +1,35 @@
+# controllers/admin_download_analysis_profile_controller.py
+import json
+from entity.analysis_profile import AnalysisProfile
+
+
+class AdminDownloadAnalysisProfileController:
+    def handle(self, profile_id: str, artifact: str) -> dict:
+        """
+        Return one profile artifact as downloadable content.
+        artifact: "stacks" (collapsed stacks for flamegraph.pl / speedscope)
+                  or "allocations" (tracemalloc top allocations, JSON).
+        """
+        profile = AnalysisProfile.get(profile_id)
+        if profile is None:
+            return {"ok": False, "error": "Profile not found.", "code": 404}
+
+        if artifact == "stacks":
+            return {
+                "ok": True,
+                "content": profile.get("collapsed_stacks", ""),
+                "mimetype": "text/plain",
+                "filename": f"profile_{profile_id}.folded",
+            }
+        if artifact == "allocations":
+            return {
+                "ok": True,
+                "content": json.dumps({
+                    "peak_memory_mb": profile.get("peak_memory_mb"),
+                    "traced_memory_mb": profile.get("traced_memory_mb"),
+                    "top_allocations": profile.get("top_allocations", []),
+                }, indent=2),
+                "mimetype": "application/json",
+                "filename": f"profile_{profile_id}_allocations.json",
+            }
+        return {"ok": False, "error": "Unknown artifact.", "code": 400}
@@ -0,0 +1,12 @@
+# controllers/admin_toggle_profiling_controller.py
+from entity.admin_setting import AdminSetting
+
+
+class AdminToggleProfilingController:
+    def handle(self, enabled: bool) -> dict:
+        """
+        Turn profiling of every analysis job on or off.
+        """
+        if not AdminSetting.set(AdminSetting.PROFILE_ANALYSES, bool(enabled)):
+            return {"ok": False, "error": "Could not update setting.", "code": 500}
+        return {"ok": True, "profile_all_analyses": bool(enabled)}
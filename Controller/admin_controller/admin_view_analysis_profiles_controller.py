@@ -0,0 +1,14 @@
+# controllers/admin_view_analysis_profiles_controller.py
+from entity.analysis_profile import AnalysisProfile
+from entity.admin_setting import AdminSetting
+
+
+class AdminViewAnalysisProfilesController:
+    def handle(self) -> dict:
+        """
+        Return recent profiled analysis jobs and whether profiling is on for all jobs.
+        """
+        return {
+            'profiles': AnalysisProfile.list_recent(),
+            'profile_all_analyses': bool(AdminSetting.get(AdminSetting.PROFILE_ANALYSES, False)),
+        }
@@ -2,6 +2,7 @@
 import json
 from datetime import datetime
 from db_config import get_connection
+from services.analysis_compression import pack_analysis, unpack_analysis
 
 class AnalysisSessionController:
     def __init__(self, user_id, project_id):
@@ -28,7 +29,7 @@ class AnalysisSessionController:
                 "project_id": self.project_id,
                 "channel_url": channel_url,
                 "channel_title": channel_title,
-                "analysis_data": analysis_data,
+                "analysis_data": pack_analysis(analysis_data),
                 "last_accessed": datetime.utcnow()
             }
             
@@ -64,6 +65,8 @@ class AnalysisSessionController:
             if session:
                 session['id'] = str(session['_id'])
                 del session['_id']
+                if 'analysis_data' in session:
+                    session['analysis_data'] = unpack_analysis(session['analysis_data'])
             
             return session
             
@@ -0,0 +1,46 @@
+# controller/registeredUser_controller/community_drilldown_controller.py
+from entity.youtube_community import YouTubeCommunity
+
+MAX_MEMBERS = 500
+
+
+class CommunityDrilldownController:
+    """Serves a project's stored community tree: any community's sub-communities,
+    members, influencers, keywords and cross-community bridges, without
+    rerunning detection"""
+
+    def __init__(self, user_id, project_id):
+        self.user_id = user_id
+        self.project_id = project_id
+
+    def get_community(self, path=None, member_limit=50):
+        """Community at path (the top-level list when path is None)"""
+        summary = YouTubeCommunity.get_summary(self.project_id, self.user_id)
+        if not summary:
+            return {'success': False, 'error': 'No community analysis found for this project'}
+
+        member_limit = max(0, min(int(member_limit), MAX_MEMBERS))
+        if path is None:
+            return {
+                'success': True,
+                'channel_title': summary.get('channel_title'),
+                'modularity': summary.get('modularity', 0),
+                'community': None,
+                'sub_communities': YouTubeCommunity.get_children(self.project_id, None),
+                'members': [],
+                'bridges': summary.get('bridges', [])
+            }
+
+        node = YouTubeCommunity.get_node(self.project_id, path)
+        if not node:
+            return {'success': False, 'error': f'Community {path} not found'}
+
+        return {
+            'success': True,
+            'channel_title': summary.get('channel_title'),
+            'modularity': summary.get('modularity', 0),
+            'community': node,
+            'sub_communities': YouTubeCommunity.get_children(self.project_id, path),
+            'members': YouTubeCommunity.get_node_members(self.project_id, path, member_limit) if member_limit else [],
+            'bridges': [pair for pair in summary.get('bridges', []) if node['community_id'] in pair['communities']]
+        }
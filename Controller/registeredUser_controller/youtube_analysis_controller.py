@@ -1,11 +1,34 @@
 # controller/registeredUser_controller/youtube_analysis_controller.py
 import os
+import copy
 import json
+import time
+import uuid
+from contextlib import nullcontext
 from datetime import datetime
-from services.youtube_analyzer import YouTubeAnalyzer
+from services.youtube_analyzer import YouTubeAnalyzer, REPLY_WORKER_PREFIX, MODEL_VERSION
+from services.analysis_cache import AnalysisCache
+from services.analysis_compression import pack_analysis, unpack_analysis
+from services.analysis_progress import ANALYSIS_PROGRESS
+from services.crawl_checkpoint import CrawlCheckpoint
+from services.profiler import JobProfiler
+from services.single_flight import SingleFlight
+from services.metrics import REGISTRY
+from entity.analysis_profile import AnalysisProfile
+from entity.admin_setting import AdminSetting
+from entity.youtube_comment import YouTubeComment
+from entity.youtube_community import YouTubeCommunity
 from Controller.registeredUser_controller.analysis_session_controller import AnalysisSessionController
 from db_config import get_connection
 
+# Default for analyze_youtube(incremental=...): warm-start community detection
+# from the project's last saved partition
+INCREMENTAL_COMMUNITIES = os.getenv('INCREMENTAL_COMMUNITIES', '0') == '1'
+
+# Identical analyses in flight share one crawl; every caller gets its own copy
+# of the result so each project's save/session step stays independent.
+ANALYSIS_FLIGHTS = SingleFlight(copy_result=copy.deepcopy)
+
 class YouTubeAnalysisController:
     def __init__(self, user_id, project_id):
         self.user_id = user_id
@@ -18,19 +41,87 @@ class YouTubeAnalysisController:
         
         self.analyzer = YouTubeAnalyzer(self.api_key)
     
-    def analyze_youtube(self, input_url, progress_callback=None):
-        """Analyze YouTube channel or video and save results"""
+    def analyze_youtube(self, input_url, progress_callback=None, profile=False, refresh=False, partial_callback=None,
+                        incremental=None):
+        """Analyze YouTube channel or video and save results
+        
+        With profile=True (or the admin "profile all analyses" setting) the
+        job runs under a JobProfiler and its artifacts are saved to
+        analysis_profiles, linked to the stored analysis.
+        
+        Concurrent requests for the same channel/video and analysis settings
+        attach to the one already running (see analysis_key); each caller still
+        saves the result to its own project.
+        
+        Results are also shared across projects through AnalysisCache: a fresh
+        cached result is reused as is, a cached crawl is re-analyzed without
+        API calls. refresh=True skips the cache and crawls again.
+        
+        progress_callback(message, percent) and partial_callback(kind, data)
+        follow the analysis, also when it was coalesced into another request.
+        
+        With incremental=True (default INCREMENTAL_COMMUNITIES) communities
+        are updated from the project's last saved partition, keeping their
+        ids. Such a result depends on the project, so it is coalesced and
+        cached per project rather than per channel.
+        """
         try:
+            # Crawl progress is checkpointed per user/project/input, so
+            # resubmitting a failed analysis resumes instead of starting over
+            checkpoint = CrawlCheckpoint(
+                f"{self.user_id}:{self.project_id}:{input_url.strip()}",
+                db=get_connection()
+            )
+            
+            profile = profile or AdminSetting.get(AdminSetting.PROFILE_ANALYSES, False)
+            profiler = None
+            if profile:
+                # Per-job worker names, so overlapping profiled jobs sample only their own workers
+                self.analyzer.worker_prefix = f"{REPLY_WORKER_PREFIX}-{uuid.uuid4().hex[:8]}"
+                profiler = JobProfiler(worker_prefixes=(self.analyzer.worker_prefix,))
+            
+            incremental = INCREMENTAL_COMMUNITIES if incremental is None else incremental
+            community_seed = YouTubeCommunity.get_partition(self.project_id) if incremental else None
+            
             # Run analysis with auto-detection
-            result = self.analyzer.analyze(input_url, progress_callback)
+            with profiler or nullcontext():
+                key = self.analysis_key(input_url)
+                if community_seed:
+                    key += f"|seed={self.user_id}:{self.project_id}"
+                flight = (key, refresh)
+                with ANALYSIS_PROGRESS.subscribed(flight, progress_callback, partial_callback):
+                    result, shared = ANALYSIS_FLIGHTS.do(
+                        flight,
+                        lambda: self.run_analysis(key, input_url, *ANALYSIS_PROGRESS.callbacks(flight),
+                                                  checkpoint=checkpoint, refresh=refresh,
+                                                  community_seed=community_seed)
+                    )
             
+            if shared:
+                print(f"[CONTROLLER] Joined in-flight analysis of {input_url} for project_id: {self.project_id}")
+                REGISTRY.inc('orbitlink_analysis_coalesced_total')
+                if result.get('success'):
+                    result['data']['coalesced'] = True
+            
+            analysis_id = None
             if result['success']:
+                # Per-member rows and the sub-community tree go to the community
+                # store, not the analysis document
+                community_detection = result['data'].get('community_detection', {})
+                members = community_detection.pop('members', None)
+                hierarchy = community_detection.pop('hierarchy', None)
+                
                 # Save results to database
-                self.save_analysis_result(input_url, result['data'])
+                analysis_id = self.save_analysis_result(input_url, result['data'])
+                self.save_community_store(input_url, result['data'], members, hierarchy, analysis_id)
                 
                 # Save to session storage for immediate access
                 self.save_to_session_storage(input_url, result['data'])
             
+            # A coalesced request only waited, so its profile would be empty
+            if profiler and profiler.result and not shared:
+                self.save_profile(input_url, profiler.result, analysis_id)
+            
             return result
             
         except Exception as e:
@@ -39,6 +130,55 @@ class YouTubeAnalysisController:
             traceback.print_exc()
             return {'success': False, 'error': str(e)}
     
+    def analysis_key(self, input_url):
+        """Coalescing/cache key: canonical channel/video plus the analysis settings"""
+        try:
+            target = self.analyzer.canonical_target(input_url)
+        except ValueError:
+            target = f"url:{input_url.strip()}"
+        params = self.analyzer.analysis_params()
+        return "|".join([target] + [f"{name}={value}" for name, value in sorted(params.items())])
+    
+    def run_analysis(self, key, input_url, progress_callback=None, partial_callback=None, checkpoint=None, refresh=False,
+                     community_seed=None):
+        """Serve the analysis from the shared cache when fresh enough, otherwise crawl"""
+        cache = AnalysisCache(db=get_connection())
+        self.analyzer.community_seed = community_seed
+        
+        if not refresh:
+            tier, cached = cache.lookup(key, MODEL_VERSION)
+            if tier == 'result':
+                print(f"[CONTROLLER] Serving cached analysis of {key} ({cached['cache']['age_minutes']} min old)")
+                if progress_callback:
+                    progress_callback('Loaded recent analysis from cache', 100)
+                return {'success': True, 'data': cached}
+            if tier == 'raw':
+                print(f"[CONTROLLER] Rebuilding analysis of {key} from cached comments")
+                result = self.analyzer.analyze_raw(cached, progress_callback, partial_callback)
+                result.pop('raw', None)
+                if result['success']:
+                    cache.put_result(key, MODEL_VERSION, result['data'])
+                    result['data']['cache'] = cached['cache']
+                return result
+        
+        result = self.analyzer.analyze(input_url, progress_callback, checkpoint, partial_callback)
+        raw = result.pop('raw', None)
+        if result['success'] and raw:
+            cache.put(key, MODEL_VERSION, result['data'], raw)
+            self.store_comments(raw['comments'], result['data'])
+        return result
+    
+    def store_comments(self, comments, result_data):
+        """Upsert a fresh crawl into the normalized youtube_comments collection"""
+        start = time.perf_counter()
+        counts = YouTubeComment.upsert_many(comments)
+        trace = self.analyzer.trace
+        if trace and result_data.get('metrics'):
+            result_data['metrics']['stages']['comment_store'] = trace.record_stage(
+                'comment_store', time.perf_counter() - start, items=len(comments)
+            )
+        print(f"[CONTROLLER] Stored comments: {counts['upserted']} new, {counts['matched']} already known")
+    
     def analyze_channel(self, channel_url, progress_callback=None):
         """Legacy method for channel analysis (backward compatibility)"""
         return self.analyzer.analyze_channel(channel_url, progress_callback)
@@ -48,10 +188,13 @@ class YouTubeAnalysisController:
         return self.analyzer.analyze_video(video_url, progress_callback)
     
     def save_analysis_result(self, input_url, result):
-        """Save analysis results to database with project-specific storage"""
+        """Save analysis results to database with project-specific storage
+        
+        Returns the new document's id as a string (None if not saved).
+        """
         db = get_connection()
         if db is None:
-            return
+            return None
         
         try:
             # Get title based on analysis type
@@ -68,17 +211,66 @@ class YouTubeAnalysisController:
                 "project_id": self.project_id,
                 "channel_url": input_url,
                 "channel_title": channel_title,
-                "analysis_data": result,
+                "analysis_data": pack_analysis(result),
                 "created_at": datetime.utcnow()
             }
             
-            db.youtube_analysis.insert_one(analysis_doc)
+            start = time.perf_counter()
+            inserted = db.youtube_analysis.insert_one(analysis_doc)
+            
+            # The save itself is the last stage of the trace stored with the document
+            trace = self.analyzer.trace
+            if trace and result.get('metrics'):
+                db_save = trace.record_stage('db_save', time.perf_counter() - start, items=1)
+                result['metrics']['stages']['db_save'] = db_save
+                db.youtube_analysis.update_one(
+                    {"_id": inserted.inserted_id},
+                    {"$set": {"analysis_data.metrics.stages.db_save": db_save}}
+                )
             print(f"Analysis saved to database for project_id: {self.project_id}")
+            return str(inserted.inserted_id)
             
         except Exception as e:
             print(f"Error saving analysis to database: {e}")
             import traceback
             traceback.print_exc()
+            return None
+    
+    def save_community_store(self, input_url, result, members, hierarchy=None, analysis_id=None):
+        """Persist the project's communities and members to the community store
+        (YouTubeCommunity), which serves the project's community data view"""
+        if members is None:
+            return False
+        if result.get('analysis_type') == 'video':
+            channel_title = result.get('video_metadata', {}).get('channel_title', 'Unknown')
+        else:
+            channel_title = result.get('channel_metadata', {}).get('title', 'Channel Analysis')
+        saved = YouTubeCommunity.save_project(
+            self.user_id, self.project_id, analysis_id, input_url, channel_title,
+            {**result['community_detection'], 'members': members, 'hierarchy': hierarchy or []},
+            result.get('total_comments', 0)
+        )
+        if saved:
+            print(f"[CONTROLLER] Stored {len(members)} community members for project_id: {self.project_id}")
+        return saved
+    
+    def save_profile(self, input_url, profile, analysis_id=None):
+        """Store a job's profiling artifacts and link them from the analysis document"""
+        profile_id = AnalysisProfile.save(self.user_id, self.project_id, input_url, profile, analysis_id)
+        if not profile_id:
+            return None
+        
+        print(f"[PROFILE] Saved profile {profile_id} ({profile['samples']} samples, "
+              f"peak {profile['peak_memory_mb']} MB) for project_id: {self.project_id}")
+        
+        db = get_connection()
+        if analysis_id and db is not None:
+            try:
+                from bson import ObjectId
+                db.youtube_analysis.update_one({"_id": ObjectId(analysis_id)}, {"$set": {"profile_id": profile_id}})
+            except Exception as e:
+                print(f"Error linking profile to analysis: {e}")
+        return profile_id
     
     def save_to_session_storage(self, input_url, result_data):
         """Save analysis to session storage for immediate frontend access"""
@@ -132,6 +324,8 @@ class YouTubeAnalysisController:
             for analysis in analyses:
                 analysis['id'] = str(analysis['_id'])
                 del analysis['_id']
+                if 'analysis_data' in analysis:
+                    analysis['analysis_data'] = unpack_analysis(analysis['analysis_data'])
             
             print(f"Fetched {len(analyses)} analyses for project_id: {self.project_id}")
             return analyses
@@ -164,6 +358,8 @@ class YouTubeAnalysisController:
             if result:
                 result['id'] = str(result['_id'])
                 del result['_id']
+                if 'analysis_data' in result:
+                    result['analysis_data'] = unpack_analysis(result['analysis_data'])
                 print(f"Retrieved analysis {analysis_id} for project_id: {self.project_id}")
             
             return result
@@ -211,7 +407,7 @@ class YouTubeAnalysisController:
                 
                 # Extract summary information from analysis_data
                 if 'analysis_data' in analysis:
-                    data = analysis['analysis_data']
+                    data = analysis['analysis_data'] = unpack_analysis(analysis['analysis_data'])
                     analysis['videos_analyzed'] = data.get('videos_analyzed')
                     analysis['total_comments'] = data.get('total_comments')
             
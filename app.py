@@ -33,6 +33,7 @@ from boundary.registeredUser_boundary.contact_support_ui import contact_support_
 # admin user boundaries
 from boundary.admin_boundary.admin_api_boundary import admin_api_bp
 from boundary.admin_boundary.admin_ui_boundary import admin_ui_bp
+from boundary.admin_boundary.metrics_boundary import metrics_bp
 
 import logging
 import sys 
@@ -63,6 +64,7 @@ app.register_blueprint(admin_api_bp)
 app.register_blueprint(admin_ui_bp)
 app.register_blueprint(review_bp)
 app.register_blueprint(contact_support_bp)
+app.register_blueprint(metrics_bp)
 
 # YouTube API configuration
 app.config['YOUTUBE_API_KEY'] = os.getenv('YOUTUBE_API_KEY')
@@ -0,0 +1,114 @@
+"""
+Benchmark: storage and transfer size of analysis documents, plain vs compressed.
+
+For each analysis, encodes analysis_data as stored before (plain nested BSON)
+and as services/analysis_compression.pack_analysis stores it now, and reports
+the BSON size, compression ratio, pack/unpack time and the time to move each
+document over a link of --mbps megabits per second.
+
+Saved analyses (youtube_analysis and analysis_sessions, newest first; both
+plain and already compressed documents are read):
+Run: python benchmarks/bench_analysis_compression.py --mongo --limit 20
+
+Without a database, analyses are produced through the local fake YouTube API
+from recorded comment videos and a synthetic channel:
+Run: python benchmarks/bench_analysis_compression.py --mbps 50
+"""
+import argparse
+import statistics
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import bson
+
+from services.analysis_compression import _codec, pack_analysis, unpack_analysis
+
+
+def saved_analyses(limit):
+    from db_config import get_connection
+    db = get_connection()
+    if db is None:
+        raise SystemExit("MongoDB not reachable")
+    for collection in ("youtube_analysis", "analysis_sessions"):
+        for doc in db[collection].find({}, {"analysis_data": 1}).sort("_id", -1).limit(limit):
+            if doc.get("analysis_data"):
+                yield f"{collection}/{doc['_id']}", unpack_analysis(doc["analysis_data"])
+
+
+def fake_analyses(sentiment):
+    from benchmarks.fake_youtube_api import FakeYouTubeDataset, FakeYouTubeServer, RECORDED_COMMENTS_CSV
+    import services.youtube_analyzer as ya
+
+    if not sentiment:
+        ya.run_sentiment_analysis = lambda comments, on_progress=None: {
+            "overall_score": 0,
+            "label_counts": {"positive": 0, "neutral": 0, "negative": 0},
+            "word_cloud": None,
+            "pie_chart": None,
+            "top_like_comments": [],
+        }
+
+    recorded = FakeYouTubeDataset.from_csv(RECORDED_COMMENTS_CSV)
+    synthetic = FakeYouTubeDataset.synthetic(num_videos=5, threads_per_video=400, seed=5)
+    runs = [(f"recorded video {video_id}", recorded, f"https://www.youtube.com/watch?v={video_id}")
+            for video_id in list(recorded.videos)[:3]]
+    runs.append(("synthetic channel", synthetic, "https://www.youtube.com/@syntheticchannel"))
+
+    for label, dataset, url in runs:
+        with FakeYouTubeServer(dataset) as server:
+            analyzer = ya.YouTubeAnalyzer("fake-key", api_endpoint=server.endpoint)
+            result = analyzer.analyze(url)
+        if not result["success"]:
+            raise SystemExit(f"{label} analysis failed: {result.get('error')}")
+        result["data"]["community_detection"].pop("members", None)
+        yield label, result["data"]
+
+
+def measure(analysis_data, repeat):
+    plain = bson.encode({"analysis_data": analysis_data})
+
+    pack_times, unpack_times = [], []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        packed = bson.encode({"analysis_data": pack_analysis(analysis_data)})
+        pack_times.append(time.perf_counter() - start)
+
+        start = time.perf_counter()
+        unpack_analysis(bson.decode(packed)["analysis_data"])
+        unpack_times.append(time.perf_counter() - start)
+
+    return len(plain), len(packed), statistics.median(pack_times), statistics.median(unpack_times)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Analysis document compression benchmark")
+    parser.add_argument("--mongo", action="store_true", help="Use saved analyses from MongoDB")
+    parser.add_argument("--limit", type=int, default=10, help="Documents per collection (with --mongo)")
+    parser.add_argument("--sentiment", action="store_true", help="Run the sentiment model (fake API mode)")
+    parser.add_argument("--mbps", type=float, default=50.0, help="Link speed for the transfer estimate")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    analyses = saved_analyses(args.limit) if args.mongo else fake_analyses(args.sentiment)
+    bytes_per_second = args.mbps * 1_000_000 / 8
+
+    print(f"[INFO] codec {_codec()}, link {args.mbps} Mbit/s")
+    total_plain = total_packed = 0
+    for label, analysis_data in analyses:
+        plain, packed, pack_seconds, unpack_seconds = measure(analysis_data, args.repeat)
+        total_plain += plain
+        total_packed += packed
+        print(f"[RESULT] {label:<40} {plain / 1024:9.1f} KB -> {packed / 1024:8.1f} KB "
+              f"({plain / packed:5.1f}x)  pack {pack_seconds * 1000:6.1f} ms  unpack {unpack_seconds * 1000:6.1f} ms  "
+              f"transfer {plain / bytes_per_second * 1000:7.1f} -> {packed / bytes_per_second * 1000:6.1f} ms")
+
+    if total_packed:
+        print(f"[RESULT] {'total':<40} {total_plain / 1024:9.1f} KB -> {total_packed / 1024:8.1f} KB "
+              f"({total_plain / total_packed:5.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
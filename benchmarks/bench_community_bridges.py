@@ -0,0 +1,68 @@
+"""
+Benchmark: cross-community bridges of services/community_bridges.py.
+
+Builds a reply graph of --nodes users in --communities groups with
+--edges edges, a share of them (--cross) between random groups, and times
+community_bridges with its sampled betweenness. For reference, networkx's
+sampled betweenness is timed on a few sources.
+
+Run: python benchmarks/bench_community_bridges.py --nodes 200000 --edges 1000000
+"""
+import argparse
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import networkx as nx
+import numpy as np
+
+from services.community_bridges import BETWEENNESS_SAMPLES, community_bridges
+
+
+def synthetic(num_nodes, num_edges, num_communities, cross, seed=1):
+    rng = np.random.default_rng(seed)
+    community = rng.integers(0, num_communities, num_nodes)
+    order = np.argsort(community)
+    position = np.empty(num_nodes, dtype=np.int64)
+    position[order] = np.arange(num_nodes)
+    # Partners are nearby in community order, so mostly in the same community
+    u = rng.integers(0, num_nodes, num_edges)
+    v = order[np.clip(position[u] + rng.integers(-200, 200, num_edges), 0, num_nodes - 1)]
+    between = rng.random(num_edges) < cross
+    v[between] = rng.integers(0, num_nodes, between.sum())
+    G = nx.Graph()
+    G.add_edges_from(zip(u.tolist(), v.tolist()), weight=1)
+    return G, {node: int(community[node]) for node in G}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Community bridge benchmark")
+    parser.add_argument("--nodes", type=int, default=200000)
+    parser.add_argument("--edges", type=int, default=1000000)
+    parser.add_argument("--communities", type=int, default=300)
+    parser.add_argument("--cross", type=float, default=0.02)
+    parser.add_argument("--samples", type=int, default=BETWEENNESS_SAMPLES)
+    parser.add_argument("--networkx-sources", type=int, default=2)
+    args = parser.parse_args()
+
+    G, partition = synthetic(args.nodes, args.edges, args.communities, args.cross)
+    print(f"[INFO] {G.number_of_nodes()} nodes, {G.number_of_edges()} edges, {args.communities} communities")
+
+    start = time.perf_counter()
+    bridges = community_bridges(G, partition, samples=args.samples)
+    seconds = time.perf_counter() - start
+    print(f"[RESULT] community_bridges ({bridges['betweenness_samples']} sources): {seconds:.2f}s, "
+          f"{len(bridges['pairs'])} pairs listed")
+
+    if args.networkx_sources:
+        start = time.perf_counter()
+        nx.betweenness_centrality(G, k=args.networkx_sources, seed=0)
+        per_source = (time.perf_counter() - start) / args.networkx_sources
+        print(f"[RESULT] networkx betweenness: {per_source:.2f}s per source "
+              f"(~{per_source * bridges['betweenness_samples']:.0f}s for the same sample)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+"""
+Benchmark: single Louvain run vs the seeded ensemble of services/community_ensemble.py.
+
+Builds a planted-partition graph and times one best_partition run, the
+ensemble with its runs in-process and the ensemble on a process pool, and
+reports modularity, NMI to the planted groups and the ensemble's stability.
+With as many workers as runs, the pooled ensemble should take about one run
+plus pool start-up.
+
+Run: python benchmarks/bench_community_ensemble.py --groups 200 --size 100 --runs 8
+"""
+import argparse
+import os
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import community as community_louvain
+import networkx as nx
+
+import services.community_ensemble as ensemble
+
+
+def timed(label, fn, truth):
+    start = time.perf_counter()
+    partition, modularity, stability = fn()
+    seconds = time.perf_counter() - start
+    nmi = ensemble.normalized_mutual_information(partition, truth)
+    print(f"[RESULT] {label:<22} {seconds:8.2f}s  modularity {modularity:.4f}  NMI to planted {nmi:.4f}")
+    if stability:
+        print(f"         stability: {stability}")
+    return seconds
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Louvain ensemble benchmark")
+    parser.add_argument("--groups", type=int, default=200)
+    parser.add_argument("--size", type=int, default=100)
+    parser.add_argument("--p-in", type=float, default=0.08)
+    parser.add_argument("--p-out", type=float, default=0.0004)
+    parser.add_argument("--runs", type=int, default=8)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--method", choices=("best", "consensus"), default="best")
+    args = parser.parse_args()
+
+    G = nx.planted_partition_graph(args.groups, args.size, args.p_in, args.p_out, seed=1)
+    truth = {node: group for group, nodes in enumerate(G.graph["partition"]) for node in nodes}
+    print(f"[INFO] {G.number_of_nodes()} nodes, {G.number_of_edges()} edges, "
+          f"{args.runs} runs, {args.workers} workers, {os.cpu_count()} CPUs")
+
+    def single():
+        partition = community_louvain.best_partition(G)
+        return partition, community_louvain.modularity(partition, G), None
+
+    single_seconds = timed("single run", single, truth)
+    timed("ensemble in-process", lambda: ensemble.ensemble_partition(
+        G, runs=args.runs, method=args.method, workers=1), truth)
+    ensemble.PARALLEL_MIN_EDGES = 0
+    pooled_seconds = timed("ensemble process pool", lambda: ensemble.ensemble_partition(
+        G, runs=args.runs, method=args.method, workers=args.workers), truth)
+    print(f"[RESULT] pooled ensemble / single run: {pooled_seconds / single_seconds:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
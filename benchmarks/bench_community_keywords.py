@@ -0,0 +1,69 @@
+"""
+Benchmark: c-TF-IDF keyword index of services/community_keywords.py.
+
+Generates comments whose authors belong to nested communities (each with a
+few favourite words over a shared Zipf-like vocabulary) and times
+keyword_index over every community and sub-community in one pass.
+
+Run: python benchmarks/bench_community_keywords.py --comments 1000000 --communities 300
+"""
+import argparse
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import numpy as np
+
+from services.community_keywords import keyword_index
+
+
+def synthetic(num_comments, num_communities, num_authors, vocab_size, seed=1):
+    rng = np.random.default_rng(seed)
+    # Letters only, so every word is a token
+    digits = str.maketrans("0123456789", "abcdefghij")
+    vocab = np.array([f"w{i:05d}".translate(digits) for i in range(vocab_size)], dtype=object)
+    shared = 1 / np.arange(1, vocab_size + 1)
+    shared /= shared.sum()
+
+    community = rng.integers(0, num_communities, num_authors)
+    author_groups = {f"a{a}": [str(c), f"{c}.{a % 3 + 1}"] for a, c in enumerate(community)}
+    favourites = rng.integers(0, vocab_size, (num_communities, 5))
+
+    authors = rng.integers(0, num_authors, num_comments)
+    words = rng.choice(vocab_size, (num_comments, 8), p=shared)
+    own = rng.random((num_comments, 8)) < 0.25
+    rows = np.nonzero(own)[0]
+    words[own] = favourites[community[authors[rows]], rng.integers(0, 5, len(rows))]
+    comments = [{'author_id': f"a{a}", 'text': " ".join(vocab[row])} for a, row in zip(authors, words)]
+    return comments, author_groups, favourites, vocab
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Community keyword index benchmark")
+    parser.add_argument("--comments", type=int, default=200000)
+    parser.add_argument("--communities", type=int, default=300)
+    parser.add_argument("--authors", type=int, default=50000)
+    parser.add_argument("--vocab", type=int, default=20000)
+    args = parser.parse_args()
+
+    comments, author_groups, favourites, vocab = synthetic(args.comments, args.communities, args.authors, args.vocab)
+    print(f"[INFO] {len(comments)} comments, {len(author_groups)} authors, {args.communities} communities")
+
+    start = time.perf_counter()
+    keywords = keyword_index(comments, author_groups)
+    seconds = time.perf_counter() - start
+
+    top = [c for c in range(args.communities) if str(c) in keywords]
+    hits = np.mean([
+        len({k['term'] for k in keywords[str(c)][:5]} & set(vocab[favourites[c]])) / len(set(favourites[c]))
+        for c in top
+    ])
+    print(f"[RESULT] {len(keywords)} groups indexed in {seconds:.2f}s "
+          f"({len(comments) / seconds:,.0f} comments/s)")
+    print(f"[RESULT] planted words among each community's top 5 terms: {hits:.1%}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+"""
+Benchmark: community statistics in detect_communities, per-comment loop vs grouped pass.
+
+The previous aggregation walked every comment, checked membership with
+`author_id not in stats['members']` on a list and updated a running sentiment
+average; with one large community that check is linear per comment, so the
+loop is quadratic in the community size. YouTubeAnalyzer._community_statistics
+aggregates with pandas groupbys instead. Both run on the same synthetic
+comments (--communities communities over --members commenters) and their
+totals are compared.
+
+Run: python benchmarks/bench_community_stats.py --members 20000 --comments 100000 --communities 1
+"""
+import argparse
+import sys
+import time
+from collections import defaultdict
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import numpy as np
+
+from services.youtube_analyzer import YouTubeAnalyzer
+
+
+def synthetic(num_members, num_comments, num_communities, seed=1):
+    rng = np.random.default_rng(seed)
+    authors = rng.integers(0, num_members, num_comments)
+    likes = rng.poisson(2, num_comments)
+    sentiment = rng.uniform(-1, 1, num_comments)
+    comments = [
+        {'author_id': f"UC{a}", 'author_name': f"@user{a}", 'like_count': int(l), 'sentiment_polarity': float(p)}
+        for a, l, p in zip(authors, likes, sentiment)
+    ]
+    partition = {f"UC{a}": a % num_communities for a in range(num_members)}
+    edges = [{'from': f"UC{a}", 'to': f"UC{b}"} for a, b in rng.integers(0, num_members, (num_comments // 2, 2))]
+    return comments, edges, partition
+
+
+def legacy_statistics(all_comments, user_to_community):
+    """The per-comment loop detect_communities used before"""
+    community_stats = defaultdict(lambda: {
+        'members': [],
+        'member_names': [],
+        'total_comments': 0,
+        'total_likes': 0,
+        'avg_sentiment': 0,
+        'sentiment_count': 0
+    })
+    for comment in all_comments:
+        author_id = comment['author_id']
+        if author_id in user_to_community:
+            stats = community_stats[user_to_community[author_id]]
+            if author_id not in stats['members']:
+                stats['members'].append(author_id)
+                stats['member_names'].append(comment['author_name'])
+            stats['total_comments'] += 1
+            stats['total_likes'] += comment['like_count']
+            stats['avg_sentiment'] = (stats['avg_sentiment'] * stats['sentiment_count'] +
+                                      comment['sentiment_polarity']) / (stats['sentiment_count'] + 1)
+            stats['sentiment_count'] += 1
+    return community_stats
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Community statistics benchmark")
+    parser.add_argument("--members", type=int, default=20000)
+    parser.add_argument("--comments", type=int, default=100000)
+    parser.add_argument("--communities", type=int, default=1)
+    args = parser.parse_args()
+
+    comments, edges, partition = synthetic(args.members, args.comments, args.communities)
+    analyzer = YouTubeAnalyzer.__new__(YouTubeAnalyzer)
+    print(f"[INFO] {len(comments)} comments, {args.members} members, {args.communities} communities")
+
+    start = time.perf_counter()
+    legacy = legacy_statistics(comments, partition)
+    legacy_seconds = time.perf_counter() - start
+    print(f"[RESULT] per-comment loop  {legacy_seconds:8.2f}s")
+
+    start = time.perf_counter()
+    grouped, members = analyzer._community_statistics(comments, edges, partition)
+    grouped_seconds = time.perf_counter() - start
+    print(f"[RESULT] grouped pass      {grouped_seconds:8.2f}s  (includes {len(members)} member records)")
+    print(f"[RESULT] speed-up: {legacy_seconds / grouped_seconds:.1f}x")
+
+    for comm_id, stats in grouped.items():
+        old = legacy[comm_id]
+        assert stats['size'] == len(old['members'])
+        assert stats['total_comments'] == old['total_comments'] and stats['total_likes'] == old['total_likes']
+        assert abs(stats['avg_sentiment'] - round(old['avg_sentiment'], 3)) <= 0.001
+    print("[RESULT] totals match the per-comment loop")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,116 @@
+"""
+Benchmark: YouTube Data API payload size and parse time with/without field masks.
+
+Issues every request YouTubeAnalyzer makes for one channel/video twice, once as
+a full response and once with the partial-response mask from
+services/youtube_analyzer.py, and reports bytes transferred and JSON parse time.
+
+Run: python benchmarks/bench_field_masks.py --video <VIDEO_ID> --channel <UC...>
+     python benchmarks/bench_field_masks.py --fake   (local fake API, no key needed)
+"""
+import argparse
+import json
+import os
+import sys
+import time
+from pathlib import Path
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from dotenv import load_dotenv
+from services import youtube_analyzer as ya
+
+
+def _strip_fields(uri):
+    """Return the same request URI without its `fields` parameter."""
+    parts = urlsplit(uri)
+    query = [(k, v) for k, v in parse_qsl(parts.query) if k != "fields"]
+    return urlunsplit(parts._replace(query=urlencode(query)))
+
+
+def _fetch(http, uri, repeats):
+    """Fetch a URI, returning (bytes, best parse seconds)."""
+    resp, content = http.request(uri, method="GET")
+    if resp.status != 200:
+        raise RuntimeError(f"HTTP {resp.status}: {content[:200]!r}")
+
+    best = float("inf")
+    for _ in range(repeats):
+        start = time.perf_counter()
+        json.loads(content)
+        best = min(best, time.perf_counter() - start)
+    return len(content), best
+
+
+def build_requests(youtube, video_id, channel_id):
+    """The masked requests issued by YouTubeAnalyzer, keyed by a short label."""
+    requests = {
+        "commentThreads.list": youtube.commentThreads().list(
+            part="snippet,replies", videoId=video_id, maxResults=100,
+            order="relevance", fields=ya.COMMENT_THREAD_FIELDS),
+        "videos.list (metadata)": youtube.videos().list(
+            part="snippet,statistics", id=video_id,
+            fields=ya.VIDEO_METADATA_FIELDS),
+    }
+    if channel_id:
+        requests["channels.list (metadata)"] = youtube.channels().list(
+            part="snippet,statistics,brandingSettings,topicDetails",
+            id=channel_id, fields=ya.CHANNEL_METADATA_FIELDS)
+        requests["search.list (videos)"] = youtube.search().list(
+            part="id,snippet", channelId=channel_id, type="video",
+            order="date", maxResults=50, fields=ya.VIDEO_SEARCH_FIELDS)
+        requests["videos.list (details)"] = youtube.videos().list(
+            part="statistics,snippet,contentDetails", id=video_id,
+            fields=ya.VIDEO_DETAILS_FIELDS)
+    return requests
+
+
+def main():
+    load_dotenv()
+    parser = argparse.ArgumentParser(description="Field mask payload benchmark")
+    parser.add_argument("--video", help="Video ID to sample")
+    parser.add_argument("--channel", help="Channel ID (UC...) to sample")
+    parser.add_argument("--repeats", type=int, default=20, help="Parse repetitions")
+    parser.add_argument("--fake", action="store_true", help="Use the local fake API with synthetic data")
+    args = parser.parse_args()
+
+    if args.fake:
+        from fake_youtube_api import FakeYouTubeDataset, FakeYouTubeServer
+
+        dataset = FakeYouTubeDataset.synthetic(num_videos=1, threads_per_video=300)
+        server = FakeYouTubeServer(dataset).start()
+        args.channel = next(iter(dataset.channels))
+        args.video = next(iter(dataset.videos))
+        analyzer = ya.YouTubeAnalyzer("fake-key", api_endpoint=server.endpoint)
+    else:
+        api_key = os.getenv("YOUTUBE_API_KEY")
+        if not api_key or not args.video:
+            print("❌ YOUTUBE_API_KEY and --video are required (or use --fake)")
+            sys.exit(1)
+        analyzer = ya.YouTubeAnalyzer(api_key)
+    http = analyzer.youtube._http
+
+    print(f"{'request':<28}{'full B':>10}{'masked B':>10}{'saved':>8}"
+          f"{'full ms':>10}{'masked ms':>11}")
+    print("-" * 77)
+    totals = [0, 0, 0.0, 0.0]
+    for label, request in build_requests(analyzer.youtube, args.video, args.channel).items():
+        full_bytes, full_parse = _fetch(http, _strip_fields(request.uri), args.repeats)
+        masked_bytes, masked_parse = _fetch(http, request.uri, args.repeats)
+        saved = 1 - masked_bytes / full_bytes if full_bytes else 0
+        print(f"{label:<28}{full_bytes:>10}{masked_bytes:>10}{saved:>8.0%}"
+              f"{full_parse * 1000:>10.3f}{masked_parse * 1000:>11.3f}")
+        totals[0] += full_bytes
+        totals[1] += masked_bytes
+        totals[2] += full_parse
+        totals[3] += masked_parse
+
+    print("-" * 77)
+    saved = 1 - totals[1] / totals[0] if totals[0] else 0
+    print(f"{'total':<28}{totals[0]:>10}{totals[1]:>10}{saved:>8.0%}"
+          f"{totals[2] * 1000:>10.3f}{totals[3] * 1000:>11.3f}")
+
+
+if __name__ == "__main__":
+    main()
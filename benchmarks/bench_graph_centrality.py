@@ -0,0 +1,60 @@
+"""
+Benchmark: reply-graph centrality of services/graph_centrality.py.
+
+Generates --replies reply edges between --users commenters, with
+preferential attachment so a few users collect most replies, and times
+each stage: sparse matrix build, PageRank, HITS and k-core numbers, plus
+the full reply_graph_centrality call.
+
+Run: python benchmarks/bench_graph_centrality.py --users 300000 --replies 1000000
+"""
+import argparse
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import numpy as np
+
+from services.graph_centrality import core_numbers, hits, pagerank, reply_graph_centrality, reply_matrix
+
+
+def synthetic(num_users, num_replies, seed=1):
+    rng = np.random.default_rng(seed)
+    popularity = 1 / np.arange(1, num_users + 1) ** 0.8
+    popularity /= popularity.sum()
+    sources = rng.integers(0, num_users, num_replies)
+    targets = rng.choice(num_users, num_replies, p=popularity)
+    return [{'from': f"UC{a}", 'to': f"UC{b}"} for a, b in zip(sources, targets)]
+
+
+def timed(label, fn):
+    start = time.perf_counter()
+    result = fn()
+    print(f"[RESULT] {label:<22} {time.perf_counter() - start:7.2f}s")
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Reply-graph centrality benchmark")
+    parser.add_argument("--users", type=int, default=300000)
+    parser.add_argument("--replies", type=int, default=1000000)
+    args = parser.parse_args()
+
+    edges = synthetic(args.users, args.replies)
+    nodes, rows, cols, weights = timed("sparse reply matrix", lambda: reply_matrix(edges))
+    n = len(nodes)
+    print(f"[INFO] {n} users, {len(rows)} weighted edges")
+
+    _, iterations = timed("pagerank", lambda: pagerank(rows, cols, weights, n))
+    print(f"         {iterations} iterations")
+    _, _, iterations = timed("hits", lambda: hits(rows, cols, weights, n))
+    print(f"         {iterations} iterations")
+    core = timed("k-core numbers", lambda: core_numbers(rows, cols, n))
+    print(f"         max core {core.max()}")
+    timed("reply_graph_centrality", lambda: reply_graph_centrality(edges))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,122 @@
+"""
+Benchmark: row-by-row vs bulk upload of the consolidated community CSV to MySQL.
+
+Runs old/upload_to_mysql.py's upload_community_data_to_mysql (one INSERT per
+row) and upload_community_data_to_mysql_bulk (chunked executemany, one commit
+per batch) on the same CSV and reports time, statements and commits.
+
+Against a real server (tables from old/youtube_community_schema.sql, project
+row must exist; connection from MYSQL_HOST/MYSQL_PORT/MYSQL_USER/MYSQL_PASSWORD/
+MYSQL_DATABASE):
+Run: python benchmarks/bench_mysql_upload.py --mysql --project-id 1
+
+Without a server, --rtt-ms simulates the network round trip each statement
+and commit costs (executemany counts as one, as mysql-connector rewrites it
+into a multi-row INSERT):
+Run: python benchmarks/bench_mysql_upload.py --rtt-ms 0.5
+"""
+import argparse
+import os
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from dotenv import load_dotenv
+from old.upload_to_mysql import (
+    BULK_CHUNK_SIZE, upload_community_data_to_mysql, upload_community_data_to_mysql_bulk
+)
+
+DEFAULT_CSV = Path(__file__).resolve().parent.parent / "DatabaseExtract" / "CommunityCSV" / "consolidated_community_analysis.csv"
+
+
+class RoundTripConnection:
+    """DB-API stand-in that sleeps rtt seconds per statement/commit and counts them"""
+
+    def __init__(self, rtt):
+        self.rtt = rtt
+        self.statements = 0
+        self.rows = 0
+        self.commits = 0
+
+    def cursor(self):
+        return _RoundTripCursor(self)
+
+    def commit(self):
+        self.commits += 1
+        time.sleep(self.rtt)
+
+    def rollback(self):
+        pass
+
+    def close(self):
+        pass
+
+
+class _RoundTripCursor:
+    def __init__(self, connection):
+        self.connection = connection
+
+    def execute(self, sql, params=None):
+        self.connection.statements += 1
+        self.connection.rows += 1
+        time.sleep(self.connection.rtt)
+
+    def executemany(self, sql, rows):
+        self.connection.statements += 1
+        self.connection.rows += len(rows)
+        time.sleep(self.connection.rtt)
+
+    def close(self):
+        pass
+
+
+def connect_mysql():
+    import mysql.connector
+    return mysql.connector.connect(
+        host=os.getenv("MYSQL_HOST", "localhost"),
+        port=int(os.getenv("MYSQL_PORT", "3306")),
+        user=os.getenv("MYSQL_USER", "root"),
+        password=os.getenv("MYSQL_PASSWORD", ""),
+        database=os.getenv("MYSQL_DATABASE"),
+    )
+
+
+def run(label, upload, connect, args, **kwargs):
+    connection = connect()
+    start = time.perf_counter()
+    ok = upload(args.project_id, str(args.csv), connection=connection, **kwargs)
+    seconds = time.perf_counter() - start
+    if not ok:
+        raise SystemExit(f"{label} upload failed")
+    counts = ""
+    if isinstance(connection, RoundTripConnection):
+        counts = f"  {connection.statements:>6} statements  {connection.commits:>4} commits  {connection.rows:>6} rows"
+    print(f"[RESULT] {label:<12} {seconds:8.3f}s{counts}")
+    return seconds
+
+
+def main():
+    load_dotenv()
+    parser = argparse.ArgumentParser(description="MySQL community upload benchmark")
+    parser.add_argument("--csv", type=Path, default=DEFAULT_CSV, help="Consolidated community CSV")
+    parser.add_argument("--project-id", type=int, default=1)
+    parser.add_argument("--chunk-size", type=int, default=BULK_CHUNK_SIZE)
+    parser.add_argument("--mysql", action="store_true", help="Upload to the MySQL server from the environment")
+    parser.add_argument("--rtt-ms", type=float, default=0.5, help="Simulated round trip (without --mysql)")
+    args = parser.parse_args()
+
+    if args.mysql:
+        connect = connect_mysql
+    else:
+        connect = lambda: RoundTripConnection(args.rtt_ms / 1000)
+
+    print(f"[INFO] {args.csv.name}, {'MySQL' if args.mysql else f'simulated {args.rtt_ms} ms round trip'}")
+    row_by_row = run("row-by-row", upload_community_data_to_mysql, connect, args)
+    bulk = run("bulk", upload_community_data_to_mysql_bulk, connect, args, chunk_size=args.chunk_size)
+    print(f"[RESULT] speedup      {row_by_row / bulk:8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,688 @@
+"""
+Local stand-in for the YouTube Data API v3.
+
+Serves channels, search, playlistItems, videos, commentThreads and comments
+from an in-memory dataset, either synthetic or loaded from recorded CSVs
+(DatabaseExtract/cluster_results, DatabaseExtract/CommunityCSV). Honours
+part=, fields= partial responses, maxResults/pageToken paging and charges
+quota units per request, with configurable latency and injected
+quotaExceeded errors.
+
+Point YouTubeAnalyzer at it with api_endpoint=server.endpoint, or run the
+whole app against it:
+
+    python benchmarks/fake_youtube_api.py --serve --port 8765
+    YOUTUBE_API_ENDPOINT=http://127.0.0.1:8765/ python app.py
+"""
+import argparse
+import csv
+import json
+import random
+import sys
+import threading
+import time
+from datetime import datetime, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from urllib.parse import parse_qs, urlsplit
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from services.quota_budget import QUOTA_COSTS
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+RECORDED_COMMENTS_CSV = REPO_ROOT / "DatabaseExtract" / "cluster_results" / "01_full_comments_with_clusters.csv"
+
+EMBEDDED_REPLY_LIMIT = 5  # commentThreads embeds at most this many replies
+
+QUOTA_EXCEEDED_BODY = {
+    "error": {
+        "code": 403,
+        "message": "The request cannot be completed because you have exceeded your "
+                   "<a href=\"/youtube/v3/getting-started#quota\">quota</a>.",
+        "errors": [{
+            "message": "The request cannot be completed because you have exceeded your quota.",
+            "domain": "youtube.quota",
+            "reason": "quotaExceeded",
+        }],
+    }
+}
+
+_WORDS = (
+    "great video love this content amazing thanks for sharing first time watching "
+    "who else is here in 2025 the editing is insane cant wait for the next one "
+    "this deserves more views underrated channel lol true facts please do a part two "
+    "i disagree with the point at the end but good job anyway subscribed"
+).split()
+
+
+# ---- partial response (fields=) -------------------------------------------
+
+def parse_fields(spec):
+    """Parse a fields= mask into a nested dict selection tree.
+
+    "items(id,snippet/title),nextPageToken" ->
+    {"items": {"id": None, "snippet": {"title": None}}, "nextPageToken": None}
+    A value of None selects the whole sub-object.
+    """
+    tree, pos = _parse_field_list(spec, 0)
+    if pos != len(spec):
+        raise ValueError(f"Invalid field selection at {pos}: {spec!r}")
+    return tree
+
+
+def _parse_field_list(spec, pos):
+    tree = {}
+    while pos < len(spec):
+        start = pos
+        while pos < len(spec) and spec[pos] not in ",()":
+            pos += 1
+        path = spec[start:pos].strip().split("/")
+        if not all(path):
+            raise ValueError(f"Invalid field selection at {start}: {spec!r}")
+
+        sub = None
+        if pos < len(spec) and spec[pos] == "(":
+            sub, pos = _parse_field_list(spec, pos + 1)
+            if pos >= len(spec) or spec[pos] != ")":
+                raise ValueError(f"Unbalanced parentheses: {spec!r}")
+            pos += 1
+
+        for name in reversed(path):
+            sub = {name: sub}
+        _merge_selection(tree, sub)
+
+        if pos < len(spec) and spec[pos] == ",":
+            pos += 1
+        elif pos < len(spec) and spec[pos] == ")":
+            break
+    return tree, pos
+
+
+def _merge_selection(tree, other):
+    for name, sub in other.items():
+        if name not in tree:
+            tree[name] = sub
+        elif tree[name] is not None and sub is not None:
+            _merge_selection(tree[name], sub)
+        else:
+            tree[name] = None
+
+
+def apply_fields(obj, tree):
+    """Keep only the selected keys of a response body"""
+    if tree is None:
+        return obj
+    if isinstance(obj, list):
+        return [apply_fields(item, tree) for item in obj]
+    if isinstance(obj, dict):
+        return {k: apply_fields(obj[k], sub) for k, sub in tree.items() if k in obj}
+    return obj
+
+
+# ---- dataset ----------------------------------------------------------------
+
+def _iso(dt):
+    return dt.strftime("%Y-%m-%dT%H:%M:%SZ")
+
+
+class FakeYouTubeDataset:
+    """Channels, videos and comments served by FakeYouTubeServer.
+
+    Comments are stored as flat dicts (comment_id, video_id, author_id,
+    author_name, text, like_count, published_at, parent_id) and rendered
+    into full API resources per request.
+    """
+
+    def __init__(self):
+        self.channels = {}        # channel_id -> channel info dict
+        self.handles = {}         # lowercase handle / username -> channel_id
+        self.videos = {}          # video_id -> video info dict
+        self.channel_videos = {}  # channel_id -> [video_id], newest first
+        self.threads = {}         # video_id -> [top-level comment]
+        self.replies = {}         # top-level comment_id -> [reply comment]
+        self.comments = {}        # comment_id -> comment
+        self.comments_disabled = set()  # video_ids whose commentThreads fail with commentsDisabled
+
+    @property
+    def total_comments(self):
+        return len(self.comments)
+
+    def add_channel(self, channel_id, title, handle=None, subscriber_count=100000, published_at=None):
+        handle = handle or title.replace(" ", "").lower()
+        self.channels[channel_id] = {
+            "channel_id": channel_id,
+            "title": title,
+            "handle": handle,
+            "subscriber_count": subscriber_count,
+            "published_at": published_at or "2015-01-01T00:00:00Z",
+        }
+        self.handles[handle.lower()] = channel_id
+        self.channel_videos.setdefault(channel_id, [])
+
+    def add_video(self, video_id, channel_id, title, published_at, views=10000, likes=500):
+        self.videos[video_id] = {
+            "video_id": video_id,
+            "channel_id": channel_id,
+            "title": title,
+            "published_at": published_at,
+            "views": views,
+            "likes": likes,
+        }
+        self.channel_videos[channel_id].append(video_id)
+        self.channel_videos[channel_id].sort(key=lambda v: self.videos[v]["published_at"], reverse=True)
+        self.threads.setdefault(video_id, [])
+
+    def add_comment(self, comment_id, video_id, author_id, author_name, text,
+                    like_count=0, published_at=None, parent_id=None):
+        comment = {
+            "comment_id": comment_id,
+            "video_id": video_id,
+            "author_id": author_id,
+            "author_name": author_name,
+            "text": text,
+            "like_count": int(like_count),
+            "published_at": published_at or self.videos[video_id]["published_at"],
+            "parent_id": parent_id,
+        }
+        self.comments[comment_id] = comment
+        if parent_id:
+            self.replies.setdefault(parent_id, []).append(comment)
+        else:
+            self.threads[video_id].append(comment)
+        return comment
+
+    @classmethod
+    def synthetic(cls, num_videos=30, threads_per_video=200, num_authors=3000,
+                  reply_alpha=1.5, max_replies=300, seed=42,
+                  channel_id="UCfakeSyntheticChannel0001", handle="syntheticchannel"):
+        """Random dataset with heavy-tailed reply counts per thread"""
+        rng = random.Random(seed)
+        dataset = cls()
+        now = datetime.utcnow()
+        dataset.add_channel(channel_id, "Synthetic Channel", handle=handle)
+        authors = [(f"UCauthor{i:06d}", f"@user{i}") for i in range(num_authors)]
+
+        for v in range(num_videos):
+            video_id = f"vid{v:08d}"
+            video_time = now - timedelta(days=v * 3 + 1)
+            dataset.add_video(video_id, channel_id, f"Synthetic video {v}", _iso(video_time),
+                              views=rng.randint(1000, 500000), likes=rng.randint(10, 20000))
+            for t in range(threads_per_video):
+                author_id, author_name = rng.choice(authors)
+                top_id = f"Ug{video_id}t{t:05d}"
+                top_time = video_time + timedelta(minutes=rng.randint(1, 60 * 24 * 3))
+                dataset.add_comment(top_id, video_id, author_id, author_name,
+                                    " ".join(rng.choices(_WORDS, k=rng.randint(2, 30))),
+                                    like_count=int(rng.paretovariate(1.2)) - 1,
+                                    published_at=_iso(top_time))
+                reply_count = min(max_replies, int(rng.paretovariate(reply_alpha)) - 1)
+                for r in range(reply_count):
+                    author_id, author_name = rng.choice(authors)
+                    dataset.add_comment(f"{top_id}.r{r:04d}", video_id, author_id, author_name,
+                                        " ".join(rng.choices(_WORDS, k=rng.randint(1, 20))),
+                                        like_count=int(rng.paretovariate(2.0)) - 1,
+                                        published_at=_iso(top_time + timedelta(minutes=r + 1)),
+                                        parent_id=top_id)
+        return dataset
+
+    @classmethod
+    def from_csv(cls, csv_path=RECORDED_COMMENTS_CSV, channel_id="UCrecordedDataset00000001", handle="recorded"):
+        """Load recorded comments from a cluster_results or CommunityCSV export.
+
+        Replies are linked via parent_comment_id when present, otherwise via
+        YouTube's "<parentId>.<replyId>" comment ID format. Replies whose
+        parent is missing from the file become top-level comments.
+        """
+        with open(csv_path, encoding="utf-8") as f:
+            rows = list(csv.DictReader(f))
+
+        dataset = cls()
+        dataset.add_channel(channel_id, "Recorded Channel", handle=handle)
+        fallback_time = _iso(datetime.utcnow() - timedelta(days=1))
+
+        video_times = {}
+        for row in rows:
+            published = row.get("published_at") or fallback_time
+            video_id = row["video_id"]
+            video_times[video_id] = min(video_times.get(video_id, published), published)
+        for i, (video_id, published) in enumerate(video_times.items()):
+            dataset.add_video(video_id, channel_id, f"Recorded video {i}", published)
+
+        comment_ids = {row["comment_id"] for row in rows}
+        ordered = sorted(rows, key=lambda r: str(r.get("is_reply")).lower() == "true")
+        for row in ordered:
+            comment_id = row["comment_id"]
+            parent_id = None
+            if str(row.get("is_reply")).lower() == "true":
+                parent_id = row.get("parent_comment_id") or comment_id.split(".")[0]
+                if parent_id not in comment_ids or parent_id == comment_id:
+                    parent_id = None
+            dataset.add_comment(
+                comment_id, row["video_id"],
+                row.get("author_channel_id") or "unknown",
+                row.get("author_display_name") or "Unknown",
+                row.get("text_original") or row.get("text") or "",
+                like_count=int(float(row.get("like_count") or 0)),
+                published_at=row.get("published_at") or None,
+                parent_id=parent_id,
+            )
+        return dataset
+
+    # ---- resource rendering --------------------------------------------
+
+    def channel_resource(self, channel_id):
+        ch = self.channels[channel_id]
+        videos = self.channel_videos[channel_id]
+        thumbs = {size: {"url": f"https://yt3.ggpht.com/{channel_id}=s{px}-c-k-c0x00ffffff-no-rj",
+                         "width": px, "height": px}
+                  for size, px in (("default", 88), ("medium", 240), ("high", 800))}
+        return {
+            "kind": "youtube#channel",
+            "etag": f"etag-{channel_id}",
+            "id": channel_id,
+            "snippet": {
+                "title": ch["title"],
+                "description": f"Official channel of {ch['title']}. " * 5,
+                "customUrl": f"@{ch['handle']}",
+                "publishedAt": ch["published_at"],
+                "thumbnails": thumbs,
+                "localized": {"title": ch["title"], "description": ""},
+                "country": "US",
+            },
+            "contentDetails": {"relatedPlaylists": {"likes": "", "uploads": "UU" + channel_id[2:]}},
+            "statistics": {
+                "viewCount": str(sum(self.videos[v]["views"] for v in videos)),
+                "subscriberCount": str(ch["subscriber_count"]),
+                "hiddenSubscriberCount": False,
+                "videoCount": str(len(videos)),
+            },
+            "brandingSettings": {
+                "channel": {"title": ch["title"], "description": "", "keywords": "gaming news reviews",
+                            "unsubscribedTrailer": "", "country": "US"},
+                "image": {"bannerExternalUrl": f"https://yt3.googleusercontent.com/banner-{channel_id}"},
+            },
+            "topicDetails": {
+                "topicIds": ["/m/0bzvm2"],
+                "topicCategories": ["https://en.wikipedia.org/wiki/Video_game_culture"],
+            },
+        }
+
+    def _video_snippet(self, video):
+        ch = self.channels[video["channel_id"]]
+        return {
+            "publishedAt": video["published_at"],
+            "channelId": video["channel_id"],
+            "title": video["title"],
+            "description": f"{video['title']} - description. " * 10,
+            "thumbnails": {size: {"url": f"https://i.ytimg.com/vi/{video['video_id']}/{size}.jpg",
+                                  "width": w, "height": h}
+                           for size, w, h in (("default", 120, 90), ("medium", 320, 180),
+                                              ("high", 480, 360), ("standard", 640, 480))},
+            "channelTitle": ch["title"],
+            "tags": ["tag1", "tag2", "tag3"],
+            "categoryId": "20",
+            "liveBroadcastContent": "none",
+            "localized": {"title": video["title"], "description": ""},
+        }
+
+    def video_resource(self, video_id):
+        video = self.videos[video_id]
+        return {
+            "kind": "youtube#video",
+            "etag": f"etag-{video_id}",
+            "id": video_id,
+            "snippet": self._video_snippet(video),
+            "contentDetails": {"duration": "PT12M34S", "dimension": "2d", "definition": "hd",
+                               "caption": "false", "licensedContent": True, "projection": "rectangular"},
+            "statistics": {
+                "viewCount": str(video["views"]),
+                "likeCount": str(video["likes"]),
+                "favoriteCount": "0",
+                "commentCount": str(sum(1 for _ in self._video_comment_ids(video_id))),
+            },
+        }
+
+    def _video_comment_ids(self, video_id):
+        for top in self.threads.get(video_id, []):
+            yield top["comment_id"]
+            for reply in self.replies.get(top["comment_id"], []):
+                yield reply["comment_id"]
+
+    def search_video_resource(self, video_id):
+        video = self.videos[video_id]
+        return {
+            "kind": "youtube#searchResult",
+            "etag": f"etag-search-{video_id}",
+            "id": {"kind": "youtube#video", "videoId": video_id},
+            "snippet": self._video_snippet(video),
+        }
+
+    def search_channel_resource(self, channel_id):
+        resource = self.channel_resource(channel_id)
+        return {
+            "kind": "youtube#searchResult",
+            "etag": f"etag-search-{channel_id}",
+            "id": {"kind": "youtube#channel", "channelId": channel_id},
+            "snippet": dict(resource["snippet"], channelId=channel_id, channelTitle=resource["snippet"]["title"]),
+        }
+
+    def comment_resource(self, comment):
+        snippet = {
+            "channelId": self.videos[comment["video_id"]]["channel_id"],
+            "videoId": comment["video_id"],
+            "textDisplay": comment["text"],
+            "textOriginal": comment["text"],
+            "authorDisplayName": comment["author_name"],
+            "authorProfileImageUrl": f"https://yt3.ggpht.com/ytc/{comment['author_id']}=s48-c-k-c0x00ffffff-no-rj",
+            "authorChannelUrl": f"http://www.youtube.com/{comment['author_name']}",
+            "authorChannelId": {"value": comment["author_id"]},
+            "canRate": True,
+            "viewerRating": "none",
+            "likeCount": comment["like_count"],
+            "publishedAt": comment["published_at"],
+            "updatedAt": comment["published_at"],
+        }
+        if comment["parent_id"]:
+            snippet["parentId"] = comment["parent_id"]
+        return {"kind": "youtube#comment", "etag": f"etag-{comment['comment_id']}",
+                "id": comment["comment_id"], "snippet": snippet}
+
+    def thread_resource(self, top, parts):
+        replies = self.replies.get(top["comment_id"], [])
+        resource = {
+            "kind": "youtube#commentThread",
+            "etag": f"etag-thread-{top['comment_id']}",
+            "id": top["comment_id"],
+            "snippet": {
+                "channelId": self.videos[top["video_id"]]["channel_id"],
+                "videoId": top["video_id"],
+                "topLevelComment": self.comment_resource(top),
+                "canReply": True,
+                "totalReplyCount": len(replies),
+                "isPublic": True,
+            },
+        }
+        if "replies" in parts and replies:
+            resource["replies"] = {"comments": [self.comment_resource(r) for r in replies[:EMBEDDED_REPLY_LIMIT]]}
+        return resource
+
+
+# ---- HTTP server --------------------------------------------------------------
+
+class _QuotaExceeded(Exception):
+    pass
+
+
+class _BadRequest(Exception):
+    pass
+
+
+class _Forbidden(Exception):
+    """403 with a YouTube error reason, e.g. commentsDisabled"""
+
+    def __init__(self, reason, message):
+        super().__init__(message)
+        self.reason = reason
+
+
+class FakeYouTubeServer:
+    """HTTP server emulating the YouTube Data API endpoints used by YouTubeAnalyzer.
+
+    latency: seconds slept before answering each request
+    quota_limit: total units before every request fails with quotaExceeded
+    quota_error_rate: probability that any request fails with quotaExceeded
+    """
+
+    def __init__(self, dataset, host="127.0.0.1", port=0, latency=0.0,
+                 quota_limit=None, quota_error_rate=0.0, seed=0):
+        self.dataset = dataset
+        self.latency = latency
+        self.quota_limit = quota_limit
+        self.quota_error_rate = quota_error_rate
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self.reset_stats()
+
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_GET(self):
+                server._handle(self)
+
+            def log_message(self, format, *args):
+                pass
+
+        self.httpd = ThreadingHTTPServer((host, port), Handler)
+        self.httpd.daemon_threads = True
+        self._thread = None
+
+    @property
+    def endpoint(self):
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}/"
+
+    def reset_stats(self):
+        self.stats = {"requests": {}, "quota_used": 0, "bytes_sent": 0, "errors": 0}
+
+    def start(self):
+        self._thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    def _handle(self, handler):
+        url = urlsplit(handler.path)
+        params = {k: v[-1] for k, v in parse_qs(url.query).items()}
+        resource = url.path.rstrip("/").rsplit("/", 1)[-1]
+        endpoint = f"{resource}.list"
+
+        if self.latency:
+            time.sleep(self.latency)
+
+        try:
+            route = getattr(self, f"_list_{resource}", None)
+            if route is None:
+                raise _BadRequest(f"Unknown resource: {resource}")
+            self._charge(endpoint)
+            body = route(params)
+            if params.get("fields"):
+                body = apply_fields(body, parse_fields(params["fields"]))
+            status = 200
+        except _QuotaExceeded:
+            status, body = 403, QUOTA_EXCEEDED_BODY
+        except _Forbidden as e:
+            status, body = 403, {"error": {"code": 403, "message": str(e),
+                                           "errors": [{"message": str(e), "reason": e.reason}]}}
+        except (_BadRequest, ValueError, KeyError) as e:
+            status, body = 400, {"error": {"code": 400, "message": str(e),
+                                           "errors": [{"reason": "badRequest"}]}}
+
+        payload = json.dumps(body).encode("utf-8")
+        with self._lock:
+            self.stats["bytes_sent"] += len(payload)
+            if status != 200:
+                self.stats["errors"] += 1
+
+        handler.send_response(status)
+        handler.send_header("Content-Type", "application/json; charset=UTF-8")
+        handler.send_header("Content-Length", str(len(payload)))
+        handler.end_headers()
+        handler.wfile.write(payload)
+
+    def _charge(self, endpoint):
+        units = QUOTA_COSTS.get(endpoint, 1)
+        with self._lock:
+            self.stats["requests"][endpoint] = self.stats["requests"].get(endpoint, 0) + 1
+            exhausted = self.quota_limit is not None and self.stats["quota_used"] + units > self.quota_limit
+            if exhausted or (self.quota_error_rate and self._rng.random() < self.quota_error_rate):
+                raise _QuotaExceeded()
+            self.stats["quota_used"] += units
+
+    @staticmethod
+    def _page(items, params, default_size=5, max_size=50):
+        size = min(int(params.get("maxResults", default_size)), max_size)
+        start = int(params.get("pageToken") or 0)
+        body = {"pageInfo": {"totalResults": len(items), "resultsPerPage": size},
+                "items": items[start:start + size]}
+        if start + size < len(items):
+            body["nextPageToken"] = str(start + size)
+        return body
+
+    @staticmethod
+    def _parts(params):
+        return set(params.get("part", "").split(","))
+
+    def _select_parts(self, resources, params):
+        keep = self._parts(params) | {"kind", "etag", "id"}
+        return [{k: v for k, v in r.items() if k in keep} for r in resources]
+
+    # ---- endpoints ---------------------------------------------------------
+
+    def _list_channels(self, params):
+        ds = self.dataset
+        if "id" in params:
+            ids = [c for c in params["id"].split(",") if c in ds.channels]
+        elif "forUsername" in params or "forHandle" in params:
+            name = (params.get("forUsername") or params.get("forHandle")).lstrip("@").lower()
+            ids = [ds.handles[name]] if name in ds.handles else []
+        else:
+            raise _BadRequest("No filter selected")
+        items = self._select_parts([ds.channel_resource(c) for c in ids], params)
+        return {"kind": "youtube#channelListResponse", "etag": "etag", "items": items}
+
+    def _list_search(self, params):
+        ds = self.dataset
+        if params.get("type") == "channel":
+            query = params.get("q", "").lstrip("@").lower()
+            ids = [cid for cid, ch in ds.channels.items()
+                   if query in ch["handle"].lower() or query in ch["title"].lower()]
+            items = [ds.search_channel_resource(c) for c in ids]
+        else:
+            video_ids = ds.channel_videos.get(params.get("channelId"), [])
+            after = params.get("publishedAfter")
+            if after:
+                after = after[:19]
+                video_ids = [v for v in video_ids if ds.videos[v]["published_at"][:19] >= after]
+            items = [ds.search_video_resource(v) for v in video_ids]
+        if "snippet" not in self._parts(params):
+            items = [{k: v for k, v in item.items() if k != "snippet"} for item in items]
+        body = self._page(items, params)
+        body.update(kind="youtube#searchListResponse", etag="etag", regionCode="US")
+        return body
+
+    def _list_playlistItems(self, params):
+        ds = self.dataset
+        channel_id = "UC" + params["playlistId"][2:]
+        items = []
+        for position, video_id in enumerate(ds.channel_videos.get(channel_id, [])):
+            video = ds.videos[video_id]
+            items.append({
+                "kind": "youtube#playlistItem",
+                "etag": f"etag-pl-{video_id}",
+                "id": f"{params['playlistId']}.{video_id}",
+                "snippet": dict(ds._video_snippet(video), playlistId=params["playlistId"], position=position,
+                                resourceId={"kind": "youtube#video", "videoId": video_id}),
+                "contentDetails": {"videoId": video_id, "videoPublishedAt": video["published_at"]},
+            })
+        body = self._page(self._select_parts(items, params), params)
+        body.update(kind="youtube#playlistItemListResponse", etag="etag")
+        return body
+
+    def _list_videos(self, params):
+        ds = self.dataset
+        ids = [v for v in params.get("id", "").split(",") if v in ds.videos]
+        items = self._select_parts([ds.video_resource(v) for v in ids], params)
+        return {"kind": "youtube#videoListResponse", "etag": "etag", "items": items,
+                "pageInfo": {"totalResults": len(items), "resultsPerPage": len(items)}}
+
+    def _list_commentThreads(self, params):
+        ds = self.dataset
+        if params.get("videoId") not in ds.videos:
+            raise _BadRequest("videoNotFound")
+        if params["videoId"] in ds.comments_disabled:
+            raise _Forbidden("commentsDisabled", "The video identified by the videoId parameter has disabled comments.")
+        threads = ds.threads[params["videoId"]]
+        if params.get("order") == "time":
+            threads = sorted(threads, key=lambda c: c["published_at"], reverse=True)
+        parts = self._parts(params)
+        body = self._page(threads, params, default_size=20, max_size=100)
+        body["items"] = self._select_parts([ds.thread_resource(t, parts) for t in body["items"]], params)
+        body.update(kind="youtube#commentThreadListResponse", etag="etag")
+        return body
+
+    def _list_comments(self, params):
+        ds = self.dataset
+        if "parentId" in params:
+            comments = ds.replies.get(params["parentId"], [])
+        else:
+            comments = [ds.comments[c] for c in params.get("id", "").split(",") if c in ds.comments]
+        body = self._page(comments, params, default_size=20, max_size=100)
+        body["items"] = self._select_parts([ds.comment_resource(c) for c in body["items"]], params)
+        body.update(kind="youtube#commentListResponse", etag="etag")
+        return body
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Fake YouTube Data API server")
+    parser.add_argument("--serve", action="store_true", help="Run the server until interrupted")
+    parser.add_argument("--bench", action="store_true", help="Benchmark YouTubeAnalyzer.analyze against it")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--csv", help="Recorded comments CSV to serve instead of synthetic data")
+    parser.add_argument("--videos", type=int, default=30, help="Synthetic videos")
+    parser.add_argument("--threads", type=int, default=200, help="Synthetic threads per video")
+    parser.add_argument("--latency", type=float, default=0.0, help="Seconds per request")
+    parser.add_argument("--quota-limit", type=int, default=None)
+    parser.add_argument("--quota-error-rate", type=float, default=0.0)
+    args = parser.parse_args()
+
+    if args.csv:
+        dataset = FakeYouTubeDataset.from_csv(args.csv)
+    else:
+        dataset = FakeYouTubeDataset.synthetic(num_videos=args.videos, threads_per_video=args.threads)
+    channel = next(iter(dataset.channels.values()))
+    print(f"Dataset: {len(dataset.videos)} videos, {dataset.total_comments} comments, "
+          f"channel https://www.youtube.com/@{channel['handle']}")
+
+    server = FakeYouTubeServer(dataset, port=args.port if args.serve else 0, latency=args.latency,
+                               quota_limit=args.quota_limit, quota_error_rate=args.quota_error_rate)
+
+    if args.serve:
+        print(f"Serving fake YouTube Data API at {server.endpoint}")
+        try:
+            server.httpd.serve_forever()
+        except KeyboardInterrupt:
+            server.stop()
+        return
+
+    if args.bench:
+        from services.youtube_analyzer import YouTubeAnalyzer
+
+        with server:
+            analyzer = YouTubeAnalyzer("fake-key", api_endpoint=server.endpoint)
+            start = time.perf_counter()
+            result = analyzer.analyze(f"https://www.youtube.com/@{channel['handle']}")
+            elapsed = time.perf_counter() - start
+        data = result.get("data", {})
+        print(f"success={result['success']} comments={data.get('total_comments')} "
+              f"videos={data.get('videos_analyzed')} time={elapsed:.2f}s")
+        print(f"requests={server.stats['requests']} quota={server.stats['quota_used']} "
+              f"bytes={server.stats['bytes_sent']}")
+        return
+
+    parser.print_help()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,295 @@
+"""
+Stage-level benchmark suite for the YouTubeAnalyzer pipeline.
+
+Times each stage analyze_channel runs after the crawl, on synthetic corpora of
+several sizes and on the recorded comments export, and records wall time and
+peak traced memory per stage:
+
+  comment_parsing     _extract_comment_metrics over raw API comment resources
+                      (includes the text features below)
+  text_features       _analyze_comment_text alone
+  influencer_scoring  calculate_influencer_scores
+  graph_build         _build_interaction_graph
+  louvain             community_louvain.best_partition on that graph
+  community_detection detect_communities (graph + Louvain + community stats)
+  visualization       generate_community_network_visualization
+  sentiment           run_sentiment_analysis (only with --sentiment, loads the model)
+
+Results are written as JSON under benchmarks/baselines/ and can be compared
+against an earlier run; stages slower (or heavier) than the threshold are
+reported as regressions and the script exits with status 1.
+
+Run: python benchmarks/run_benchmarks.py --sizes 10000,50000 --save main
+     python benchmarks/run_benchmarks.py --sizes 10000,50000 --compare main
+"""
+import argparse
+import gc
+import json
+import platform
+import subprocess
+import sys
+import time
+import tracemalloc
+from datetime import datetime
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import community as community_louvain
+
+from benchmarks.fake_youtube_api import FakeYouTubeDataset, RECORDED_COMMENTS_CSV
+from benchmarks.synthetic_corpus import SyntheticCorpus
+import services.youtube_analyzer as ya
+
+BASELINE_DIR = Path(__file__).resolve().parent / "baselines"
+CHANNEL_OWNER_ID = "UCsyntheticOwner00000001"
+
+STAGES = [
+    "comment_parsing", "text_features", "influencer_scoring", "graph_build",
+    "louvain", "community_detection", "visualization", "sentiment",
+]
+
+
+# ---- datasets ---------------------------------------------------------------
+
+def _api_comment(record):
+    """Raw commentThreads/comments resource for a parsed comment record"""
+    snippet = {
+        "textDisplay": record["text"],
+        "authorDisplayName": record["author_name"],
+        "authorChannelId": {"value": record["author_id"]},
+        "likeCount": record["like_count"],
+        "publishedAt": record["published_at"],
+        "updatedAt": record["updated_at"],
+    }
+    if record["parent_id"]:
+        snippet["parentId"] = record["parent_id"]
+    return {"id": record["comment_id"], "snippet": snippet}
+
+
+def synthetic_dataset(num_comments, seed=42):
+    corpus = SyntheticCorpus(num_comments=num_comments, channel_owner_id=CHANNEL_OWNER_ID, seed=seed)
+    comments, edges = corpus.generate()
+    raw = [(_api_comment(c), c["is_reply"], c["total_reply_count"], c["video_id"]) for c in comments]
+    return {"raw": raw, "edges": edges, "videos": corpus.videos}
+
+
+def recorded_dataset(csv_path=RECORDED_COMMENTS_CSV):
+    dataset = FakeYouTubeDataset.from_csv(csv_path, channel_id=CHANNEL_OWNER_ID)
+    raw, edges = [], []
+    for video_id, threads in dataset.threads.items():
+        for top in threads:
+            replies = dataset.replies.get(top["comment_id"], [])
+            raw.append((dataset.comment_resource(top), False, len(replies), video_id))
+            for reply in replies:
+                raw.append((dataset.comment_resource(reply), True, 0, video_id))
+                edges.append({"from": reply["author_id"], "to": top["author_id"],
+                              "video_id": video_id, "timestamp": reply["published_at"]})
+    videos = [{"video_id": v, "title": video["title"]} for v, video in dataset.videos.items()]
+    return {"raw": raw, "edges": edges, "videos": videos}
+
+
+# ---- stages -----------------------------------------------------------------
+
+def build_stages(analyzer, dataset, with_sentiment):
+    """Stage name -> zero-arg callable; later stages consume earlier outputs"""
+    state = {}
+
+    def comment_parsing():
+        comments = []
+        for resource, is_reply, reply_count, video_id in dataset["raw"]:
+            metrics = analyzer._extract_comment_metrics(resource, CHANNEL_OWNER_ID, is_reply=is_reply)
+            metrics["total_reply_count"] = reply_count
+            metrics["video_id"] = video_id
+            comments.append(metrics)
+        state["comments"] = comments
+
+    def text_features():
+        for resource, _, _, _ in dataset["raw"]:
+            analyzer._analyze_comment_text(resource["snippet"]["textDisplay"])
+
+    def influencer_scoring():
+        analyzer.calculate_influencer_scores(state["comments"], dataset["edges"], dataset["videos"])
+
+    def graph_build():
+        state["graph"] = analyzer._build_interaction_graph(state["comments"], dataset["edges"])
+
+    def louvain():
+        if state["graph"].number_of_edges():
+            community_louvain.best_partition(state["graph"], random_state=42)
+
+    def community_detection():
+        state["communities"] = analyzer.detect_communities(state["comments"], dataset["edges"])
+
+    def visualization():
+        analyzer.generate_community_network_visualization(
+            state["comments"], dataset["edges"], state["communities"]["user_to_community"])
+
+    def sentiment():
+        ya.run_sentiment_analysis(state["comments"])
+
+    stages = {
+        "comment_parsing": comment_parsing,
+        "text_features": text_features,
+        "influencer_scoring": influencer_scoring,
+        "graph_build": graph_build,
+        "louvain": louvain,
+        "community_detection": community_detection,
+        "visualization": visualization,
+    }
+    if with_sentiment:
+        stages["sentiment"] = sentiment
+    return stages
+
+
+def measure(fn, repeats, trace_memory):
+    """Best-of-N wall time, then one traced run for peak memory"""
+    best = float("inf")
+    for _ in range(repeats):
+        gc.collect()
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+
+    result = {"seconds": round(best, 4)}
+    if trace_memory:
+        gc.collect()
+        tracemalloc.start()
+        fn()
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        result["peak_mb"] = round(peak / 1024 / 1024, 2)
+    return result
+
+
+def run_suite(sizes, include_recorded=True, repeats=3, trace_memory=True, with_sentiment=False, only=None):
+    analyzer = ya.YouTubeAnalyzer("bench-key", api_endpoint="http://127.0.0.1:9")
+    datasets = [(f"synthetic-{n}", lambda n=n: synthetic_dataset(n)) for n in sizes]
+    if include_recorded and RECORDED_COMMENTS_CSV.exists():
+        datasets.append(("recorded", recorded_dataset))
+
+    results = {}
+    for name, load in datasets:
+        dataset = load()
+        print(f"\n▶ {name}: {len(dataset['raw']):,} comments, {len(dataset['edges']):,} reply edges")
+        stage_results = {}
+        for stage, fn in build_stages(analyzer, dataset, with_sentiment).items():
+            if only and stage not in only and stage not in _dependencies(only):
+                continue
+            stage_results[stage] = measure(fn, repeats, trace_memory)
+            mem = f"{stage_results[stage]['peak_mb']:>9.1f} MB" if trace_memory else ""
+            print(f"  {stage:<22}{stage_results[stage]['seconds']:>10.3f} s{mem}")
+        results[name] = {
+            "comments": len(dataset["raw"]),
+            "edges": len(dataset["edges"]),
+            "stages": stage_results,
+        }
+    return results
+
+
+def _dependencies(only):
+    """Stages whose outputs the selected stages need"""
+    needs = {"comment_parsing"}
+    if "visualization" in only:
+        needs.add("community_detection")
+    if "louvain" in only:
+        needs.add("graph_build")
+    return needs
+
+
+# ---- baselines --------------------------------------------------------------
+
+def _baseline_path(name):
+    path = Path(name)
+    return path if path.suffix == ".json" else BASELINE_DIR / f"{name}.json"
+
+
+def _git_commit():
+    try:
+        return subprocess.check_output(["git", "rev-parse", "--short", "HEAD"],
+                                       stderr=subprocess.DEVNULL, text=True).strip()
+    except Exception:
+        return None
+
+
+def save_baseline(name, results):
+    path = _baseline_path(name)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump({
+            "created_at": datetime.now().isoformat(),
+            "git_commit": _git_commit(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "results": results,
+        }, f, indent=2)
+    print(f"\n✓ Baseline saved to {path}")
+
+
+def compare(results, baseline_name, threshold=0.2, min_seconds=0.05, min_mb=1.0):
+    """Print per-stage deltas against a baseline and return the regressions"""
+    with open(_baseline_path(baseline_name), encoding="utf-8") as f:
+        baseline = json.load(f)["results"]
+
+    regressions = []
+    print(f"\nComparison against {baseline_name} (threshold {threshold:.0%})")
+    print(f"{'dataset':<18}{'stage':<22}{'base s':>9}{'now s':>9}{'Δ':>8}{'base MB':>10}{'now MB':>9}")
+    print("-" * 85)
+    for dataset, current in results.items():
+        if dataset not in baseline:
+            continue
+        for stage, now in current["stages"].items():
+            base = baseline[dataset]["stages"].get(stage)
+            if not base:
+                continue
+            delta = (now["seconds"] - base["seconds"]) / base["seconds"] if base["seconds"] else 0
+            flag = ""
+            if delta > threshold and now["seconds"] - base["seconds"] > min_seconds:
+                regressions.append((dataset, stage, "time", base["seconds"], now["seconds"]))
+                flag = " ⚠ slower"
+            if "peak_mb" in now and "peak_mb" in base:
+                grown = now["peak_mb"] - base["peak_mb"]
+                if base["peak_mb"] and grown / base["peak_mb"] > threshold and grown > min_mb:
+                    regressions.append((dataset, stage, "memory", base["peak_mb"], now["peak_mb"]))
+                    flag += " ⚠ memory"
+            base_mb = f"{base['peak_mb']:.1f}" if "peak_mb" in base else "-"
+            now_mb = f"{now['peak_mb']:.1f}" if "peak_mb" in now else "-"
+            print(f"{dataset:<18}{stage:<22}{base['seconds']:>9.3f}{now['seconds']:>9.3f}{delta:>8.0%}"
+                  f"{base_mb:>10}{now_mb:>9}{flag}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="YouTubeAnalyzer stage benchmarks")
+    parser.add_argument("--sizes", default="10000,50000", help="Comma-separated synthetic corpus sizes")
+    parser.add_argument("--no-recorded", action="store_true", help="Skip the recorded comments dataset")
+    parser.add_argument("--stages", help=f"Comma-separated subset of: {','.join(STAGES)}")
+    parser.add_argument("--repeats", type=int, default=3, help="Timed runs per stage (best is kept)")
+    parser.add_argument("--no-memory", action="store_true", help="Skip the tracemalloc pass")
+    parser.add_argument("--sentiment", action="store_true", help="Include the transformer sentiment stage")
+    parser.add_argument("--save", metavar="NAME", help="Write results to baselines/NAME.json")
+    parser.add_argument("--compare", metavar="NAME", help="Compare against baselines/NAME.json (or a path)")
+    parser.add_argument("--threshold", type=float, default=0.2, help="Relative slowdown counted as a regression")
+    args = parser.parse_args()
+
+    sizes = [int(s) for s in args.sizes.split(",") if s]
+    only = set(args.stages.split(",")) if args.stages else None
+    results = run_suite(sizes, include_recorded=not args.no_recorded, repeats=args.repeats,
+                        trace_memory=not args.no_memory,
+                        with_sentiment=args.sentiment or bool(only and "sentiment" in only), only=only)
+
+    if args.save:
+        save_baseline(args.save, results)
+
+    if args.compare:
+        regressions = compare(results, args.compare, threshold=args.threshold)
+        if regressions:
+            print(f"\n❌ {len(regressions)} regression(s)")
+            for dataset, stage, kind, base, now in regressions:
+                print(f"   {dataset} / {stage} ({kind}): {base} → {now}")
+            sys.exit(1)
+        print("\n✓ No regressions")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,339 @@
+"""
+Synthetic comment corpus for scale benchmarks (100k - 5M comments).
+
+Emits comment records in exactly the shape YouTubeAnalyzer._extract_comment_metrics
+produces (plus the video_id analyze_channel adds) together with reply_edges,
+so every pipeline stage (calculate_influencer_scores, detect_communities,
+run_sentiment_analysis, ...) can be driven without the API.
+
+- author activity is Zipf-distributed (a few heavy commenters, a long tail)
+- authors belong to planted communities and mostly reply inside them
+- replies per thread are Pareto-distributed
+- text lengths, vocabulary, polarity and like counts are resampled from the
+  recorded comments in DatabaseExtract/cluster_results
+
+Run: python benchmarks/synthetic_corpus.py --comments 1000000 --out synthetic_data
+"""
+import argparse
+import csv
+import json
+import sys
+import time
+from collections import Counter
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from services.youtube_analyzer import EMOJI_PATTERN
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+SEED_CSV = REPO_ROOT / "DatabaseExtract" / "cluster_results" / "01_full_comments_with_clusters.csv"
+
+DAY_NAMES = np.array(["Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday"])
+# Appended to a share of comments so has_emojis is exercised
+_EMOJI = ["\U0001F600", "\U0001F525", "\U0001F602", "\U0001F680"]
+
+# Keys of a comment record, in _extract_comment_metrics order, plus video_id
+COMMENT_FIELDS = [
+    "comment_id", "author_id", "author_name", "text", "published_at", "updated_at",
+    "like_count", "is_reply", "is_channel_owner", "is_pinned", "total_reply_count",
+    "parent_id", "text_length", "word_count", "has_questions", "has_exclamations",
+    "has_links", "has_mentions", "has_hashtags", "uppercase_ratio", "sentiment_polarity",
+    "sentiment_subjectivity", "has_emojis", "hour_of_day", "day_of_week", "video_id",
+]
+EDGE_FIELDS = ["from", "to", "video_id", "timestamp"]
+
+
+class CorpusProfile:
+    """Empirical distributions the generator resamples from"""
+
+    def __init__(self, vocabulary, word_weights, word_counts, polarities, like_counts):
+        self.vocabulary = np.array(vocabulary, dtype=object)
+        self.word_weights = np.asarray(word_weights, dtype=float) / np.sum(word_weights)
+        self.word_counts = np.asarray(word_counts, dtype=np.int64)
+        self.polarities = np.asarray(polarities, dtype=float)
+        self.like_counts = np.asarray(like_counts, dtype=np.int64)
+
+    @classmethod
+    def from_csv(cls, csv_path=SEED_CSV):
+        """Build a profile from a recorded comments CSV (text_original column)"""
+        vocab = Counter()
+        word_counts, polarities, like_counts = [], [], []
+
+        with open(csv_path, encoding="utf-8") as f:
+            for row in csv.DictReader(f):
+                words = (row.get("text_original") or row.get("text") or "").split()
+                if not words:
+                    continue
+                vocab.update(words)
+                word_counts.append(len(words))
+                like_counts.append(int(float(row.get("like_count") or 0)))
+                if row.get("sentiment_vader_compound"):
+                    polarities.append(float(row["sentiment_vader_compound"]))
+
+        words, weights = zip(*vocab.items())
+        return cls(words, weights, word_counts, polarities or [0.0], like_counts)
+
+    @classmethod
+    def default(cls):
+        """The recorded-sample profile, or a tiny built-in one if the CSV is missing"""
+        if SEED_CSV.exists():
+            return cls.from_csv(SEED_CSV)
+        words = "great video love this thanks first who else here lol nice content why".split()
+        return cls(words, np.ones(len(words)), [3, 5, 8, 12, 20, 40], [-0.5, 0.0, 0.3, 0.8], [0, 0, 1, 3])
+
+
+class SyntheticCorpus:
+    """Deterministic (per seed) generator of comments and reply edges"""
+
+    def __init__(self, num_comments=100_000, num_videos=30, num_authors=None, num_communities=None,
+                 activity_alpha=1.1, reply_alpha=1.6, max_replies=500, intra_community=0.85,
+                 owner_reply_rate=0.01, profile=None, seed=42,
+                 channel_owner_id="UCsyntheticOwner00000001"):
+        self.num_comments = num_comments
+        self.num_videos = num_videos
+        self.num_authors = num_authors or max(10, num_comments // 4)
+        self.num_communities = num_communities or max(2, self.num_authors // 250)
+        self.reply_alpha = reply_alpha
+        self.max_replies = max_replies
+        self.intra_community = intra_community
+        self.owner_reply_rate = owner_reply_rate
+        self.profile = profile or CorpusProfile.default()
+        self.seed = seed
+        self.channel_owner_id = channel_owner_id
+
+        rng = np.random.default_rng(seed)
+
+        # Zipf author activity, ranks shuffled so IDs carry no signal
+        activity = 1.0 / np.arange(1, self.num_authors + 1) ** activity_alpha
+        self.activity = rng.permutation(activity / activity.sum())
+
+        # Heavy-tailed community sizes
+        community_weights = 1.0 / np.arange(1, self.num_communities + 1)
+        self.author_community = rng.choice(self.num_communities, size=self.num_authors,
+                                           p=community_weights / community_weights.sum())
+
+        # Authors grouped by community with within-community cumulative activity
+        # shifted by the community index, so one searchsorted over c + u picks a
+        # member of community c for every reply at once.
+        order = np.argsort(self.author_community, kind="stable")
+        self._members = order
+        grouped_activity = self.activity[order]
+        grouped_community = self.author_community[order]
+        totals = np.bincount(grouped_community, weights=grouped_activity, minlength=self.num_communities)
+        cumulative = np.cumsum(grouped_activity)
+        starts = np.concatenate([[0], np.cumsum(np.bincount(grouped_community, minlength=self.num_communities))[:-1]])
+        before = np.concatenate([[0.0], cumulative])[starts]
+        self._community_cum = (cumulative - before[grouped_community]) / np.maximum(totals[grouped_community], 1e-300)
+        self._community_cum = np.minimum(self._community_cum, 1.0) + grouped_community
+
+        self.author_ids = np.array([f"UCsyn{i:019d}" for i in range(self.num_authors)], dtype=object)
+        self.author_names = np.array([f"@user{i}" for i in range(self.num_authors)], dtype=object)
+        self.video_ids = [f"synvid{v:05d}" for v in range(num_videos)]
+
+        base = np.datetime64("2025-06-01T00:00:00")
+        self.video_times = base + (np.arange(num_videos) * 3 * 86400).astype("timedelta64[s]")
+
+    @property
+    def videos(self):
+        """videos_data list in the shape get_channel_videos returns"""
+        return [{
+            "video_id": video_id,
+            "title": f"Synthetic video {i}",
+            "published_at": str(self.video_times[i]) + "Z",
+            "views": 100000, "likes": 5000, "comments": self.num_comments // self.num_videos,
+            "duration": "PT10M", "description": "", "like_rate": 5.0, "comment_rate": 0.1,
+        } for i, video_id in enumerate(self.video_ids)]
+
+    def iter_batches(self):
+        """Yield (comments, reply_edges) one video at a time"""
+        per_video = np.full(self.num_videos, self.num_comments // self.num_videos)
+        per_video[: self.num_comments % self.num_videos] += 1
+        for v, target in enumerate(per_video):
+            if target:
+                yield self._generate_video(v, int(target))
+
+    def generate(self):
+        """Return (all_comments, reply_edges) lists for the whole corpus"""
+        all_comments, reply_edges = [], []
+        for comments, edges in self.iter_batches():
+            all_comments.extend(comments)
+            reply_edges.extend(edges)
+        return all_comments, reply_edges
+
+    def write(self, out_dir, fmt="jsonl"):
+        """Stream the corpus to comments/reply_edges files (jsonl or csv)"""
+        out_dir = Path(out_dir)
+        out_dir.mkdir(parents=True, exist_ok=True)
+        comments_path = out_dir / f"comments.{fmt}"
+        edges_path = out_dir / f"reply_edges.{fmt}"
+
+        with open(comments_path, "w", encoding="utf-8", newline="") as cf, \
+                open(edges_path, "w", encoding="utf-8", newline="") as ef:
+            if fmt == "csv":
+                comment_writer = csv.DictWriter(cf, fieldnames=COMMENT_FIELDS)
+                edge_writer = csv.DictWriter(ef, fieldnames=EDGE_FIELDS)
+                comment_writer.writeheader()
+                edge_writer.writeheader()
+            for comments, edges in self.iter_batches():
+                if fmt == "csv":
+                    comment_writer.writerows(comments)
+                    edge_writer.writerows(edges)
+                else:
+                    cf.writelines(json.dumps(c, ensure_ascii=False) + "\n" for c in comments)
+                    ef.writelines(json.dumps(e) + "\n" for e in edges)
+        return comments_path, edges_path
+
+    # ---- generation ------------------------------------------------------
+
+    def _generate_video(self, v, target):
+        rng = np.random.default_rng([self.seed, v])
+        video_id = self.video_ids[v]
+        profile = self.profile
+
+        # Thread sizes: 1 top-level comment + Pareto-distributed replies
+        estimate = int(target / (1 + 1 / (self.reply_alpha - 1))) + 16
+        reply_counts = np.array([], dtype=np.int64)
+        while 1 + reply_counts.size + reply_counts.sum() < target + 1:
+            more = np.minimum(np.floor(rng.pareto(self.reply_alpha, estimate)), self.max_replies).astype(np.int64)
+            reply_counts = np.concatenate([reply_counts, more])
+        sizes = np.cumsum(reply_counts + 1)
+        n_threads = int(np.searchsorted(sizes, target) + 1)
+        reply_counts = reply_counts[:n_threads]
+        reply_counts[-1] -= sizes[n_threads - 1] - target
+        n_replies = int(reply_counts.sum())
+        n = n_threads + n_replies
+
+        # Authors: top-level by global activity; replies mostly from the
+        # thread author's community, otherwise by global activity
+        top_authors = rng.choice(self.num_authors, size=n_threads, p=self.activity)
+        reply_thread = np.repeat(np.arange(n_threads), reply_counts)
+        reply_authors = rng.choice(self.num_authors, size=n_replies, p=self.activity)
+        intra = rng.random(n_replies) < self.intra_community
+        community = self.author_community[top_authors[reply_thread[intra]]]
+        picks = np.searchsorted(self._community_cum, community + rng.random(community.size))
+        reply_authors[intra] = self._members[np.minimum(picks, self.num_authors - 1)]
+        owner = rng.random(n_replies) < self.owner_reply_rate
+
+        # Record order matches analyze_comments: each top comment followed by its replies
+        is_reply = np.ones(n, dtype=bool)
+        top_pos = np.concatenate([[0], np.cumsum(reply_counts + 1)[:-1]])
+        is_reply[top_pos] = False
+        thread_of = np.repeat(np.arange(n_threads), reply_counts + 1)
+        authors = np.empty(n, dtype=np.int64)
+        authors[top_pos] = top_authors
+        authors[is_reply] = reply_authors
+
+        # Timestamps: threads spread over a week, replies shortly after their thread
+        top_offsets = rng.exponential(36 * 3600, n_threads).astype(np.int64)
+        offsets = top_offsets[thread_of]
+        offsets[is_reply] += rng.exponential(4 * 3600, n_replies).astype(np.int64) + 60
+        seconds = (self.video_times[v] - np.datetime64("1970-01-01T00:00:00")).astype(np.int64) + offsets
+        stamps = np.datetime_as_string(seconds.astype("datetime64[s]"), unit="s")
+        hours = (seconds // 3600) % 24
+        days = DAY_NAMES[((seconds // 86400) + 3) % 7]  # 1970-01-01 was a Thursday
+
+        # Text: word counts and words resampled from the profile
+        word_counts = rng.choice(profile.word_counts, size=n)
+        word_idx = rng.choice(len(profile.vocabulary), size=int(word_counts.sum()), p=profile.word_weights)
+        words = profile.vocabulary[word_idx]
+        word_ends = np.cumsum(word_counts)
+        emoji = rng.random(n) < 0.08
+        polarity = np.clip(rng.choice(profile.polarities, size=n) + rng.normal(0, 0.05, n), -1, 1)
+        subjectivity = rng.beta(2, 2, n)
+        likes = rng.choice(profile.like_counts, size=n)
+        likes[top_pos] += np.floor(rng.pareto(1.3, n_threads)).astype(np.int64)
+
+        comments = []
+        reply_edges = []
+        top_ids = [f"Ug{video_id}x{t:07d}" for t in range(n_threads)]
+        reply_index = np.zeros(n_threads, dtype=np.int64)
+        start = 0
+        for i in range(n):
+            text = " ".join(words[start:word_ends[i]])
+            start = word_ends[i]
+            if emoji[i]:
+                text += " " + _EMOJI[i % len(_EMOJI)]
+
+            t = thread_of[i]
+            reply = bool(is_reply[i])
+            if reply and owner[i - t - 1]:
+                author_id, author_name = self.channel_owner_id, "@channelowner"
+            else:
+                author_id, author_name = self.author_ids[authors[i]], self.author_names[authors[i]]
+            if reply:
+                comment_id = f"{top_ids[t]}.{reply_index[t]:05d}"
+                reply_index[t] += 1
+            else:
+                comment_id = top_ids[t]
+            published = stamps[i] + "Z"
+            lowered = text.lower()
+
+            comments.append({
+                "comment_id": comment_id,
+                "author_id": author_id,
+                "author_name": author_name,
+                "text": text,
+                "published_at": published,
+                "updated_at": published,
+                "like_count": int(likes[i]),
+                "is_reply": reply,
+                "is_channel_owner": author_id == self.channel_owner_id,
+                "is_pinned": False,
+                "total_reply_count": 0 if reply else int(reply_counts[t]),
+                "parent_id": top_ids[t] if reply else None,
+                "text_length": len(text),
+                "word_count": len(text.split()),
+                "has_questions": int("?" in text),
+                "has_exclamations": int("!" in text),
+                "has_links": int("http://" in lowered or "https://" in lowered),
+                "has_mentions": int("@" in text),
+                "has_hashtags": int("#" in text),
+                "uppercase_ratio": sum(1 for c in text if c.isupper()) / len(text) if text else 0,
+                "sentiment_polarity": float(polarity[i]),
+                "sentiment_subjectivity": float(subjectivity[i]),
+                "has_emojis": int(bool(EMOJI_PATTERN.search(text))),
+                "hour_of_day": int(hours[i]),
+                "day_of_week": str(days[i]),
+                "video_id": video_id,
+            })
+            if reply:
+                reply_edges.append({
+                    "from": author_id,
+                    "to": comments[top_pos[t]]["author_id"],
+                    "video_id": video_id,
+                    "timestamp": published,
+                })
+
+        return comments, reply_edges
+
+
+def iter_jsonl(path):
+    """Stream records back from a file written by SyntheticCorpus.write"""
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            yield json.loads(line)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate a synthetic comment corpus")
+    parser.add_argument("--comments", type=int, default=100_000)
+    parser.add_argument("--videos", type=int, default=30)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--out", default="synthetic_data", help="Output directory")
+    parser.add_argument("--format", choices=["jsonl", "csv"], default="jsonl")
+    args = parser.parse_args()
+
+    corpus = SyntheticCorpus(num_comments=args.comments, num_videos=args.videos, seed=args.seed)
+    start = time.perf_counter()
+    comments_path, edges_path = corpus.write(args.out, fmt=args.format)
+    print(f"✓ {args.comments:,} comments from {corpus.num_authors:,} authors in "
+          f"{corpus.num_communities} communities ({time.perf_counter() - start:.1f}s)")
+    print(f"  {comments_path}")
+    print(f"  {edges_path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,8 +1,11 @@
-from flask import Blueprint, jsonify, session, request
+from flask import Blueprint, Response, jsonify, session, request
 from Controller.admin_controller.admin_view_user_accounts_controller import AdminViewUserAccountsController
 from Controller.admin_controller.admin_search_user_accounts_controller import AdminSearchUserAccountsController
 from Controller.admin_controller.admin_suspend_user_account_controller import AdminSuspendUserAccountController
 from Controller.admin_controller.admin_view_feedback_controller import AdminViewFeedbackController
+from Controller.admin_controller.admin_view_analysis_profiles_controller import AdminViewAnalysisProfilesController
+from Controller.admin_controller.admin_download_analysis_profile_controller import AdminDownloadAnalysisProfileController
+from Controller.admin_controller.admin_toggle_profiling_controller import AdminToggleProfilingController
 
 admin_api_bp = Blueprint("admin_api", __name__)
 
@@ -52,3 +55,45 @@ def get_feedback():
     controller = AdminViewFeedbackController()
     feedback = controller.handle()
     return jsonify(feedback), 200
+
+
+@admin_api_bp.get("/api/admin/profiles")
+def get_analysis_profiles():
+    if not require_admin():
+        return jsonify({"error": "Unauthorized"}), 401
+
+    controller = AdminViewAnalysisProfilesController()
+    return jsonify(controller.handle()), 200
+
+
+@admin_api_bp.get("/api/admin/profiles/<profile_id>/<artifact>")
+def download_analysis_profile(profile_id, artifact):
+    if not require_admin():
+        return jsonify({"error": "Unauthorized"}), 401
+
+    controller = AdminDownloadAnalysisProfileController()
+    result = controller.handle(profile_id, artifact)
+
+    if not result.get("ok"):
+        return jsonify({"error": result.get("error", "Request failed.")}), result.get("code", 400)
+
+    return Response(
+        result["content"],
+        mimetype=result["mimetype"],
+        headers={"Content-Disposition": f'attachment; filename="{result["filename"]}"'}
+    )
+
+
+@admin_api_bp.post("/api/admin/settings/profiling")
+def toggle_profiling():
+    if not require_admin():
+        return jsonify({"error": "Unauthorized"}), 401
+
+    data = request.get_json(silent=True) or {}
+    controller = AdminToggleProfilingController()
+    result = controller.handle(bool(data.get("enabled")))
+
+    if result.get("ok"):
+        return jsonify(result), 200
+
+    return jsonify({"error": result.get("error", "Request failed.")}), result.get("code", 400)
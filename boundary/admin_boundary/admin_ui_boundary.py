@@ -42,6 +42,13 @@ def admin_reviews_page():
     return render_template("admin_reviews.html")
 
 
+@admin_ui_bp.get("/admin/profiles")
+def admin_profiles_page():
+    if not is_admin_logged_in():
+        return redirect(url_for("user.login_get"))
+    return render_template("admin_profiles.html")
+
+
 @admin_ui_bp.get("/admin/edit-website")
 def admin_edit_website_page():
     if not is_admin_logged_in():
@@ -0,0 +1,16 @@
+import os
+from flask import Blueprint, Response, request
+from services.metrics import REGISTRY
+
+metrics_bp = Blueprint("metrics", __name__)
+
+# Optional bearer token for scrapers; unset leaves /metrics open (e.g. behind a private network)
+METRICS_TOKEN = os.getenv("METRICS_TOKEN")
+
+
+@metrics_bp.get("/metrics")
+def metrics():
+    if METRICS_TOKEN and request.headers.get("Authorization") != f"Bearer {METRICS_TOKEN}":
+        return Response("Unauthorized\n", status=401, mimetype="text/plain")
+
+    return Response(REGISTRY.render(), mimetype="text/plain; version=0.0.4")
@@ -1,7 +1,9 @@
 import logging
-from flask import Blueprint, render_template, request, redirect, url_for, session
+import threading
+from flask import Blueprint, render_template, request, redirect, url_for, session, Response, stream_with_context
 import json
 from flask import jsonify
+from services.analysis_progress import ANALYSIS_JOBS, sse_message
 from Controller.registeredUser_controller.youtube_analysis_controller import YouTubeAnalysisController
 from Controller.registeredUser_controller.analysis_session_controller import AnalysisSessionController
 
@@ -253,7 +255,27 @@ def analyze_youtube():
     
     try:
         controller = YouTubeAnalysisController(user_id, project_id)
-        result = controller.analyze_youtube(youtube_url)
+        
+        # Optional "async": true returns a job id right away; follow it through
+        # /projects/analysis-jobs/<job_id>/events (SSE) or /projects/analysis-jobs/<job_id> (long-poll)
+        if data.get('async'):
+            job = ANALYSIS_JOBS.create(user_id, project_id, youtube_url)
+            threading.Thread(
+                target=run_analysis_job, args=(controller, job, data),
+                name=f"analysis-job-{job.job_id[:8]}", daemon=True
+            ).start()
+            return jsonify({
+                "success": True,
+                "job_id": job.job_id,
+                "events_url": url_for("projects.analysis_job_events", job_id=job.job_id),
+                "status_url": url_for("projects.analysis_job_status", job_id=job.job_id)
+            }), 202
+        
+        # Optional "profile": true captures a CPU/memory profile for this job (viewable by admins),
+        # "incremental": true/false overrides the incremental community detection default
+        result = controller.analyze_youtube(youtube_url, profile=bool(data.get('profile')),
+                                            refresh=bool(data.get('refresh')),
+                                            incremental=data.get('incremental'))
         
         if result['success']:
             return jsonify({
@@ -273,6 +295,87 @@ def analyze_youtube():
             "error": f"Analysis error: {str(e)}"
         }), 500
 
+def run_analysis_job(controller, job, data):
+    """Run an async analysis request, reporting into its AnalysisJob"""
+    try:
+        result = controller.analyze_youtube(
+            job.input_url,
+            progress_callback=job.progress_callback,
+            partial_callback=job.partial_callback,
+            profile=bool(data.get('profile')),
+            refresh=bool(data.get('refresh')),
+            incremental=data.get('incremental')
+        )
+        if result['success']:
+            job.finish({"success": True, "message": "Analysis completed successfully", "data": result['data']})
+        else:
+            job.finish({"success": False, "error": result.get('error', 'Analysis failed')})
+    except Exception as e:
+        logger.exception("Analysis job %s failed", job.job_id)
+        job.finish({"success": False, "error": f"Analysis error: {str(e)}"})
+
+
+def get_user_job(job_id):
+    """The analysis job if it belongs to the logged-in user"""
+    job = ANALYSIS_JOBS.get(job_id)
+    if job is None or job.user_id != get_user_id():
+        return None
+    return job
+
+
+@projects_bp.get("/projects/analysis-jobs/<job_id>/events")
+def analysis_job_events(job_id):
+    """Server-sent events: progress, partial results, then complete or error"""
+    if not get_user_id():
+        return jsonify({"success": False, "error": "Not logged in"}), 401
+    job = get_user_job(job_id)
+    if job is None:
+        return jsonify({"success": False, "error": "Analysis job not found"}), 404
+    
+    try:
+        last_seq = int(request.headers.get('Last-Event-ID') or request.args.get('after', 0))
+    except ValueError:
+        last_seq = 0
+    
+    def stream():
+        seq = last_seq
+        # Reconnecting clients that fell behind the kept events start from the snapshot
+        yield sse_message({'seq': seq, 'event': 'snapshot', 'data': job.snapshot(include_result=False)})
+        while True:
+            events = job.events_after(seq, timeout=15)
+            if not events:
+                if job.finished:
+                    return
+                yield ": keep-alive\n\n"
+                continue
+            for event in events:
+                seq = event['seq']
+                yield sse_message(event)
+                if event['event'] in ('complete', 'error'):
+                    return
+    
+    return Response(stream_with_context(stream()), mimetype="text/event-stream",
+                    headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"})
+
+
+@projects_bp.get("/projects/analysis-jobs/<job_id>")
+def analysis_job_status(job_id):
+    """Long-poll: ?after=<seq>&wait=<seconds> returns once newer events exist"""
+    if not get_user_id():
+        return jsonify({"success": False, "error": "Not logged in"}), 401
+    job = get_user_job(job_id)
+    if job is None:
+        return jsonify({"success": False, "error": "Analysis job not found"}), 404
+    
+    after = request.args.get('after', type=int, default=0)
+    wait = min(request.args.get('wait', type=float, default=0), 30)
+    events = job.events_after(after, timeout=wait)
+    
+    snapshot = job.snapshot()
+    snapshot['events'] = [e for e in events if e['event'] != 'complete']
+    return jsonify({"success": True, **snapshot}), 200
+
+
 @projects_bp.get("/projects/<int:project_id>/youtube-analyses")
 def get_youtube_analyses(project_id):
     """Get recent YouTube analyses for a project"""
@@ -326,11 +429,31 @@ def get_community_data(project_id):
     try:
         from services.community_detector import CommunityDetector
         detector = CommunityDetector()
-        data = detector.get_community_data(project_id)
+        data = detector.get_community_data(project_id, user_id)
         return jsonify(data), 200
     except Exception as e:
         return jsonify({"success": False, "error": str(e)}), 500
 
+@projects_bp.get("/projects/<int:project_id>/communities")
+@projects_bp.get("/projects/<int:project_id>/communities/<path>")
+def get_community_drilldown(project_id, path=None):
+    """Drill into a project's communities: sub-communities, members, influencers, keywords
+    
+    path is "<community_id>" or a sub-community path such as "3.1.2";
+    ?members=N limits the member list (default 50).
+    """
+    user_id = get_user_id()
+    if not user_id:
+        return jsonify({"success": False, "error": "Not logged in"}), 401
+    
+    try:
+        from Controller.registeredUser_controller.community_drilldown_controller import CommunityDrilldownController
+        controller = CommunityDrilldownController(user_id, project_id)
+        data = controller.get_community(path, request.args.get("members", 50, type=int))
+        return jsonify(data), 200 if data["success"] else 404
+    except Exception as e:
+        return jsonify({"success": False, "error": str(e)}), 500
+
 @projects_bp.get("/projects/open/<pid>")
 def projects_open(pid: str):
     # Check if user is logged in
@@ -79,6 +79,40 @@ def init_db():
         db.youtube_analysis.create_index([("created_at", -1)], name="idx_youtube_created_at")
         print("✓ Indexes created for youtube_analysis collection")
         
+        # Create indexes for crawl checkpoint collections
+        db.crawl_checkpoints.create_index([("job_key", 1), ("video_id", 1)], unique=True, name="idx_checkpoint_job_video")
+        db.crawl_checkpoint_batches.create_index([("job_key", 1), ("video_id", 1), ("seq", 1)], unique=True, name="idx_checkpoint_batch_seq")
+        print("✓ Indexes created for crawl checkpoint collections")
+        
+        # Create indexes for analysis profiles and admin settings
+        db.analysis_profiles.create_index([("created_at", -1)], name="idx_analysis_profiles_created_at")
+        db.analysis_profiles.create_index("analysis_id", name="idx_analysis_profiles_analysis_id")
+        db.admin_settings.create_index("key", unique=True, name="idx_admin_settings_key")
+        print("✓ Indexes created for analysis_profiles and admin_settings collections")
+
+        # Create indexes for the shared analysis cache
+        db.analysis_cache.create_index("key", unique=True, name="idx_analysis_cache_key")
+        db.analysis_cache.create_index([("last_used_at", -1)], name="idx_analysis_cache_last_used")
+        db.analysis_cache_chunks.create_index([("key", 1), ("generation", 1), ("seq", 1)], unique=True, name="idx_analysis_cache_chunk_seq")
+        print("✓ Indexes created for analysis cache collections")
+
+        # Create indexes for the normalized youtube_comments collection
+        db.youtube_comments.create_index("comment_id", unique=True, name="idx_youtube_comments_comment_id")
+        db.youtube_comments.create_index([("video_id", 1), ("published_at", 1)], name="idx_youtube_comments_video_published")
+        db.youtube_comments.create_index("author_id", name="idx_youtube_comments_author")
+        print("✓ Indexes created for youtube_comments collection")
+
+        # Create indexes for the per-project community store
+        db.youtube_community_analyses.create_index("project_id", unique=True, name="idx_community_analyses_project")
+        db.youtube_communities.create_index([("project_id", 1), ("community_id", 1)], unique=True, name="idx_communities_project_community")
+        db.youtube_communities.create_index([("project_id", 1), ("rank", 1)], name="idx_communities_project_rank")
+        db.youtube_community_members.create_index([("project_id", 1), ("author_channel_id", 1)], unique=True, name="idx_community_members_project_author")
+        db.youtube_community_members.create_index([("project_id", 1), ("community_id", 1), ("comment_count", -1)], name="idx_community_members_project_community")
+        db.youtube_community_members.create_index([("project_id", 1), ("paths", 1), ("comment_count", -1)], name="idx_community_members_project_path")
+        db.youtube_community_hierarchy.create_index([("project_id", 1), ("path", 1)], unique=True, name="idx_community_hierarchy_project_path")
+        db.youtube_community_hierarchy.create_index([("project_id", 1), ("parent", 1), ("size", -1)], name="idx_community_hierarchy_project_parent")
+        print("✓ Indexes created for community store collections")
+        
         # Create indexes for website_content collection
         db.website_content.create_index("page_id", unique=True, name="idx_website_content_page_id")
         print("✓ Indexes created for website_content collection")
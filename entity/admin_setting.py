@@ -0,0 +1,41 @@
+# entity/admin_setting.py
+from datetime import datetime
+from db_config import get_connection
+
+
+class AdminSetting:
+    """
+    Key/value settings admins toggle at runtime (stored in admin_settings).
+    """
+
+    PROFILE_ANALYSES = "profile_analyses"
+
+    @classmethod
+    def get(cls, key: str, default=None):
+        db = get_connection()
+        if db is None:
+            return default
+
+        try:
+            doc = db.admin_settings.find_one({"key": key})
+            return doc["value"] if doc else default
+        except Exception as e:
+            print(f"Error reading admin setting {key}: {e}")
+            return default
+
+    @classmethod
+    def set(cls, key: str, value) -> bool:
+        db = get_connection()
+        if db is None:
+            return False
+
+        try:
+            db.admin_settings.update_one(
+                {"key": key},
+                {"$set": {"value": value, "updated_at": datetime.utcnow()}},
+                upsert=True
+            )
+            return True
+        except Exception as e:
+            print(f"Error updating admin setting {key}: {e}")
+            return False
@@ -0,0 +1,66 @@
+# entity/analysis_profile.py
+from datetime import datetime
+from bson import ObjectId
+from db_config import get_connection
+
+
+class AnalysisProfile:
+    """
+    Entity for profiling artifacts (CPU stacks, top allocations) of analysis jobs.
+    """
+
+    # Large artifact fields left out of listings
+    SUMMARY_PROJECTION = {"collapsed_stacks": 0, "top_allocations": 0}
+
+    @classmethod
+    def save(cls, user_id, project_id, input_url, profile: dict, analysis_id=None) -> str | None:
+        """Store a JobProfiler result. Returns the new profile id."""
+        db = get_connection()
+        if db is None:
+            return None
+
+        try:
+            doc = {
+                "analysis_id": analysis_id,
+                "user_id": user_id,
+                "project_id": project_id,
+                "input_url": input_url,
+                **profile,
+                "created_at": datetime.utcnow(),
+            }
+            return str(db.analysis_profiles.insert_one(doc).inserted_id)
+        except Exception as e:
+            print(f"Error saving analysis profile: {e}")
+            return None
+
+    @classmethod
+    def list_recent(cls, limit: int = 50) -> list:
+        db = get_connection()
+        if db is None:
+            return []
+
+        try:
+            profiles = list(db.analysis_profiles.find({}, cls.SUMMARY_PROJECTION)
+                            .sort("created_at", -1).limit(limit))
+            for profile in profiles:
+                profile['id'] = str(profile.pop('_id'))
+                profile['created_at'] = profile['created_at'].isoformat()
+            return profiles
+        except Exception as e:
+            print(f"Error listing analysis profiles: {e}")
+            return []
+
+    @classmethod
+    def get(cls, profile_id: str) -> dict | None:
+        db = get_connection()
+        if db is None:
+            return None
+
+        try:
+            profile = db.analysis_profiles.find_one({"_id": ObjectId(profile_id)})
+            if profile:
+                profile['id'] = str(profile.pop('_id'))
+            return profile
+        except Exception as e:
+            print(f"Error fetching analysis profile: {e}")
+            return None
@@ -0,0 +1,127 @@
+# entity/youtube_comment.py
+import os
+from datetime import datetime
+from pymongo import UpdateOne
+from db_config import get_connection
+
+COMMENT_UPSERT_BATCH_SIZE = int(os.getenv('COMMENT_UPSERT_BATCH_SIZE', '1000'))
+
+
+class YouTubeComment:
+    """
+    Entity for the normalized youtube_comments collection: one document per
+    comment_id, shared by every analysis that crawled it.
+    """
+
+    # Crawled fields kept per comment (derived text features are not stored)
+    FIELDS = ("video_id", "author_id", "author_name", "text", "like_count", "is_reply",
+              "parent_id", "is_channel_owner", "total_reply_count")
+
+    @classmethod
+    def upsert_operations(cls, comments, seen_at=None) -> list:
+        """UpdateOne upserts for analyzer comment dicts, keyed by comment_id"""
+        seen_at = seen_at or datetime.utcnow()
+        operations = []
+        for comment in comments:
+            doc = {field: comment.get(field) for field in cls.FIELDS}
+            doc["published_at"] = _parse_time(comment["published_at"])
+            doc["updated_at"] = _parse_time(comment.get("updated_at") or comment["published_at"])
+            doc["last_seen_at"] = seen_at
+            operations.append(UpdateOne(
+                {"comment_id": comment["comment_id"]},
+                {"$set": doc, "$setOnInsert": {"first_seen_at": seen_at}},
+                upsert=True
+            ))
+        return operations
+
+    @classmethod
+    def upsert_many(cls, comments, batch_size: int = COMMENT_UPSERT_BATCH_SIZE) -> dict:
+        """Write comments with unordered bulk upserts, batch_size per round trip.
+
+        Returns counts of inserted (upserted), matched and modified documents.
+        """
+        counts = {"upserted": 0, "matched": 0, "modified": 0}
+        db = get_connection()
+        if db is None or not comments:
+            return counts
+
+        seen_at = datetime.utcnow()
+        for start in range(0, len(comments), batch_size):
+            operations = cls.upsert_operations(comments[start:start + batch_size], seen_at)
+            try:
+                result = db.youtube_comments.bulk_write(operations, ordered=False)
+                counts["upserted"] += result.upserted_count
+                counts["matched"] += result.matched_count
+                counts["modified"] += result.modified_count
+            except Exception as e:
+                print(f"Error upserting youtube comments: {e}")
+        return counts
+
+    @classmethod
+    def for_video(cls, video_id: str, since: datetime = None, until: datetime = None, limit: int = 0) -> list:
+        """Comments of a video in publish order, optionally within [since, until)"""
+        db = get_connection()
+        if db is None:
+            return []
+
+        try:
+            query = {"video_id": video_id}
+            if since or until:
+                query["published_at"] = {}
+                if since:
+                    query["published_at"]["$gte"] = since
+                if until:
+                    query["published_at"]["$lt"] = until
+            return list(db.youtube_comments.find(query, {"_id": 0}).sort("published_at", 1).limit(limit))
+        except Exception as e:
+            print(f"Error fetching comments for video {video_id}: {e}")
+            return []
+
+    @classmethod
+    def by_author(cls, author_id: str, limit: int = 100) -> list:
+        db = get_connection()
+        if db is None:
+            return []
+
+        try:
+            return list(db.youtube_comments.find({"author_id": author_id}, {"_id": 0})
+                        .sort("published_at", -1).limit(limit))
+        except Exception as e:
+            print(f"Error fetching comments for author {author_id}: {e}")
+            return []
+
+    @classmethod
+    def latest_published_at(cls, video_id: str) -> datetime | None:
+        """Newest stored comment time of a video (the starting point of an incremental sync)"""
+        db = get_connection()
+        if db is None:
+            return None
+
+        try:
+            latest = db.youtube_comments.find_one({"video_id": video_id}, {"published_at": 1},
+                                                  sort=[("published_at", -1)])
+            return latest["published_at"] if latest else None
+        except Exception as e:
+            print(f"Error fetching latest comment for video {video_id}: {e}")
+            return None
+
+    @classmethod
+    def existing_ids(cls, comment_ids) -> set:
+        """The subset of comment_ids already stored"""
+        db = get_connection()
+        if db is None:
+            return set()
+
+        try:
+            cursor = db.youtube_comments.find({"comment_id": {"$in": list(comment_ids)}}, {"comment_id": 1, "_id": 0})
+            return {doc["comment_id"] for doc in cursor}
+        except Exception as e:
+            print(f"Error checking stored comments: {e}")
+            return set()
+
+
+def _parse_time(value):
+    """YouTube RFC 3339 timestamp -> naive UTC datetime (as pymongo returns them)"""
+    if isinstance(value, datetime):
+        return value
+    return datetime.fromisoformat(value.replace('Z', '+00:00')).replace(tzinfo=None)
@@ -0,0 +1,259 @@
+# entity/youtube_community.py
+import uuid
+from datetime import datetime
+from pymongo import UpdateOne
+from db_config import get_connection
+
+
+class YouTubeCommunity:
+    """
+    Entity for per-project community detection results, mirroring the
+    youtube_analysis_metadata / youtube_communities / youtube_community_members
+    tables of old/youtube_community_schema.sql:
+
+    - youtube_community_analyses: one summary document per project
+    - youtube_communities: one document per (project_id, community_id)
+    - youtube_community_members: one document per (project_id, author_channel_id)
+    - youtube_community_hierarchy: one document per (project_id, path), the
+      communities' sub-communities (see services/community_hierarchy.py);
+      members carry the paths they belong to
+
+    Each save stamps its documents with a new version and then removes the
+    previous version's leftovers, so a project only holds its latest run.
+    project_id is stored as a string (routes pass ints, request bodies strings).
+    """
+
+    @classmethod
+    def save_project(cls, user_id, project_id, analysis_id, channel_url, channel_title,
+                     community_data: dict, total_comments: int) -> bool:
+        """Persist the community_detection result (with its 'members') of one analysis"""
+        db = get_connection()
+        if db is None:
+            return False
+        project_id = str(project_id)
+
+        try:
+            version = uuid.uuid4().hex
+            now = datetime.utcnow()
+            members = community_data.get('members') or []
+
+            # Most active member per community
+            top_contributors = {}
+            for member in members:
+                best = top_contributors.get(member['community_id'])
+                if best is None or member['comment_count'] > best['comment_count']:
+                    top_contributors[member['community_id']] = member
+
+            community_ops = []
+            for rank, community in enumerate(community_data.get('communities', [])):
+                top = top_contributors.get(community['community_id'], {})
+                size = community['size']
+                community_ops.append(UpdateOne(
+                    {"project_id": project_id, "community_id": community['community_id']},
+                    {"$set": {
+                        "rank": rank,
+                        "size": size,
+                        "density": community.get('density', 0),
+                        "total_comments": community['total_comments'],
+                        "total_likes": community['total_likes'],
+                        "internal_connections": community.get('internal_connections', 0),
+                        "avg_comments_per_user": round(community['total_comments'] / size, 2) if size else 0,
+                        "avg_sentiment": community.get('avg_sentiment', 0),
+                        "top_members": community.get('top_members', []),
+                        "keywords": community.get('keywords', []),
+                        "top_contributor_name": top.get('author_display_name'),
+                        "top_contributor_id": top.get('author_channel_id'),
+                        "version": version,
+                        "created_at": now
+                    }},
+                    upsert=True
+                ))
+
+            member_ops = [
+                UpdateOne(
+                    {"project_id": project_id, "author_channel_id": member['author_channel_id']},
+                    {"$set": {**member, "version": version, "created_at": now}},
+                    upsert=True
+                )
+                for member in members
+            ]
+
+            hierarchy_ops = [
+                UpdateOne(
+                    {"project_id": project_id, "path": node['path']},
+                    {"$set": {**node, "version": version, "created_at": now}},
+                    upsert=True
+                )
+                for node in community_data.get('hierarchy') or []
+            ]
+
+            if community_ops:
+                db.youtube_communities.bulk_write(community_ops, ordered=False)
+            for start in range(0, len(member_ops), 1000):
+                db.youtube_community_members.bulk_write(member_ops[start:start + 1000], ordered=False)
+            for start in range(0, len(hierarchy_ops), 1000):
+                db.youtube_community_hierarchy.bulk_write(hierarchy_ops[start:start + 1000], ordered=False)
+
+            db.youtube_community_analyses.update_one(
+                {"project_id": project_id},
+                {"$set": {
+                    "user_id": user_id,
+                    "analysis_id": analysis_id,
+                    "channel_url": channel_url,
+                    "channel_title": channel_title,
+                    "modularity": community_data.get('modularity', 0),
+                    "total_communities": community_data.get('num_communities', 0),
+                    "total_users": len(community_data.get('user_to_community', {})),
+                    "total_comments": total_comments,
+                    "network_visualization": community_data.get('network_visualization'),
+                    "bridges": (community_data.get('bridges') or {}).get('pairs', []),
+                    "version": version,
+                    "created_at": now
+                }},
+                upsert=True
+            )
+
+            stale = {"project_id": project_id, "version": {"$ne": version}}
+            db.youtube_communities.delete_many(stale)
+            db.youtube_community_members.delete_many(stale)
+            db.youtube_community_hierarchy.delete_many(stale)
+            return True
+        except Exception as e:
+            print(f"Error saving community results for project {project_id}: {e}")
+            return False
+
+    @classmethod
+    def get_summary(cls, project_id, user_id=None) -> dict | None:
+        db = get_connection()
+        if db is None:
+            return None
+        project_id = str(project_id)
+
+        try:
+            query = {"project_id": project_id}
+            if user_id is not None:
+                query["user_id"] = user_id
+            return db.youtube_community_analyses.find_one(query, {"_id": 0})
+        except Exception as e:
+            print(f"Error fetching community summary for project {project_id}: {e}")
+            return None
+
+    @classmethod
+    def get_partition(cls, project_id) -> dict | None:
+        """The project's last {'partition': {author_channel_id: community_id}, 'modularity',
+        'paths': {author_channel_id: hierarchy paths}}"""
+        db = get_connection()
+        if db is None:
+            return None
+        project_id = str(project_id)
+
+        try:
+            summary = db.youtube_community_analyses.find_one({"project_id": project_id}, {"modularity": 1})
+            if not summary:
+                return None
+            members = db.youtube_community_members.find(
+                {"project_id": project_id}, {"_id": 0, "author_channel_id": 1, "community_id": 1, "paths": 1}
+            )
+            partition, paths = {}, {}
+            for member in members:
+                partition[member['author_channel_id']] = member['community_id']
+                if member.get('paths'):
+                    paths[member['author_channel_id']] = member['paths']
+            if not partition:
+                return None
+            return {'partition': partition, 'modularity': summary.get('modularity'), 'paths': paths}
+        except Exception as e:
+            print(f"Error fetching community partition for project {project_id}: {e}")
+            return None
+
+    @classmethod
+    def get_communities(cls, project_id, limit: int = 0) -> list:
+        """Communities of a project, largest first"""
+        db = get_connection()
+        if db is None:
+            return []
+        project_id = str(project_id)
+
+        try:
+            return list(db.youtube_communities.find({"project_id": project_id}, {"_id": 0})
+                        .sort("rank", 1).limit(limit))
+        except Exception as e:
+            print(f"Error fetching communities for project {project_id}: {e}")
+            return []
+
+    @classmethod
+    def get_community(cls, project_id, community_id) -> dict | None:
+        db = get_connection()
+        if db is None:
+            return None
+        project_id = str(project_id)
+
+        try:
+            return db.youtube_communities.find_one({"project_id": project_id, "community_id": community_id},
+                                                   {"_id": 0})
+        except Exception as e:
+            print(f"Error fetching community {community_id} of project {project_id}: {e}")
+            return None
+
+    @classmethod
+    def get_members(cls, project_id, community_id, limit: int = 100) -> list:
+        """Members of one community, most active first"""
+        db = get_connection()
+        if db is None:
+            return []
+        project_id = str(project_id)
+
+        try:
+            return list(db.youtube_community_members.find({"project_id": project_id, "community_id": community_id},
+                                                          {"_id": 0})
+                        .sort("comment_count", -1).limit(limit))
+        except Exception as e:
+            print(f"Error fetching members of community {community_id}: {e}")
+            return []
+
+    @classmethod
+    def get_node(cls, project_id, path) -> dict | None:
+        """One community or sub-community of the hierarchy by path"""
+        db = get_connection()
+        if db is None:
+            return None
+        project_id = str(project_id)
+
+        try:
+            return db.youtube_community_hierarchy.find_one({"project_id": project_id, "path": path},
+                                                          {"_id": 0, "version": 0})
+        except Exception as e:
+            print(f"Error fetching community {path} of project {project_id}: {e}")
+            return None
+
+    @classmethod
+    def get_children(cls, project_id, path=None, limit: int = 0) -> list:
+        """Sub-communities of path (top-level communities for None), largest first"""
+        db = get_connection()
+        if db is None:
+            return []
+        project_id = str(project_id)
+
+        try:
+            return list(db.youtube_community_hierarchy.find({"project_id": project_id, "parent": path},
+                                                            {"_id": 0, "version": 0})
+                        .sort("size", -1).limit(limit))
+        except Exception as e:
+            print(f"Error fetching sub-communities of {path}: {e}")
+            return []
+
+    @classmethod
+    def get_node_members(cls, project_id, path, limit: int = 100) -> list:
+        """Members of a community or sub-community, most active first"""
+        db = get_connection()
+        if db is None:
+            return []
+        project_id = str(project_id)
+
+        try:
+            return list(db.youtube_community_members.find({"project_id": project_id, "paths": path},
+                                                          {"_id": 0, "version": 0})
+                        .sort("comment_count", -1).limit(limit))
+        except Exception as e:
+            print(f"Error fetching members of community {path}: {e}")
+            return []
@@ -5,13 +5,59 @@ from db_config import get_connection
 import sys
 from pathlib import Path
 
+# Rows per executemany/commit in the bulk loader
+BULK_CHUNK_SIZE = 1000
+
+INSERT_COMMENT_SQL = """
+    INSERT INTO youtube_comments 
+    (project_id, video_id, comment_id, thread_id, author_channel_id, 
+     author_display_name, is_reply, parent_comment_id, parent_author_id,
+     like_count, total_reply_count, community_id)
+    VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
+    ON DUPLICATE KEY UPDATE
+        community_id = VALUES(community_id),
+        like_count = VALUES(like_count)
+"""
+
+INSERT_COMMUNITY_SQL = """
+    INSERT INTO youtube_communities
+    (project_id, community_id, size, density, total_comments, total_likes,
+     total_replies_given, total_replies_received, internal_connections,
+     avg_comments_per_user, top_contributor_name, top_contributor_id,
+     top_contributor_subs)
+    VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
+    ON DUPLICATE KEY UPDATE
+        size = VALUES(size),
+        density = VALUES(density),
+        total_comments = VALUES(total_comments)
+"""
+
+INSERT_MEMBER_SQL = """
+    INSERT INTO youtube_community_members
+    (project_id, community_id, author_channel_id, author_display_name,
+     comment_count, likes_received)
+    VALUES (%s, %s, %s, %s, %s, %s)
+    ON DUPLICATE KEY UPDATE
+        community_id = VALUES(community_id),
+        comment_count = VALUES(comment_count),
+        likes_received = VALUES(likes_received)
+"""
+
+INSERT_METADATA_SQL = """
+    INSERT INTO youtube_analysis_metadata
+    (project_id, channel_id, channel_url, total_videos_analyzed,
+     total_comments, total_users, total_communities, modularity_score)
+    VALUES (%s, %s, %s, %s, %s, %s, %s, %s)
+"""
+
 def upload_community_data_to_mysql(
     project_id: int,
     consolidated_csv_path: str = "CommunityCSV/consolidated_community_analysis.csv",
     communities_df: pd.DataFrame = None,
     channel_url: str = None,
     channel_id: str = None,
-    modularity: float = None
+    modularity: float = None,
+    connection=None
 ):
     """
     Upload YouTube community detection results to MySQL database.
@@ -23,9 +69,13 @@ def upload_community_data_to_mysql(
         channel_url: YouTube channel URL analyzed
         channel_id: YouTube channel ID
         modularity: Modularity score from community detection
+        connection: Open MySQL connection (defaults to get_connection())
+    
+    Runs one INSERT per row; upload_community_data_to_mysql_bulk is the
+    faster path for large CSVs.
     """
     
-    connection = get_connection()
+    connection = connection or get_connection()
     if not connection:
         print("❌ Failed to connect to database")
         return False
@@ -41,20 +91,9 @@ def upload_community_data_to_mysql(
         
         # 2. Upload comments
         print("⬆️  Uploading comments to database...")
-        insert_comment_sql = """
-            INSERT INTO youtube_comments 
-            (project_id, video_id, comment_id, thread_id, author_channel_id, 
-             author_display_name, is_reply, parent_comment_id, parent_author_id,
-             like_count, total_reply_count, community_id)
-            VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
-            ON DUPLICATE KEY UPDATE
-                community_id = VALUES(community_id),
-                like_count = VALUES(like_count)
-        """
-        
         comment_count = 0
         for _, row in comments_df.iterrows():
-            cursor.execute(insert_comment_sql, (
+            cursor.execute(INSERT_COMMENT_SQL, (
                 project_id,
                 row.get('video_id'),
                 row.get('comment_id'),
@@ -79,21 +118,8 @@ def upload_community_data_to_mysql(
         # 3. Upload communities
         if communities_df is not None:
             print("⬆️  Uploading community statistics...")
-            insert_community_sql = """
-                INSERT INTO youtube_communities
-                (project_id, community_id, size, density, total_comments, total_likes,
-                 total_replies_given, total_replies_received, internal_connections,
-                 avg_comments_per_user, top_contributor_name, top_contributor_id,
-                 top_contributor_subs)
-                VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
-                ON DUPLICATE KEY UPDATE
-                    size = VALUES(size),
-                    density = VALUES(density),
-                    total_comments = VALUES(total_comments)
-            """
-            
             for _, row in communities_df.iterrows():
-                cursor.execute(insert_community_sql, (
+                cursor.execute(INSERT_COMMUNITY_SQL, (
                     project_id,
                     int(row['community_id']),
                     int(row['size']),
@@ -123,20 +149,9 @@ def upload_community_data_to_mysql(
         member_stats.columns = ['author_channel_id', 'community_id', 'author_display_name', 
                                 'comment_count', 'likes_received']
         
-        insert_member_sql = """
-            INSERT INTO youtube_community_members
-            (project_id, community_id, author_channel_id, author_display_name,
-             comment_count, likes_received)
-            VALUES (%s, %s, %s, %s, %s, %s)
-            ON DUPLICATE KEY UPDATE
-                community_id = VALUES(community_id),
-                comment_count = VALUES(comment_count),
-                likes_received = VALUES(likes_received)
-        """
-        
         for _, row in member_stats.iterrows():
             if pd.notna(row['community_id']):
-                cursor.execute(insert_member_sql, (
+                cursor.execute(INSERT_MEMBER_SQL, (
                     project_id,
                     int(row['community_id']),
                     row['author_channel_id'],
@@ -150,14 +165,7 @@ def upload_community_data_to_mysql(
         
         # 5. Upload metadata
         print("⬆️  Uploading analysis metadata...")
-        insert_metadata_sql = """
-            INSERT INTO youtube_analysis_metadata
-            (project_id, channel_id, channel_url, total_videos_analyzed,
-             total_comments, total_users, total_communities, modularity_score)
-            VALUES (%s, %s, %s, %s, %s, %s, %s, %s)
-        """
-        
-        cursor.execute(insert_metadata_sql, (
+        cursor.execute(INSERT_METADATA_SQL, (
             project_id,
             channel_id,
             channel_url,
@@ -187,6 +195,164 @@ def upload_community_data_to_mysql(
         connection.close()
 
 
+def upload_community_data_to_mysql_bulk(
+    project_id: int,
+    consolidated_csv_path: str = "CommunityCSV/consolidated_community_analysis.csv",
+    communities_df: pd.DataFrame = None,
+    channel_url: str = None,
+    channel_id: str = None,
+    modularity: float = None,
+    connection=None,
+    chunk_size: int = BULK_CHUNK_SIZE
+):
+    """
+    Bulk version of upload_community_data_to_mysql (same tables and arguments).
+    
+    The CSV is streamed in chunks of chunk_size rows; each chunk is sent with
+    one executemany (a multi-row INSERT ... ON DUPLICATE KEY UPDATE) and
+    committed on its own. Member statistics and metadata totals are
+    accumulated across chunks. If a batch fails, earlier batches stay
+    committed; the upserts are idempotent, so rerunning the upload is safe.
+    
+    Returns True on success, False otherwise.
+    """
+    
+    connection = connection or get_connection()
+    if not connection:
+        print("❌ Failed to connect to database")
+        return False
+    
+    cursor = connection.cursor()
+    try:
+        # 1-2. Stream comments, one batch per chunk
+        print(f"⬆️  Uploading comments from {consolidated_csv_path} in batches of {chunk_size}...")
+        comment_count = 0
+        member_parts = []
+        video_ids, author_ids = set(), set()
+        
+        for chunk in pd.read_csv(consolidated_csv_path, chunksize=chunk_size):
+            cursor.executemany(INSERT_COMMENT_SQL, _comment_rows(project_id, chunk))
+            connection.commit()
+            comment_count += len(chunk)
+            print(f"  Uploaded {comment_count} comments...")
+            
+            member_parts.append(chunk.groupby(['author_channel_id', 'community_id']).agg(
+                author_display_name=('author_display_name', 'first'),
+                comment_count=('comment_id', 'count'),
+                likes_received=('like_count', 'sum')
+            ))
+            video_ids.update(chunk['video_id'].dropna())
+            author_ids.update(chunk['author_channel_id'].dropna())
+        
+        print(f"✅ Uploaded {comment_count} comments")
+        
+        # 3. Upload communities
+        if communities_df is not None:
+            print("⬆️  Uploading community statistics...")
+            rows = _community_rows(project_id, communities_df)
+            for start in range(0, len(rows), chunk_size):
+                cursor.executemany(INSERT_COMMUNITY_SQL, rows[start:start + chunk_size])
+                connection.commit()
+            print(f"✅ Uploaded {len(communities_df)} communities")
+        
+        # 4. Upload community members (per-chunk aggregates combined)
+        print("⬆️  Uploading community members...")
+        member_stats = pd.DataFrame()
+        if member_parts:
+            member_stats = pd.concat(member_parts).groupby(level=[0, 1]).agg(
+                author_display_name=('author_display_name', 'first'),
+                comment_count=('comment_count', 'sum'),
+                likes_received=('likes_received', 'sum')
+            ).reset_index()
+        rows = _member_rows(project_id, member_stats)
+        for start in range(0, len(rows), chunk_size):
+            cursor.executemany(INSERT_MEMBER_SQL, rows[start:start + chunk_size])
+            connection.commit()
+        print(f"✅ Uploaded {len(rows)} community members")
+        
+        # 5. Upload metadata
+        cursor.execute(INSERT_METADATA_SQL, (
+            project_id,
+            channel_id,
+            channel_url,
+            len(video_ids),
+            comment_count,
+            len(author_ids),
+            communities_df['community_id'].nunique() if communities_df is not None else 0,
+            float(modularity) if modularity is not None else None
+        ))
+        connection.commit()
+        print("✅ Uploaded analysis metadata")
+        
+        return True
+        
+    except Exception as e:
+        print(f"❌ Error uploading data: {e}")
+        connection.rollback()
+        return False
+        
+    finally:
+        cursor.close()
+        connection.close()
+
+
+def _column(df: pd.DataFrame, name: str, default=None) -> list:
+    """A column as Python values with NaN -> default (missing columns are all default)"""
+    if name not in df:
+        return [default] * len(df)
+    series = df[name]
+    return series.astype(object).where(series.notna(), default).tolist()
+
+
+def _comment_rows(project_id: int, df: pd.DataFrame) -> list:
+    community_ids = [int(c) if c is not None else None for c in _column(df, 'community_id')]
+    return list(zip(
+        [project_id] * len(df),
+        _column(df, 'video_id'),
+        _column(df, 'comment_id'),
+        _column(df, 'thread_id'),
+        _column(df, 'author_channel_id'),
+        _column(df, 'author_display_name'),
+        [bool(v) for v in _column(df, 'is_reply', False)],
+        _column(df, 'parent_comment_id'),
+        _column(df, 'parent_author_id'),
+        [int(v) for v in _column(df, 'like_count', 0)],
+        [int(v) for v in _column(df, 'total_reply_count', 0)],
+        community_ids,
+    ))
+
+
+def _community_rows(project_id: int, df: pd.DataFrame) -> list:
+    return list(zip(
+        [project_id] * len(df),
+        [int(v) for v in df['community_id']],
+        [int(v) for v in df['size']],
+        [float(v) for v in df['density']],
+        [int(v) for v in df['total_comments']],
+        [int(v) for v in df['total_likes']],
+        [int(v) for v in df['total_replies_given']],
+        [int(v) for v in df['total_replies_received']],
+        [int(v) for v in df['internal_connections']],
+        [float(v) for v in df['avg_comments_per_user']],
+        _column(df, 'top_contributor'),
+        _column(df, 'top_contributor_id'),
+        [str(v) for v in _column(df, 'top_contributor_subs', 'unavailable')],
+    ))
+
+
+def _member_rows(project_id: int, df: pd.DataFrame) -> list:
+    if df.empty:
+        return []
+    return list(zip(
+        [project_id] * len(df),
+        [int(v) for v in df['community_id']],
+        _column(df, 'author_channel_id'),
+        _column(df, 'author_display_name'),
+        [int(v) for v in df['comment_count']],
+        [int(v) for v in df['likes_received']],
+    ))
+
+
 def query_community_data(project_id: int):
     """Query and display uploaded community data."""
     connection = get_connection()
@@ -264,7 +430,7 @@ if __name__ == "__main__":
         sys.exit(1)
     
     # Upload data
-    success = upload_community_data_to_mysql(
+    success = upload_community_data_to_mysql_bulk(
         project_id=project_id,
         consolidated_csv_path=csv_path,
         # Note: You'll need to pass communities_df, channel_url, etc. from your notebook
@@ -0,0 +1,247 @@
+# services/analysis_cache.py
+import copy
+import json
+import os
+import threading
+import uuid
+from datetime import datetime, timedelta
+
+from services.analysis_compression import pack_analysis, unpack_analysis
+from services.metrics import REGISTRY
+
+ANALYSIS_CACHE_TTL_HOURS = float(os.getenv('ANALYSIS_CACHE_TTL_HOURS', '6'))
+ANALYSIS_CACHE_RAW_TTL_HOURS = float(os.getenv('ANALYSIS_CACHE_RAW_TTL_HOURS', '24'))
+ANALYSIS_CACHE_MAX_ENTRIES = int(os.getenv('ANALYSIS_CACHE_MAX_ENTRIES', '200'))
+ANALYSIS_CACHE_MAX_MB = float(os.getenv('ANALYSIS_CACHE_MAX_MB', '2048'))
+
+# Comments/edges per chunk document (keeps each well under MongoDB's 16 MB limit)
+RAW_CHUNK_SIZE = 5000
+
+REGISTRY.describe('orbitlink_analysis_cache_lookups_total', 'counter',
+                  'Analysis cache lookups by outcome (result, raw, miss)')
+REGISTRY.describe('orbitlink_analysis_cache_evictions_total', 'counter',
+                  'Analysis cache entries evicted, by reason (age, size)')
+REGISTRY.describe('orbitlink_analysis_cache_write_failures_total', 'counter',
+                  'Analysis cache writes that failed, by operation (put, put_result)')
+
+# Process-local store used when no database handle is available
+_MEMORY = {}
+_MEMORY_LOCK = threading.Lock()
+
+
+class AnalysisCache:
+    """Analyses shared across projects, keyed by canonical target + crawl parameters.
+
+    Every entry has two tiers:
+    - result: the finished result data (packed like saved analyses, see
+      services/analysis_compression.py), served while younger than ttl and
+      built with the caller's model_version
+    - raw: the crawled metadata, comments and reply edges, served while
+      younger than raw_ttl so the result can be rebuilt without the API
+      (YouTubeAnalyzer.analyze_raw)
+
+    Ages count from the crawl. Entries older than raw_ttl are dropped, and
+    least recently used entries go first once the cache holds more than
+    max_entries or max_mb. Each entry counts its result and raw hits.
+
+    Uses the analysis_cache / analysis_cache_chunks collections when a
+    database handle is given, otherwise a process-local store.
+    """
+
+    def __init__(self, db=None, ttl_hours=ANALYSIS_CACHE_TTL_HOURS, raw_ttl_hours=ANALYSIS_CACHE_RAW_TTL_HOURS,
+                 max_entries=ANALYSIS_CACHE_MAX_ENTRIES, max_mb=ANALYSIS_CACHE_MAX_MB):
+        self.db = db
+        self.ttl = timedelta(hours=ttl_hours)
+        self.raw_ttl = timedelta(hours=max(raw_ttl_hours, ttl_hours))
+        self.max_entries = max_entries
+        self.max_bytes = max_mb * 1024 * 1024
+
+    # ---- lookups ----------------------------------------------------------
+
+    def lookup(self, key, model_version):
+        """Return ('result', result_data), ('raw', raw) or (None, None)
+
+        Both carry a 'cache' dict (tier, crawled_at, age_minutes, model_version).
+        """
+        try:
+            entry = self._read_entry(key)
+            tier, value = None, None
+            if entry:
+                age = datetime.utcnow() - entry['created_at']
+                if age <= self.ttl and entry.get('result') is not None and entry['model_version'] == model_version:
+                    tier, value = 'result', unpack_analysis(entry['result'])
+                    value['cache'] = self._cache_info(entry, tier)
+                elif age <= self.raw_ttl:
+                    value = self._read_raw(key, entry)
+                    if value is not None:
+                        tier = 'raw'
+                        value['cache'] = self._cache_info(entry, tier)
+
+            REGISTRY.inc('orbitlink_analysis_cache_lookups_total', outcome=tier or 'miss')
+            if tier:
+                self._record_hit(key, tier)
+            return tier, value
+        except Exception as e:
+            print(f"[CACHE] Lookup failed for {key}: {e}")
+            return None, None
+
+    def _cache_info(self, entry, tier):
+        return {
+            'tier': tier,
+            'crawled_at': entry['created_at'].isoformat(),
+            'age_minutes': round((datetime.utcnow() - entry['created_at']).total_seconds() / 60, 1),
+            'model_version': entry['model_version'],
+        }
+
+    # ---- writes -----------------------------------------------------------
+
+    def put(self, key, model_version, result_data, raw):
+        """Cache a fresh crawl and the result built from it"""
+        generation = uuid.uuid4().hex
+        try:
+            comments, edges = raw['comments'], raw['edges']
+            chunks = [
+                {'key': key, 'generation': generation, 'seq': seq,
+                 'comments': comments[start:start + RAW_CHUNK_SIZE],
+                 'edges': edges[start:start + RAW_CHUNK_SIZE]}
+                for seq, start in enumerate(range(0, max(len(comments), len(edges), 1), RAW_CHUNK_SIZE))
+            ]
+            now = datetime.utcnow()
+            entry = {
+                'key': key,
+                'generation': generation,
+                'model_version': model_version,
+                'analysis_type': raw['analysis_type'],
+                'result': pack_analysis(result_data),
+                'raw_meta': {k: v for k, v in raw.items() if k not in ('comments', 'edges')},
+                'chunks': len(chunks),
+                'created_at': now,
+                'last_used_at': now,
+                'hits': {'result': 0, 'raw': 0},
+            }
+            entry['size_bytes'] = _size(entry) + sum(_size(chunk) for chunk in chunks)
+
+            if self.db is not None:
+                if chunks:
+                    self.db.analysis_cache_chunks.insert_many(chunks)
+                self.db.analysis_cache.replace_one({'key': key}, entry, upsert=True)
+                self.db.analysis_cache_chunks.delete_many({'key': key, 'generation': {'$ne': generation}})
+            else:
+                with _MEMORY_LOCK:
+                    _MEMORY[key] = copy.deepcopy(dict(entry, chunk_docs=chunks))
+
+            self.evict()
+        except Exception as e:
+            print(f"[CACHE] Could not cache {key}: {e}")
+            REGISTRY.inc('orbitlink_analysis_cache_write_failures_total', operation='put')
+            if self.db is not None:
+                try:  # chunks of the failed write are never referenced
+                    self.db.analysis_cache_chunks.delete_many({'key': key, 'generation': generation})
+                except Exception:
+                    pass
+
+    def put_result(self, key, model_version, result_data):
+        """Replace the result of an entry rebuilt from its raw tier"""
+        try:
+            packed = pack_analysis(result_data)
+            if self.db is not None:
+                self.db.analysis_cache.update_one(
+                    {'key': key},
+                    {'$set': {'result': packed, 'model_version': model_version}}
+                )
+            else:
+                with _MEMORY_LOCK:
+                    if key in _MEMORY:
+                        _MEMORY[key].update(result=copy.deepcopy(packed), model_version=model_version)
+        except Exception as e:
+            print(f"[CACHE] Could not update result for {key}: {e}")
+            REGISTRY.inc('orbitlink_analysis_cache_write_failures_total', operation='put_result')
+
+    def invalidate(self, key):
+        if self.db is not None:
+            self.db.analysis_cache.delete_one({'key': key})
+            self.db.analysis_cache_chunks.delete_many({'key': key})
+        else:
+            with _MEMORY_LOCK:
+                _MEMORY.pop(key, None)
+
+    # ---- eviction and stats ----------------------------------------------
+
+    def evict(self):
+        """Drop entries past raw_ttl, then least recently used ones over the size limits"""
+        cutoff = datetime.utcnow() - self.raw_ttl
+        entries = self.stats()
+
+        expired = [e['key'] for e in entries if e['created_at'] < cutoff]
+        live = sorted((e for e in entries if e['created_at'] >= cutoff),
+                      key=lambda e: e['last_used_at'], reverse=True)
+
+        oversized = []
+        total = 0
+        for i, entry in enumerate(live):
+            total += entry['size_bytes']
+            if i >= self.max_entries or total > self.max_bytes:
+                oversized.append(entry['key'])
+
+        for key in expired + oversized:
+            self.invalidate(key)
+        if expired:
+            REGISTRY.inc('orbitlink_analysis_cache_evictions_total', len(expired), reason='age')
+        if oversized:
+            REGISTRY.inc('orbitlink_analysis_cache_evictions_total', len(oversized), reason='size')
+        return len(expired) + len(oversized)
+
+    def stats(self):
+        """Entry summaries: key, model_version, created_at, last_used_at, size_bytes, hits"""
+        fields = ('key', 'model_version', 'analysis_type', 'created_at', 'last_used_at', 'size_bytes', 'hits')
+        if self.db is not None:
+            return list(self.db.analysis_cache.find({}, {f: 1 for f in fields} | {'_id': 0}))
+        with _MEMORY_LOCK:
+            return [{f: copy.deepcopy(entry.get(f)) for f in fields} for entry in _MEMORY.values()]
+
+    # ---- storage ----------------------------------------------------------
+
+    def _read_entry(self, key):
+        if self.db is not None:
+            return self.db.analysis_cache.find_one({'key': key}, {'_id': 0})
+        with _MEMORY_LOCK:
+            entry = _MEMORY.get(key)
+            return copy.deepcopy({k: v for k, v in entry.items() if k != 'chunk_docs'}) if entry else None
+
+    def _read_raw(self, key, entry):
+        if self.db is not None:
+            chunks = list(self.db.analysis_cache_chunks.find(
+                {'key': key, 'generation': entry['generation']}
+            ).sort('seq', 1))
+        else:
+            with _MEMORY_LOCK:
+                chunks = copy.deepcopy(_MEMORY[key]['chunk_docs'])
+        if len(chunks) != entry['chunks']:
+            return None  # replaced meanwhile; treat as a miss
+
+        raw = dict(entry['raw_meta'], comments=[], edges=[])
+        for chunk in chunks:
+            raw['comments'].extend(chunk['comments'])
+            raw['edges'].extend(chunk['edges'])
+        return raw
+
+    def _record_hit(self, key, tier):
+        now = datetime.utcnow()
+        if self.db is not None:
+            self.db.analysis_cache.update_one(
+                {'key': key}, {'$inc': {f'hits.{tier}': 1}, '$set': {'last_used_at': now}}
+            )
+        else:
+            with _MEMORY_LOCK:
+                if key in _MEMORY:
+                    _MEMORY[key]['hits'][tier] += 1
+                    _MEMORY[key]['last_used_at'] = now
+
+
+def _size(doc):
+    """Approximate stored size of a document in bytes"""
+    try:
+        import bson
+        return len(bson.encode(doc))
+    except Exception:
+        return len(json.dumps(doc, default=str))
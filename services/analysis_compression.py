@@ -0,0 +1,69 @@
+# services/analysis_compression.py
+import zlib
+
+import bson
+from bson.binary import Binary
+
+try:
+    import zstandard
+except ImportError:  # zlib fallback; the codec is recorded per document
+    zstandard = None
+
+# The large parts of an analysis: per-community lists, influencer lists and
+# the base64 images (network visualization, word cloud, pie chart). The small
+# summary fields (metadata, counts, metrics) stay queryable as plain BSON.
+COMPRESSED_FIELDS = ('community_detection', 'influencers', 'sentiment_analysis')
+PACKED_KEY = 'compressed'
+ZSTD_LEVEL = 6
+
+
+def _codec():
+    return 'zstd' if zstandard is not None else 'zlib'
+
+
+def compress_bytes(data: bytes, codec: str = None) -> bytes:
+    codec = codec or _codec()
+    if codec == 'zstd':
+        return zstandard.ZstdCompressor(level=ZSTD_LEVEL).compress(data)
+    return zlib.compress(data, 6)
+
+
+def decompress_bytes(data: bytes, codec: str) -> bytes:
+    if codec == 'zstd':
+        if zstandard is None:
+            raise RuntimeError("zstandard is required to read this analysis")
+        return zstandard.ZstdDecompressor().decompress(data)
+    return zlib.decompress(data)
+
+
+def pack_analysis(analysis_data: dict) -> dict:
+    """Copy of analysis_data with COMPRESSED_FIELDS moved into one compressed
+    BSON binary under analysis_data['compressed']"""
+    if not analysis_data or PACKED_KEY in analysis_data:
+        return analysis_data
+
+    heavy = {field: analysis_data[field] for field in COMPRESSED_FIELDS if field in analysis_data}
+    if not heavy:
+        return analysis_data
+
+    raw = bson.encode(heavy)
+    codec = _codec()
+    packed = {key: value for key, value in analysis_data.items() if key not in heavy}
+    packed[PACKED_KEY] = {
+        'codec': codec,
+        'fields': list(heavy),
+        'raw_bytes': len(raw),
+        'data': Binary(compress_bytes(raw, codec)),
+    }
+    return packed
+
+
+def unpack_analysis(analysis_data: dict) -> dict:
+    """Inverse of pack_analysis; documents saved uncompressed pass through"""
+    if not analysis_data or PACKED_KEY not in analysis_data:
+        return analysis_data
+
+    packed = analysis_data[PACKED_KEY]
+    unpacked = {key: value for key, value in analysis_data.items() if key != PACKED_KEY}
+    unpacked.update(bson.decode(decompress_bytes(bytes(packed['data']), packed['codec'])))
+    return unpacked
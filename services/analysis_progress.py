@@ -0,0 +1,185 @@
+# services/analysis_progress.py
+import json
+import os
+import threading
+import time
+import uuid
+from collections import deque
+from contextlib import contextmanager
+
+# How long finished jobs stay readable, and how many events each one keeps
+ANALYSIS_JOB_RETENTION_SECONDS = int(os.getenv('ANALYSIS_JOB_RETENTION_SECONDS', '1800'))
+ANALYSIS_JOB_MAX_EVENTS = 500
+
+
+class AnalysisJob:
+    """Progress, partial results and outcome of one background analysis.
+
+    Events are numbered (seq) so SSE clients can resume with Last-Event-ID
+    and long-poll clients can ask for everything after the last seq seen.
+    Only the latest ANALYSIS_JOB_MAX_EVENTS are kept; snapshot() always has
+    the current state, including the latest partial result of every kind.
+    """
+
+    def __init__(self, job_id, user_id, project_id, input_url):
+        self.job_id = job_id
+        self.user_id = user_id
+        self.project_id = project_id
+        self.input_url = input_url
+        self.status = 'running'
+        self.message = 'Queued'
+        self.percent = 0
+        self.partials = {}
+        self.result = None
+        self.created_at = time.time()
+        self.finished_at = None
+        self._seq = 0
+        self._events = deque(maxlen=ANALYSIS_JOB_MAX_EVENTS)
+        self._changed = threading.Condition()
+
+    def publish(self, event, data):
+        with self._changed:
+            self._seq += 1
+            self._events.append({'seq': self._seq, 'event': event, 'data': data})
+            self._changed.notify_all()
+
+    def progress_callback(self, message, percent):
+        """Analyzer progress_callback(message, percent)"""
+        self.message, self.percent = message, round(percent, 1)
+        self.publish('progress', {'message': message, 'percent': self.percent})
+
+    def partial_callback(self, kind, data):
+        """Analyzer partial_callback(kind, data)"""
+        self.partials[kind] = data
+        self.publish('partial', {'kind': kind, **data})
+
+    def finish(self, result):
+        """Record the analyzer/controller result dict and wake all listeners"""
+        self.result = result
+        self.status = 'done' if result.get('success') else 'error'
+        self.finished_at = time.time()
+        if result.get('success'):
+            self.publish('complete', result)
+        else:
+            self.publish('error', {'error': result.get('error', 'Analysis failed')})
+
+    @property
+    def finished(self):
+        return self.status != 'running'
+
+    def events_after(self, seq, timeout=0):
+        """Events newer than seq, waiting up to timeout seconds for the first one"""
+        with self._changed:
+            if self._seq <= seq and not self.finished and timeout:
+                self._changed.wait_for(lambda: self._seq > seq or self.finished, timeout)
+            return [e for e in self._events if e['seq'] > seq]
+
+    def snapshot(self, include_result=True):
+        with self._changed:
+            last_seq = self._seq
+        snapshot = {
+            'job_id': self.job_id,
+            'status': self.status,
+            'message': self.message,
+            'percent': self.percent,
+            'partials': dict(self.partials),
+            'last_seq': last_seq,
+        }
+        if self.finished and include_result:
+            snapshot['result'] = self.result
+        return snapshot
+
+
+class AnalysisJobRegistry:
+    """In-process registry of background analyses, pruned after retention"""
+
+    def __init__(self, retention_seconds=ANALYSIS_JOB_RETENTION_SECONDS):
+        self.retention_seconds = retention_seconds
+        self._lock = threading.Lock()
+        self._jobs = {}
+
+    def create(self, user_id, project_id, input_url):
+        job = AnalysisJob(uuid.uuid4().hex, user_id, project_id, input_url)
+        with self._lock:
+            self._prune()
+            self._jobs[job.job_id] = job
+        return job
+
+    def get(self, job_id):
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def _prune(self):
+        cutoff = time.time() - self.retention_seconds
+        for job_id in [j for j, job in self._jobs.items() if job.finished_at and job.finished_at < cutoff]:
+            del self._jobs[job_id]
+
+
+class ProgressFanout:
+    """Forwards the callbacks of one running analysis to every request waiting on it.
+
+    Coalesced requests (see SingleFlight) do not run the analyzer themselves;
+    subscribing them under the flight key lets them see the leader's progress.
+    Late subscribers first receive the latest progress and partial results.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._subscribers = {}  # key -> list of (progress_callback, partial_callback)
+        self._latest = {}       # key -> {'progress': args, 'partials': {kind: data}}
+
+    @contextmanager
+    def subscribed(self, key, progress_callback=None, partial_callback=None):
+        entry = (progress_callback, partial_callback)
+        with self._lock:
+            self._subscribers.setdefault(key, []).append(entry)
+            latest = self._latest.get(key, {})
+        if progress_callback and latest.get('progress'):
+            progress_callback(*latest['progress'])
+        if partial_callback:
+            for kind, data in latest.get('partials', {}).items():
+                partial_callback(kind, data)
+        try:
+            yield
+        finally:
+            with self._lock:
+                self._subscribers[key].remove(entry)
+                if not self._subscribers[key]:
+                    del self._subscribers[key]
+                    self._latest.pop(key, None)
+
+    def callbacks(self, key):
+        """(progress_callback, partial_callback) broadcasting to the subscribers of key"""
+        def progress(message, percent):
+            with self._lock:
+                self._latest.setdefault(key, {'partials': {}})['progress'] = (message, percent)
+                targets = [p for p, _ in self._subscribers.get(key, ()) if p]
+            for callback in targets:
+                callback(message, percent)
+
+        def partial(kind, data):
+            with self._lock:
+                self._latest.setdefault(key, {'partials': {}})['partials'][kind] = data
+                targets = [p for _, p in self._subscribers.get(key, ()) if p]
+            for callback in targets:
+                callback(kind, data)
+
+        return progress, partial
+
+
+def sse_message(event):
+    """Format an AnalysisJob event as a text/event-stream message"""
+    data = json.dumps(event['data'], default=_json_default)
+    return f"id: {event['seq']}\nevent: {event['event']}\ndata: {data}\n\n"
+
+
+def _json_default(value):
+    if hasattr(value, 'item'):  # numpy scalars
+        return value.item()
+    if hasattr(value, 'isoformat'):
+        return value.isoformat()
+    return str(value)
+
+
+ANALYSIS_JOBS = AnalysisJobRegistry()
+ANALYSIS_PROGRESS = ProgressFanout()
@@ -0,0 +1,224 @@
+# services/columnar_store.py
+import os
+from pathlib import Path
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+# Relative paths are taken from the repository root, not the working directory
+DEFAULT_ROOT = REPO_ROOT / os.getenv('COLUMNAR_STORE_DIR', 'DatabaseExtract/columnar')
+DEFAULT_PROJECT = 'default'
+ROW_GROUP_SIZE = 50_000
+
+# Repeated ids and names are dictionary-encoded: stored once per row group
+# and referenced by int32 index, loaded as pandas categoricals on request
+_ID = pa.dictionary(pa.int32(), pa.string())
+
+SCHEMAS = {
+    # Comments fetched by the notebook pipeline, before community detection
+    'comments': pa.schema([
+        ('video_id', _ID),
+        ('comment_id', pa.string()),
+        ('thread_id', pa.string()),
+        ('author_channel_id', _ID),
+        ('author_display_name', _ID),
+        ('like_count', pa.int64()),
+        ('total_reply_count', pa.int64()),
+        ('is_reply', pa.bool_()),
+        ('parent_comment_id', pa.string()),
+        ('parent_author_id', _ID),
+    ]),
+    # CommunityCSV/consolidated_community_analysis.csv
+    'community_analysis': pa.schema([
+        ('video_id', _ID),
+        ('comment_id', pa.string()),
+        ('thread_id', pa.string()),
+        ('author_channel_id', _ID),
+        ('author_display_name', _ID),
+        ('community_id', pa.int64()),
+        ('community_size', pa.int64()),
+        ('community_density', pa.float64()),
+        ('is_reply', pa.bool_()),
+        ('parent_comment_id', pa.string()),
+        ('parent_author_id', _ID),
+        ('like_count', pa.int64()),
+        ('total_reply_count', pa.int64()),
+        ('community_total_comments', pa.int64()),
+        ('community_total_likes', pa.int64()),
+        ('community_avg_comments_per_user', pa.float64()),
+        ('community_top_contributor', _ID),
+    ]),
+    # cluster_results/01_full_comments_with_clusters.csv
+    'cluster_comments': pa.schema([
+        ('comment_id', pa.string()),
+        ('video_id', _ID),
+        ('author_channel_id', _ID),
+        ('author_display_name', _ID),
+        ('text_original', pa.string()),
+        ('published_at', pa.timestamp('s', tz='UTC')),
+        ('like_count', pa.int64()),
+        ('is_reply', pa.bool_()),
+        ('reply_count', pa.int64()),
+        ('sentiment_vader_compound', pa.float64()),
+        ('sentiment_vader_score', pa.int64()),
+        ('topic_cluster', pa.int64()),
+        ('behavior_cluster', pa.int64()),
+        ('persona', _ID),
+        ('network_community', pa.int64()),
+    ]),
+    # cluster_results/02_user_cluster_assignments.csv
+    'user_clusters': pa.schema([
+        ('author_channel_id', pa.string()),
+        ('author_display_name', pa.string()),
+        ('network_community', pa.int64()),
+        ('behavior_cluster', pa.int64()),
+        ('persona', _ID),
+    ]),
+    # cluster_results/04_community_statistics.csv
+    'community_statistics': pa.schema([
+        ('community_id', pa.int64()),
+        ('size', pa.int64()),
+        ('total_comments', pa.int64()),
+        ('avg_likes', pa.float64()),
+        ('total_likes', pa.int64()),
+        ('avg_sentiment', pa.float64()),
+    ]),
+}
+
+
+class ColumnarStore:
+    """Typed Parquet datasets for the comment and cluster tables.
+
+    Each dataset lives under <root>/<name>/project_id=<id>/ (hive layout), one
+    zstd-compressed file per project sorted by video_id, so reads filtered by
+    project skip other partitions and reads filtered by video skip row groups
+    through their min/max statistics. CSV is only an export format
+    (export_csv) or a one-off import of legacy files (import_csv).
+    """
+
+    def __init__(self, root=None):
+        self.root = Path(root) if root is not None else DEFAULT_ROOT
+
+    def path(self, name, project_id=None) -> Path:
+        project_id = DEFAULT_PROJECT if project_id is None else project_id
+        return self.root / name / f"project_id={project_id}" / "part-0.parquet"
+
+    def exists(self, name, project_id=None) -> bool:
+        return self.path(name, project_id).exists()
+
+    def version(self, name, project_id=None):
+        """(mtime_ns, size) of a project's file, None if it was never written"""
+        try:
+            stat = self.path(name, project_id).stat()
+        except FileNotFoundError:
+            return None
+        return stat.st_mtime_ns, stat.st_size
+
+    def delete(self, name, project_id=None) -> bool:
+        """Remove a project's partition; returns whether there was one"""
+        path = self.path(name, project_id)
+        if not path.exists():
+            return False
+        path.unlink()
+        return True
+
+    def to_table(self, name, df: pd.DataFrame) -> pa.Table:
+        """Coerce a DataFrame to the dataset's schema (missing columns become null)"""
+        columns = []
+        for field in SCHEMAS[name]:
+            series = df[field.name] if field.name in df else pd.Series([None] * len(df), dtype=object)
+            if pa.types.is_timestamp(field.type):
+                series = pd.to_datetime(series, utc=True, errors='coerce')
+            if pa.types.is_dictionary(field.type):
+                values = series.astype(object).where(series.notna(), None)
+                array = pa.array(values, type=pa.string(), from_pandas=True).dictionary_encode()
+                array = array.cast(field.type)
+            else:
+                array = pa.array(series, type=field.type, from_pandas=True)
+            columns.append(array)
+        return pa.Table.from_arrays(columns, schema=SCHEMAS[name])
+
+    def write(self, name, df: pd.DataFrame, project_id=None) -> Path:
+        """Replace a project's partition of the dataset with df"""
+        if 'video_id' in SCHEMAS[name].names and 'video_id' in df:
+            df = df.sort_values('video_id', kind='stable')
+        table = self.to_table(name, df)
+
+        path = self.path(name, project_id)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_suffix('.tmp')
+        pq.write_table(table, tmp_path, compression='zstd', row_group_size=ROW_GROUP_SIZE,
+                       use_dictionary=True, write_statistics=True)
+        os.replace(tmp_path, path)
+        return path
+
+    def read(self, name, project_id=None, video_ids=None, columns=None, categorical=False) -> pd.DataFrame:
+        """Read a dataset, filtered by project and/or videos before decoding.
+
+        project_id=None reads the default partition, project_id='*' all of
+        them. With categorical=True the dictionary-encoded columns load as
+        pandas categoricals; by default they are plain strings.
+        """
+        if not (self.root / name).exists():
+            return pd.DataFrame(columns=columns or SCHEMAS[name].names)
+
+        schema = SCHEMAS[name].append(pa.field('project_id', pa.string()))
+        dataset = ds.dataset(
+            self.root / name, format='parquet', schema=schema,
+            partitioning=ds.partitioning(pa.schema([('project_id', pa.string())]), flavor='hive')
+        )
+
+        predicate = None
+        if project_id != '*':
+            predicate = ds.field('project_id') == str(DEFAULT_PROJECT if project_id is None else project_id)
+        if video_ids is not None:
+            by_video = ds.field('video_id').isin(list(video_ids))
+            predicate = by_video if predicate is None else predicate & by_video
+
+        table = dataset.to_table(columns=columns or SCHEMAS[name].names, filter=predicate)
+        if not categorical:
+            table = table.cast(pa.schema([
+                pa.field(field.name, pa.string()) if pa.types.is_dictionary(field.type) else field
+                for field in table.schema
+            ]))
+        return table.to_pandas()
+
+    def import_csv(self, name, csv_path, project_id=None) -> Path:
+        return self.write(name, pd.read_csv(csv_path), project_id)
+
+    def export_csv(self, name, csv_path, project_id=None) -> Path:
+        self.read(name, project_id).to_csv(csv_path, index=False)
+        return Path(csv_path)
+
+
+# CSV exports of the notebook pipeline, relative to DatabaseExtract/
+# (03_behavioral_cluster_profiles.csv is a two-row-header pivot, left as CSV)
+LEGACY_CSVS = {
+    'community_analysis': 'CommunityCSV/consolidated_community_analysis.csv',
+    'cluster_comments': 'cluster_results/01_full_comments_with_clusters.csv',
+    'user_clusters': 'cluster_results/02_user_cluster_assignments.csv',
+    'community_statistics': 'cluster_results/04_community_statistics.csv',
+}
+
+
+def import_legacy_csvs(base_dir=REPO_ROOT / 'DatabaseExtract', store=None, project_id=None):
+    """Import the pipeline's CSV exports found under base_dir into store
+    (the default store when omitted); returns {name: path}"""
+    store = store or ColumnarStore()
+    imported = {}
+    for name, relative_path in LEGACY_CSVS.items():
+        csv_path = Path(base_dir) / relative_path
+        if csv_path.exists():
+            imported[name] = store.import_csv(name, csv_path, project_id)
+            print(f"[COLUMNAR] {csv_path} -> {imported[name]}")
+    return imported
+
+
+if __name__ == '__main__':
+    # Builds the (git-ignored) Parquet files from the committed CSV exports
+    # Run: python -m services.columnar_store [base_dir]
+    import sys
+    import_legacy_csvs(*sys.argv[1:2])
@@ -0,0 +1,176 @@
+# services/community_bridges.py
+import os
+
+import numpy as np
+
+# Shortest-path sources sampled for betweenness (exact when the graph has fewer nodes)
+BETWEENNESS_SAMPLES = int(os.getenv('BRIDGE_BETWEENNESS_SAMPLES', '32'))
+# Community pairs kept (most connected first) and bridges listed per pair
+MAX_PAIRS = 200
+TOP_BRIDGES = 10
+
+
+def adjacency(G, nodes):
+    """Symmetric CSR adjacency of G over nodes: (indptr, indices, weights)
+
+    Read straight from G's adjacency dicts, which are already row-ordered
+    and symmetric; edges to nodes outside nodes and self-loops are dropped.
+    """
+    index = {node: i for i, node in enumerate(nodes)}
+    neighbourhoods = [G._adj[node] for node in nodes]  # the raw dicts: AtlasView iteration is slow
+    counts = np.fromiter((len(nbrs) for nbrs in neighbourhoods), dtype=np.int64, count=len(nodes))
+    total = int(counts.sum())
+    cols = np.fromiter((index.get(v, -1) for nbrs in neighbourhoods for v in nbrs), dtype=np.int64, count=total)
+    weights = np.fromiter((data.get('weight', 1) for nbrs in neighbourhoods for data in nbrs.values()),
+                          dtype=float, count=total)
+    rows = np.repeat(np.arange(len(nodes)), counts)
+    kept = (cols >= 0) & (cols != rows)
+    indptr = np.r_[0, np.cumsum(np.bincount(rows[kept], minlength=len(nodes)))]
+    return indptr, cols[kept], weights[kept]
+
+
+def participation_coefficients(indptr, indices, weights, communities):
+    """Participation coefficient of every node, 1 - sum_s (k_is / k_i)^2, and its
+    weighted degree to other communities"""
+    n = len(indptr) - 1
+    rows = np.repeat(np.arange(n), np.diff(indptr))
+    n_communities = int(communities.max()) + 1 if n else 0
+    cells, cell_index = np.unique(rows * n_communities + communities[indices], return_inverse=True)
+    strength = np.bincount(cell_index, weights=weights, minlength=len(cells))
+    cell_rows = cells // n_communities
+
+    degree = np.bincount(rows, weights=weights, minlength=n)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        shares = strength / degree[cell_rows]
+    participation = 1 - np.bincount(cell_rows, weights=shares ** 2, minlength=n)
+    participation[degree == 0] = 0
+
+    external = np.bincount(rows, weights=weights * (communities[rows] != communities[indices]), minlength=n)
+    return participation, external
+
+
+def sampled_betweenness(indptr, indices, samples=BETWEENNESS_SAMPLES, seed=0):
+    """Betweenness centrality (unweighted shortest paths), estimated from
+    samples BFS sources with Brandes' accumulation.
+
+    Every BFS level is expanded with array operations over the CSR
+    adjacency, so a source costs a few passes over the edges. Normalized
+    like networkx.betweenness_centrality(k=samples); exact when samples >= n.
+    Returns (betweenness, sources used).
+    """
+    n = len(indptr) - 1
+    betweenness = np.zeros(n)
+    if n < 3:
+        return betweenness, n
+    rng = np.random.default_rng(seed)
+    sources = np.arange(n) if samples >= n else rng.choice(n, samples, replace=False)
+    degree = np.diff(indptr)
+
+    for source in sources:
+        distance = np.full(n, -1, dtype=np.int64)
+        sigma = np.zeros(n)
+        distance[source], sigma[source] = 0, 1
+        frontier, depth, levels = np.array([source]), 0, []
+        while len(frontier):
+            counts = degree[frontier]
+            parents = np.repeat(frontier, counts)
+            offsets = np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts)
+            children = indices[np.repeat(indptr[frontier], counts) + offsets]
+
+            unseen = children[distance[children] == -1]
+            distance[unseen] = depth + 1
+            tree = distance[children] == depth + 1
+            parents, children = parents[tree], children[tree]
+            sigma += np.bincount(children, weights=sigma[parents], minlength=n)
+            levels.append((parents, children))
+            frontier, depth = np.unique(children), depth + 1
+
+        delta = np.zeros(n)
+        for parents, children in reversed(levels):
+            delta += np.bincount(parents, weights=sigma[parents] / sigma[children] * (1 + delta[children]),
+                                 minlength=n)
+        delta[source] = 0
+        betweenness += delta
+
+    return betweenness * (n / len(sources)) / ((n - 1) * (n - 2)), len(sources)
+
+
+def community_bridges(G, partition, members=None, samples=BETWEENNESS_SAMPLES,
+                      max_pairs=MAX_PAIRS, top_n=TOP_BRIDGES):
+    """Users connecting communities of partition on the reply graph G.
+
+    Computes every assigned node's participation coefficient, weighted edges
+    to other communities and sampled betweenness (also set on members, keyed
+    by author id, when given), the reply edges between each community pair
+    and, per pair, its bridges: endpoints of the pair's edges ranked by
+    their weight on the pair, then betweenness.
+    """
+    nodes = [node for node in G if node in partition]
+    if not nodes:
+        return {'pairs': [], 'betweenness_samples': 0}
+    community_codes = np.array([partition[node] for node in nodes])
+    labels, communities = np.unique(community_codes, return_inverse=True)
+    indptr, indices, weights = adjacency(G, nodes)
+
+    participation, external = participation_coefficients(indptr, indices, weights, communities)
+    betweenness, used = sampled_betweenness(indptr, indices, samples)
+
+    if members is not None:
+        for i, node in enumerate(nodes):
+            if node in members:
+                members[node]['participation'] = round(float(participation[i]), 4)
+                members[node]['external_connections'] = int(external[i])
+                members[node]['betweenness'] = round(float(betweenness[i]), 6)
+
+    # Inter-community edges, each stored twice in the CSR (once per endpoint)
+    rows = np.repeat(np.arange(len(nodes)), np.diff(indptr))
+    crossing = communities[rows] != communities[indices]
+    rows, cols, cross_weights = rows[crossing], indices[crossing], weights[crossing]
+    if not len(rows):
+        return {'pairs': [], 'betweenness_samples': used}
+    n_communities = len(labels)
+    low = np.minimum(communities[rows], communities[cols])
+    high = np.maximum(communities[rows], communities[cols])
+    pair_keys = low.astype(np.int64) * n_communities + high
+
+    pairs, pair_index = np.unique(pair_keys, return_inverse=True)
+    pair_edges = np.bincount(pair_index, minlength=len(pairs)) // 2
+    pair_weight = np.bincount(pair_index, weights=cross_weights, minlength=len(pairs)) / 2
+    kept_pairs = np.lexsort((pairs, -pair_weight))[:max_pairs]
+
+    # Bridge weight of every (pair, node)
+    cells, cell_index = np.unique(pair_index.astype(np.int64) * len(nodes) + rows, return_inverse=True)
+    cell_weight = np.bincount(cell_index, weights=cross_weights, minlength=len(cells))
+    cell_pairs, cell_nodes = cells // len(nodes), cells % len(nodes)
+    order = np.lexsort((cell_nodes, -betweenness[cell_nodes], -cell_weight, cell_pairs))
+    ranked = cell_pairs[order]
+    starts = np.flatnonzero(np.r_[True, ranked[1:] != ranked[:-1]])
+    rank = np.arange(len(order)) - np.repeat(starts, np.diff(np.r_[starts, len(order)]))
+    top = order[rank < top_n]
+    top = top[np.isin(cell_pairs[top], kept_pairs)]
+
+    community_ids = labels.tolist()
+    bridges = {}
+    for pair, node, weight in zip(cell_pairs[top], cell_nodes[top], cell_weight[top]):
+        author = nodes[node]
+        bridges.setdefault(pair, []).append({
+            'author_channel_id': author,
+            'author_display_name': G.nodes[author].get('name', author),
+            'community_id': community_ids[communities[node]],
+            'pair_connections': int(weight),
+            'participation': round(float(participation[node]), 4),
+            'betweenness': round(float(betweenness[node]), 6)
+        })
+
+    return {
+        'pairs': [
+            {
+                'communities': [community_ids[pairs[p] // n_communities], community_ids[pairs[p] % n_communities]],
+                'connections': int(pair_weight[p]),
+                'edges': int(pair_edges[p]),
+                'bridges': bridges[p]
+            }
+            for p in kept_pairs
+        ],
+        'betweenness_samples': used
+    }
@@ -1,5 +1,6 @@
 # services/community_detector.py
 import networkx as nx
+import community as community_louvain
 import matplotlib
 matplotlib.use('Agg')  # Use non-GUI backend
 import matplotlib.pyplot as plt
@@ -8,25 +9,75 @@ import numpy as np
 from pathlib import Path
 import json
 import base64
+import threading
 from io import BytesIO
+from services.columnar_store import REPO_ROOT, ColumnarStore
+
+# Parsed frame, graph and aggregates (plus the rendered response) per dataset
+# file, reused until the file's mtime or size changes
+_ANALYSIS_CACHE = {}
+# Also serializes dashboard rendering (pyplot is not thread-safe)
+_ANALYSIS_CACHE_LOCK = threading.Lock()
+
+# The notebook pipeline's consolidated export, imported into the default partition
+LEGACY_CSV_DIR = REPO_ROOT / "DatabaseExtract" / "CommunityCSV"
+LEGACY_CSV = "consolidated_community_analysis.csv"
 
 class CommunityDetector:
     """Service for detecting communities in YouTube comment networks"""
     
     def __init__(self):
-        self.cache_dir = Path("CommunityCSV")
-        self.cache_dir.mkdir(exist_ok=True)
+        self.cache_dir = LEGACY_CSV_DIR
+        self.store = ColumnarStore()
     
-    def load_analysis_data(self, project_id=None):
-        """Load community detection data from cached CSV"""
-        csv_path = self.cache_dir / "consolidated_community_analysis.csv"
-        
-        if not csv_path.exists():
+    def _cache_entry(self, project_id=None):
+        """Cache entry of a project's partition (the default one for None),
+        (re)loaded when its file changed"""
+        if project_id is None:
+            self._import_legacy_csv()
+        version = self.store.version('community_analysis', project_id)
+        if version is None:
             return None
-        
+        key = str(self.store.path('community_analysis', project_id).resolve())
+        
+        with _ANALYSIS_CACHE_LOCK:
+            entry = _ANALYSIS_CACHE.get(key)
+            if entry is None or entry['version'] != version:
+                analysis_data = self._read_analysis_data(project_id)
+                if analysis_data is None:
+                    return None
+                entry = _ANALYSIS_CACHE[key] = {'version': version, 'analysis_data': analysis_data, 'response': None}
+            return entry
+    
+    def _import_legacy_csv(self):
+        """Import the consolidated CSV export in cache_dir into the default
+        partition when it is newer than the partition's file"""
+        csv_path = self.cache_dir / LEGACY_CSV
         try:
-            # Load consolidated CSV
-            consolidated_data = pd.read_csv(csv_path)
+            csv_mtime = csv_path.stat().st_mtime_ns
+        except FileNotFoundError:
+            return
+        version = self.store.version('community_analysis')
+        if version is None or csv_mtime > version[0]:
+            try:
+                self.store.import_csv('community_analysis', csv_path)
+            except Exception as e:
+                print(f"Error importing {csv_path}: {e}")
+    
+    def load_analysis_data(self, project_id=None):
+        """Load community detection data from the project's partition of the
+        community_analysis dataset (None: the default partition)
+        
+        Parsed once per file version and shared between calls: treat the
+        returned frames and graph as read-only.
+        """
+        entry = self._cache_entry(project_id)
+        return entry['analysis_data'] if entry else None
+    
+    def _read_analysis_data(self, project_id=None):
+        try:
+            # Load the project's consolidated comments
+            consolidated_data = self.store.read('community_analysis', project_id)
             
             # Build user_to_community mapping
             user_to_community = consolidated_data.groupby('author_channel_id')['community_id'].first().to_dict()
@@ -53,16 +104,17 @@ class CommunityDetector:
             
             # Create minimal network for visualization
             network = nx.DiGraph()
-            for user_id in user_to_community.keys():
-                network.add_node(user_id)
+            network.add_nodes_from(user_to_community.keys())
             
-            # Add some edges from the data
-            for _, row in consolidated_data.iterrows():
-                if pd.notna(row.get('parent_author_id')):
-                    network.add_edge(row['author_channel_id'], row['parent_author_id'])
+            # Reply edges (replier -> parent author), straight from the columns
+            if 'parent_author_id' in consolidated_data:
+                replies = consolidated_data[consolidated_data['parent_author_id'].notna()]
+                network.add_edges_from(zip(replies['author_channel_id'], replies['parent_author_id']))
             
-            # Calculate modularity (approximation)
-            modularity = 0.9004  # From previous analysis
+            # Modularity of the stored partition on the (undirected) reply graph
+            reply_graph = nx.Graph(network.subgraph(user_to_community))
+            modularity = (community_louvain.modularity(user_to_community, reply_graph)
+                          if reply_graph.number_of_edges() else 0.0)
             
             return {
                 'communities_df': communities_df,
@@ -70,8 +122,9 @@ class CommunityDetector:
                 'network': network,
                 'modularity': modularity,
                 'total_comments': len(consolidated_data),
-                'channel_url': 'https://www.youtube.com/@GenshinImpact',
-                'channel_title': 'Genshin Impact'
+                # Not recorded in the dataset
+                'channel_url': None,
+                'channel_title': None
             }
         
         except Exception as e:
@@ -241,13 +294,65 @@ Network Graph (Communities)
         
         return img_base64
     
-    def get_community_data(self, project_id=None):
-        """Get formatted community data for JSON response"""
-        analysis_data = self.load_analysis_data(project_id)
-        
-        if not analysis_data:
+    def get_community_data(self, project_id=None, user_id=None):
+        """Get formatted community data for JSON response
+        
+        Projects with a stored analysis are served from the community store
+        (YouTubeCommunity, precomputed per community). Otherwise the response
+        (including the dashboard image) is built from the project's partition
+        of the dataset once per file version; repeat calls return the cached
+        copy. Only project_id=None reads the default partition (the legacy
+        CSV export): a project without data of its own gets an error, never
+        another channel's communities.
+        """
+        if project_id is not None:
+            stored = self._stored_response(project_id, user_id)
+            if stored:
+                return stored
+        
+        entry = self._cache_entry(project_id)
+        if not entry:
             return {'success': False, 'error': 'No analysis data found'}
         
+        with _ANALYSIS_CACHE_LOCK:
+            if entry['response'] is None:
+                entry['response'] = self._build_response(entry['analysis_data'])
+            return dict(entry['response'])
+    
+    def _stored_response(self, project_id, user_id=None):
+        from entity.youtube_community import YouTubeCommunity
+        
+        summary = YouTubeCommunity.get_summary(project_id, user_id)
+        if not summary:
+            return None
+        
+        communities_list = []
+        for idx, community in enumerate(YouTubeCommunity.get_communities(project_id, limit=10)):
+            communities_list.append({
+                'id': int(community['community_id']),
+                'letter': chr(65 + idx) if idx < 26 else f"C{idx}",
+                'size': int(community['size']),
+                'total_comments': int(community['total_comments']),
+                'total_likes': int(community['total_likes']),
+                'density': float(community.get('density', 0)),
+                'avg_comments_per_user': float(community.get('avg_comments_per_user', 0)),
+                'top_contributor': str(community.get('top_contributor_name') or 'Unknown'),
+                'keywords': [keyword['term'] for keyword in community.get('keywords', [])]
+            })
+        
+        return {
+            'success': True,
+            'modularity': summary.get('modularity', 0),
+            'total_communities': summary.get('total_communities', 0),
+            'total_users': summary.get('total_users', 0),
+            'total_comments': summary.get('total_comments', 0),
+            'channel_title': summary.get('channel_title'),
+            'channel_url': summary.get('channel_url'),
+            'communities': communities_list,
+            'dashboard_image': summary.get('network_visualization')
+        }
+    
+    def _build_response(self, analysis_data):
         communities_df = analysis_data['communities_df']
         
         # Generate visualization
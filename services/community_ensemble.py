@@ -0,0 +1,120 @@
+# services/community_ensemble.py
+import math
+import multiprocessing
+import os
+import statistics
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from itertools import combinations
+
+import community as community_louvain
+import networkx as nx
+
+# Seeded Louvain runs per detection (1 = a single run, no ensemble)
+ENSEMBLE_RUNS = int(os.getenv('COMMUNITY_ENSEMBLE_RUNS', '1'))
+# 'best' keeps the highest-modularity run, 'consensus' clusters the co-association graph
+ENSEMBLE_METHOD = os.getenv('COMMUNITY_ENSEMBLE_METHOD', 'best')
+ENSEMBLE_WORKERS = int(os.getenv('COMMUNITY_ENSEMBLE_WORKERS', str(os.cpu_count() or 1)))
+# Below this many edges the runs stay in-process: pool start-up would cost more
+PARALLEL_MIN_EDGES = 5000
+# Consensus keeps edges whose endpoints share a community in at least this share of runs
+CONSENSUS_THRESHOLD = 0.5
+# Pool workers start from a clean process: forking the threaded Flask server
+# could copy locks held by other threads (spawn where forkserver is unavailable)
+POOL_START_METHOD = 'forkserver' if 'forkserver' in multiprocessing.get_all_start_methods() else 'spawn'
+
+_worker_graph = None
+
+
+def _init_worker(graph):
+    global _worker_graph
+    _worker_graph = graph
+
+
+def _louvain_run(seed, graph=None):
+    graph = _worker_graph if graph is None else graph
+    partition = community_louvain.best_partition(graph, random_state=seed)
+    return partition, community_louvain.modularity(partition, graph)
+
+
+def normalized_mutual_information(a, b):
+    """NMI (arithmetic mean normalization) of two partitions of the same nodes"""
+    n = len(a)
+    if n == 0:
+        return 1.0
+    joint = Counter((a[node], b[node]) for node in a)
+    count_a = Counter(a.values())
+    count_b = Counter(b.values())
+
+    mutual = sum(c / n * math.log(c * n / (count_a[x] * count_b[y])) for (x, y), c in joint.items())
+    entropy_a = -sum(c / n * math.log(c / n) for c in count_a.values())
+    entropy_b = -sum(c / n * math.log(c / n) for c in count_b.values())
+    if entropy_a + entropy_b == 0:
+        return 1.0
+    return 2 * mutual / (entropy_a + entropy_b)
+
+
+def consensus_partition(G, partitions, threshold=CONSENSUS_THRESHOLD, seed=0):
+    """Louvain on G's edges reweighted by how often the runs co-cluster their
+    endpoints (edges below threshold dropped)"""
+    consensus = nx.Graph()
+    consensus.add_nodes_from(G)
+    runs = len(partitions)
+    for u, v in G.edges():
+        if u == v:
+            continue
+        share = sum(partition[u] == partition[v] for partition in partitions) / runs
+        if share >= threshold:
+            consensus.add_edge(u, v, weight=share)
+    if consensus.number_of_edges() == 0:
+        return {node: i for i, node in enumerate(G)}
+    return community_louvain.best_partition(consensus, random_state=seed)
+
+
+def ensemble_partition(G, runs=None, method=None, workers=None, base_seed=0):
+    """Run seeded Louvain passes (in a process pool for large graphs) and
+    combine them into one partition.
+
+    Returns (partition, modularity, stability) where stability reports the
+    spread of the runs (and the worker processes used, 1 when in-process):
+    modularity mean/std/min/max, community counts and the
+    mean pairwise NMI between runs (1.0 = every run found the same partition).
+    """
+    runs = runs or ENSEMBLE_RUNS
+    method = method or ENSEMBLE_METHOD
+    workers = min(workers or ENSEMBLE_WORKERS, runs)
+    seeds = [base_seed + i for i in range(runs)]
+
+    if workers > 1 and G.number_of_edges() >= PARALLEL_MIN_EDGES:
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(G,),
+                                 mp_context=multiprocessing.get_context(POOL_START_METHOD)) as pool:
+            results = list(pool.map(_louvain_run, seeds))
+    else:
+        workers = 1
+        results = [_louvain_run(seed, G) for seed in seeds]
+
+    partitions = [partition for partition, _ in results]
+    modularities = [modularity for _, modularity in results]
+
+    if method == 'consensus' and runs > 1:
+        partition = consensus_partition(G, partitions, seed=base_seed)
+        modularity = community_louvain.modularity(partition, G)
+    else:
+        best = max(range(runs), key=lambda i: modularities[i])
+        partition, modularity = partitions[best], modularities[best]
+
+    pairwise = [normalized_mutual_information(a, b) for a, b in combinations(partitions, 2)]
+    stability = {
+        'method': method,
+        'runs': runs,
+        'workers': workers,
+        'modularity_mean': round(statistics.fmean(modularities), 4),
+        'modularity_std': round(statistics.pstdev(modularities), 4),
+        'modularity_min': round(min(modularities), 4),
+        'modularity_max': round(max(modularities), 4),
+        'num_communities_min': min(len(set(p.values())) for p in partitions),
+        'num_communities_max': max(len(set(p.values())) for p in partitions),
+        'mean_pairwise_nmi': round(statistics.fmean(pairwise), 4) if pairwise else 1.0,
+        'nmi_to_result': round(statistics.fmean(normalized_mutual_information(partition, p) for p in partitions), 4),
+    }
+    return partition, modularity, stability
@@ -0,0 +1,169 @@
+# services/community_hierarchy.py
+import os
+from collections import Counter, defaultdict
+
+import community as community_louvain
+
+TOP_N = 5
+# Split communities that come without a dendrogram (ensemble runs) with
+# Louvain on each one's internal edges: close to one more Louvain pass
+HIERARCHY_RESPLIT = os.getenv('COMMUNITY_HIERARCHY_RESPLIT', '0') == '1'
+
+
+def dendrogram_levels(dendrogram):
+    """Partition of the original nodes at every dendrogram level, finest first"""
+    levels = [dict(dendrogram[0])]
+    for level in dendrogram[1:]:
+        levels.append({node: level[community] for node, community in levels[-1].items()})
+    return levels
+
+
+def community_chains(G, partition, previous_paths=None, resplit=True, random_state=None):
+    """Chain of sub-community labels below partition for every node, without
+    a dendrogram of the whole graph.
+
+    A community with exactly the members it had under previous_paths (the
+    members' stored 'paths') keeps its stored sub-communities; new replies
+    among those members only show up after a full run. The others are split
+    by Louvain on their own internal edges when resplit, else left flat.
+    """
+    by_community = defaultdict(set)
+    for node, community in partition.items():
+        by_community[community].add(node)
+    previous_paths = previous_paths or {}
+    previous_members = defaultdict(set)
+    for node, node_paths in previous_paths.items():
+        if node_paths:
+            previous_members[node_paths[0]].add(node)
+
+    chains = {}
+    for community, nodes in by_community.items():
+        if nodes == previous_members.get(str(community)):
+            for node in nodes:
+                chains[node] = (community,) + tuple(previous_paths[node][1:])
+            continue
+        sub = G.subgraph(nodes)
+        if not resplit or sub.number_of_edges() == 0:
+            for node in nodes:
+                chains[node] = (community,)
+            continue
+        sublevels = dendrogram_levels(community_louvain.generate_dendrogram(sub, random_state=random_state))[::-1]
+        for node in nodes:
+            chains[node] = (community,) + tuple(level[node] for level in sublevels)
+    return chains
+
+
+def build_hierarchy(G, partition, members, dendrogram=None, previous_paths=None, resplit=True,
+                    random_state=None, top_n=TOP_N):
+    """Nested sub-communities of partition, from a Louvain dendrogram of G.
+
+    partition is the final (top-level) assignment; the dendrogram's finer
+    levels split each of its communities further, so it must come from the
+    same run. Partitions from incremental or ensemble runs pass
+    dendrogram=None: communities are then split one by one (see
+    community_chains), reusing previous_paths where nothing changed.
+
+    Nodes are addressed by path: "<community_id>" at the top, then ".<n>" per
+    level with sub-communities numbered by size. A sub-community identical to
+    its parent is not repeated. Returns the list of nodes (with per-node
+    aggregates, top members and influencers) and sets members[...]['paths']
+    to the node's chain of paths, top first.
+
+    members maps author id to the member dict built by detect_communities
+    (comment_count, likes_received, influence_score, ...).
+    """
+    if dendrogram is None:
+        chains = community_chains(G, partition, previous_paths, resplit, random_state)
+    else:
+        levels = dendrogram_levels(dendrogram)
+        # The last level is the final partition itself when it came from this dendrogram
+        if levels and all(levels[-1].get(node) == community for node, community in partition.items()):
+            levels = levels[:-1]
+        sublevels = levels[::-1]  # coarse to fine
+        chains = {
+            node: (community,) + tuple(level[node] for level in sublevels)
+            for node, community in partition.items()
+        }
+
+    # Members under every chain prefix, then paths top-down
+    prefix_members = defaultdict(list)
+    for node, chain in chains.items():
+        for depth in range(len(chain)):
+            prefix_members[chain[:depth + 1]].append(node)
+
+    paths = {}
+    children = defaultdict(list)
+    for prefix in prefix_members:
+        if len(prefix) > 1:
+            children[prefix[:-1]].append(prefix)
+    for prefix in sorted((p for p in prefix_members if len(p) == 1), key=lambda p: p[0]):
+        paths[prefix] = str(prefix[0])
+
+    nodes = []
+    for depth in range(max((len(c) for c in chains.values()), default=0)):
+        for prefix in [p for p in paths if len(p) == depth + 1]:
+            kids = sorted(children.get(prefix, []), key=lambda p: (-len(prefix_members[p]), p[-1]))
+            if len(kids) == 1 and len(prefix_members[kids[0]]) == len(prefix_members[prefix]):
+                paths[kids[0]] = paths[prefix]
+                continue
+            for rank, kid in enumerate(kids, start=1):
+                paths[kid] = f"{paths[prefix]}.{rank}"
+
+    # Internal edges per path: an edge is internal to every prefix its ends
+    # share, counted once per path (collapsed levels share their parent's)
+    internal = Counter()
+    for u, v in G.edges():
+        if u == v or u not in chains or v not in chains:
+            continue
+        cu, cv = chains[u], chains[v]
+        last = None
+        for depth in range(min(len(cu), len(cv))):
+            if cu[depth] != cv[depth]:
+                break
+            path = paths[cu[:depth + 1]]
+            if path != last:
+                internal[path] += 1
+                last = path
+
+    by_path = {}
+    for prefix, path in paths.items():
+        if path in by_path:
+            continue
+        node_members = [members[node] for node in prefix_members[prefix] if node in members]
+        size = len(prefix_members[prefix])
+        parent = paths[prefix[:-1]] if len(prefix) > 1 else None
+        by_path[path] = {
+            'path': path,
+            'community_id': prefix[0],
+            'level': path.count('.'),
+            'parent': parent,
+            'children': [],
+            'size': size,
+            'total_comments': sum(m['comment_count'] for m in node_members),
+            'total_likes': sum(m['likes_received'] for m in node_members),
+            'internal_connections': internal[path],
+            'density': round(2 * internal[path] / (size * (size - 1)), 4) if size > 1 else 0,
+            'top_members': [m['author_display_name'] for m in
+                            sorted(node_members, key=lambda m: -m['comment_count'])[:top_n]],
+            'influencers': [
+                {'author_channel_id': m['author_channel_id'], 'author_display_name': m['author_display_name'],
+                 'influence_score': m.get('influence_score', 0)}
+                for m in sorted(node_members, key=lambda m: (-m.get('influence_score', 0), -m['comment_count']))[:top_n]
+            ],
+            'keywords': [],
+        }
+    for path, node in by_path.items():
+        if node['parent'] is not None:
+            by_path[node['parent']]['children'].append(path)
+        nodes.append(node)
+
+    for node, chain in chains.items():
+        if node in members:
+            node_paths = []
+            for depth in range(len(chain)):
+                path = paths[chain[:depth + 1]]
+                if not node_paths or node_paths[-1] != path:
+                    node_paths.append(path)
+            members[node]['paths'] = node_paths
+
+    return nodes
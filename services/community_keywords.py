@@ -0,0 +1,123 @@
+# services/community_keywords.py
+import html
+
+import numpy as np
+import pandas as pd
+
+# Keywords kept per community
+TOP_TERMS = 10
+# Terms used fewer times than this across all comments are dropped as noise
+MIN_TERM_COUNT = 2
+# Words of letters (any script), apostrophes kept inside them ("don't" stays
+# one token); digits, emojis and punctuation are skipped
+TOKEN_PATTERN = r"[^\W\d_]+(?:'[^\W\d_]+)*"
+MIN_TOKEN_LENGTH = 3
+# textDisplay is HTML: tags and links are removed, then entities (&#39;) decoded
+MARKUP_PATTERN = r"<[^>]*>|https?://\S+"
+# Possessive 's is dropped ("creator's" counts as "creator"); any other token
+# with an apostrophe is a contraction (don't, could've, y'all) and skipped
+POSSESSIVE_PATTERN = r"'s\b"
+
+STOP_WORDS = frozenset("""
+a about above after again against all also am an and any are as at be because been before being below
+between both but by can cannot could did do does doing down during each even ever every few for from
+further get gets got had has have having he her here hers herself him himself his how however i if in
+into is it its itself just let like lol me more most much must my myself no nor not now of off on once
+one only or other ought our ours ourselves out over own really same say says she should so some still
+such than that the their theirs them themselves then there these they this those though through to too
+under until up upon us very was way we well were what when where which while who whom why will with
+would yeah yes yet you your yours yourself yourselves
+""".split())
+
+
+def _tokens(texts):
+    """Lower-cased tokens of texts, indexed by their text's position"""
+    words = (
+        pd.Series(texts, dtype=object).fillna('').astype(str)
+        .str.replace(MARKUP_PATTERN, ' ', regex=True)
+        .map(html.unescape)
+        .str.replace('\u2019', "'", regex=False)
+        .str.lower()
+        .str.replace(POSSESSIVE_PATTERN, '', regex=True)
+        .str.findall(TOKEN_PATTERN)
+        .explode()
+        .dropna()
+    )
+    kept = (words.str.len() >= MIN_TOKEN_LENGTH) & ~words.str.contains("'", regex=False) & ~words.isin(STOP_WORDS)
+    return words[kept]
+
+
+def ctfidf(groups, terms, top_n=TOP_TERMS, min_term_count=MIN_TERM_COUNT, corpus=None):
+    """Top class-based TF-IDF terms of every group.
+
+    groups and terms are parallel arrays, one entry per token occurrence
+    and group. The group-by-term matrix is kept sparse as (group, term,
+    count) triplets; scores are tf(t, g) * log(1 + A / f(t)) with tf
+    normalized by the group's token count, f(t) the term's count in corpus
+    and A the mean tokens per group. corpus (every token once) defaults to
+    terms; pass it when a token can be in several groups, as with nested
+    communities. Returns {group: [{'term', 'score'}, ...]}, best first.
+    """
+    group_codes, group_labels = pd.factorize(np.asarray(groups, dtype=object))
+    term_codes, term_labels = pd.factorize(np.asarray(terms, dtype=object))
+    if not len(group_codes):
+        return {}
+    n_terms = len(term_labels)
+
+    if corpus is None:
+        term_totals = np.bincount(term_codes, minlength=n_terms)
+    else:
+        term_totals = pd.Series(corpus, dtype=object).value_counts().reindex(term_labels).to_numpy()
+    kept = term_totals[term_codes] >= min_term_count
+    group_codes, term_codes = group_codes[kept], term_codes[kept]
+    if not len(group_codes):
+        return {}
+
+    # One pass: the nonzero cells of the group x term count matrix
+    cells, counts = np.unique(group_codes.astype(np.int64) * n_terms + term_codes, return_counts=True)
+    cell_groups, cell_terms = cells // n_terms, cells % n_terms
+
+    group_sizes = np.bincount(cell_groups, weights=counts, minlength=len(group_labels))
+    mean_size = group_sizes[group_sizes > 0].mean()
+    scores = counts / group_sizes[cell_groups] * np.log1p(mean_size / term_totals[cell_terms])
+
+    # Rank within each group: sort by (group, -score, term), keep the first top_n
+    order = np.lexsort((cell_terms, -scores, cell_groups))
+    ranked_groups = cell_groups[order]
+    starts = np.flatnonzero(np.r_[True, ranked_groups[1:] != ranked_groups[:-1]])
+    rank = np.arange(len(order)) - np.repeat(starts, np.diff(np.r_[starts, len(order)]))
+    top = order[rank < top_n]
+
+    keywords = {}
+    for group, term, score in zip(cell_groups[top], cell_terms[top], scores[top]):
+        keywords.setdefault(group_labels[group], []).append(
+            {'term': term_labels[term], 'score': round(float(score), 5)}
+        )
+    return keywords
+
+
+def keyword_index(all_comments, author_groups, top_n=TOP_TERMS):
+    """Top c-TF-IDF terms per group for comments grouped by their author.
+
+    author_groups maps author id to the list of groups the author belongs
+    to (e.g. the member's hierarchy paths, top-level community first), so
+    every level of the community tree is scored in the same pass. Authors
+    outside author_groups are ignored.
+    """
+    comments = pd.DataFrame(
+        [(c.get('author_id'), c.get('text', '')) for c in all_comments],
+        columns=['author_id', 'text']
+    )
+    comments = comments[comments['author_id'].isin(author_groups.keys())]
+    if comments.empty:
+        return {}
+
+    words = _tokens(comments['text'].to_numpy())
+    authors = comments['author_id'].to_numpy()[words.index.to_numpy()]
+
+    # Token occurrences x the author's groups, as parallel arrays
+    groups = pd.Series(author_groups, dtype=object).explode()
+    tokens = pd.DataFrame({'author_id': authors, 'term': words.to_numpy()}).merge(
+        groups.rename('group').rename_axis('author_id').reset_index(), on='author_id'
+    )
+    return ctfidf(tokens['group'].to_numpy(), tokens['term'].to_numpy(), top_n=top_n, corpus=words.to_numpy())
@@ -0,0 +1,224 @@
+# services/community_upload.py
+import abc
+import os
+import random
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+import pandas as pd
+from pymongo import ReplaceOne
+from pymongo.errors import AutoReconnect, ExecutionTimeout
+
+UPLOAD_WORKERS = int(os.getenv('COMMUNITY_UPLOAD_WORKERS', '4'))
+UPLOAD_MAX_RETRIES = int(os.getenv('COMMUNITY_UPLOAD_MAX_RETRIES', '5'))
+
+
+class BatchWriter(abc.ABC):
+    """Writes documents in fixed-size batches from a pool of worker threads.
+
+    Each batch is retried with exponential backoff (plus jitter) when it
+    fails with one of the retryable errors (none by default: subclasses list
+    their backend's transient errors, anything else fails the write at once).
+    Documents carry deterministic ids and batches overwrite by id, so a
+    retried or repeated batch never creates duplicates. Subclasses implement
+    _commit(collection, docs).
+    """
+
+    batch_size = 500
+    retryable = ()
+
+    def __init__(self, batch_size=None, workers=UPLOAD_WORKERS, max_retries=UPLOAD_MAX_RETRIES, backoff=0.5):
+        self.batch_size = batch_size or self.batch_size
+        self.workers = workers
+        self.max_retries = max_retries
+        self.backoff = backoff
+
+    def write(self, collection, docs):
+        """Write (doc_id, doc) pairs; returns the number written"""
+        docs = list(docs)
+        batches = [docs[i:i + self.batch_size] for i in range(0, len(docs), self.batch_size)]
+        with ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix='community-upload') as pool:
+            # list() re-raises the first failed batch
+            list(pool.map(lambda batch: self._commit_with_retry(collection, batch), batches))
+        return len(docs)
+
+    def _commit_with_retry(self, collection, batch):
+        for attempt in range(self.max_retries + 1):
+            try:
+                return self._commit(collection, batch)
+            except self.retryable as e:
+                if attempt == self.max_retries:
+                    raise
+                delay = self.backoff * (2 ** attempt) * (1 + random.random())
+                print(f"[UPLOAD] {collection} batch of {len(batch)} failed ({e}); retrying in {delay:.1f}s")
+                time.sleep(delay)
+
+    @abc.abstractmethod
+    def _commit(self, collection, batch):
+        """Write one batch of (doc_id, doc) pairs, overwriting by id"""
+
+
+class MongoBatchWriter(BatchWriter):
+    """Unordered bulk_write of ReplaceOne upserts (MongoDB / Firestore with MongoDB compatibility)"""
+
+    batch_size = 1000
+    retryable = (AutoReconnect, ExecutionTimeout)
+
+    def __init__(self, db, **kwargs):
+        super().__init__(**kwargs)
+        self.db = db
+
+    def _commit(self, collection, batch):
+        operations = [ReplaceOne({'_id': doc_id}, doc, upsert=True) for doc_id, doc in batch]
+        self.db[collection].bulk_write(operations, ordered=False)
+
+
+class FirestoreBatchWriter(BatchWriter):
+    """Firestore WriteBatch commits (at most 500 writes each) through a firebase_admin client"""
+
+    batch_size = 500
+
+    def __init__(self, client, **kwargs):
+        super().__init__(**kwargs)
+        self.client = client
+        self.batch_size = min(self.batch_size, 500)
+        try:
+            from google.api_core import exceptions as gexc
+            self.retryable = (gexc.ServiceUnavailable, gexc.DeadlineExceeded, gexc.Aborted,
+                              gexc.ResourceExhausted, gexc.InternalServerError)
+        except ImportError:
+            pass
+
+    def _commit(self, collection, batch):
+        write_batch = self.client.batch()
+        for doc_id, doc in batch:
+            write_batch.set(self.client.collection(collection).document(doc_id), doc)
+        write_batch.commit()
+
+
+def build_documents(project_id, communities_df, user_to_community, comments_df):
+    """(doc_id, doc) pairs per collection: communities, comments and users"""
+    communities = [
+        (f"{project_id}:{int(row.community_id)}", {
+            'project_id': project_id,
+            'community_id': int(row.community_id),
+            'size': int(row.size),
+            'total_comments': int(row.total_comments),
+            'total_likes': int(row.total_likes),
+            'total_replies_given': int(row.total_replies_given),
+            'total_replies_received': int(row.total_replies_received),
+            'internal_connections': int(row.internal_connections),
+            'density': float(row.density),
+            'avg_comments_per_user': float(row.avg_comments_per_user),
+            'top_contributor': str(row.top_contributor),
+            'top_contributor_id': str(row.top_contributor_id),
+            'top_contributor_subs': str(getattr(row, 'top_contributor_subs', 'unavailable')),
+        })
+        for row in communities_df.itertuples(index=False)
+    ]
+
+    def optional(column):
+        if column not in comments_df:
+            return [None] * len(comments_df)
+        series = comments_df[column]
+        return series.astype(str).where(series.notna(), None).tolist()
+
+    community_ids = comments_df['author_channel_id'].map(user_to_community).fillna(-1).astype(int).tolist()
+    thread_ids = comments_df['thread_id'].astype(str).tolist() if 'thread_id' in comments_df else [''] * len(comments_df)
+    reply_counts = (comments_df['total_reply_count'].fillna(0).astype(int).tolist()
+                    if 'total_reply_count' in comments_df else [0] * len(comments_df))
+    comments = [
+        (f"{project_id}:{comment_id}", {
+            'project_id': project_id,
+            'video_id': str(video_id),
+            'comment_id': str(comment_id),
+            'thread_id': thread_id,
+            'author_channel_id': str(author_id),
+            'author_display_name': str(author_name),
+            'community_id': community_id,
+            'is_reply': bool(is_reply),
+            'like_count': int(like_count),
+            'total_reply_count': reply_count,
+            'parent_comment_id': parent_comment_id,
+            'parent_author_id': parent_author_id,
+        })
+        for video_id, comment_id, thread_id, author_id, author_name, community_id, is_reply, like_count,
+            reply_count, parent_comment_id, parent_author_id in zip(
+            comments_df['video_id'], comments_df['comment_id'], thread_ids, comments_df['author_channel_id'],
+            comments_df['author_display_name'], community_ids, comments_df['is_reply'],
+            comments_df['like_count'].fillna(0), reply_counts,
+            optional('parent_comment_id'), optional('parent_author_id'))
+    ]
+
+    # Per-user stats in one groupby instead of one comments_df filter per user
+    is_reply = comments_df['is_reply'].astype(bool)
+    stats = pd.DataFrame({
+        'author_channel_id': comments_df['author_channel_id'],
+        'top_level': ~is_reply,
+        'reply': is_reply,
+        'like_count': comments_df['like_count'].fillna(0),
+        'author_display_name': comments_df['author_display_name'],
+    }).groupby('author_channel_id').agg(
+        total_comments=('top_level', 'sum'),
+        total_replies=('reply', 'sum'),
+        total_likes=('like_count', 'sum'),
+        display_name=('author_display_name', 'first'),
+    )
+    users = []
+    for user_id, community_id in user_to_community.items():
+        row = stats.loc[user_id] if user_id in stats.index else None
+        users.append((f"{project_id}:{user_id}", {
+            'project_id': project_id,
+            'user_id': str(user_id),
+            'community_id': int(community_id),
+            'total_comments': int(row['total_comments']) if row is not None else 0,
+            'total_replies': int(row['total_replies']) if row is not None else 0,
+            'total_likes': int(row['total_likes']) if row is not None else 0,
+            'display_name': str(row['display_name']) if row is not None else 'Unknown',
+        }))
+
+    return {'communities': communities, 'comments': comments, 'users': users}
+
+
+def publish_community_results(writer, channel_url, channel_id, communities_df, user_to_community,
+                              comments_df, modularity, project_name=None):
+    """Write one channel's community detection results through a BatchWriter.
+
+    Collections: projects (metadata), communities, comments and users
+    (user -> community mapping with per-user stats). Returns a summary with
+    document counts and timings, or None if the upload failed.
+    """
+    project_id = project_name or f"youtube_analysis_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
+    start = time.perf_counter()
+    try:
+        collections = build_documents(project_id, communities_df, user_to_community, comments_df)
+        built = time.perf_counter()
+
+        now = datetime.now()
+        writer.write('projects', [(project_id, {
+            'channel_url': channel_url,
+            'channel_id': channel_id,
+            'total_communities': len(communities_df),
+            'total_users': len(user_to_community),
+            'total_comments': len(comments_df),
+            'modularity_score': float(modularity),
+            'analysis_date': now,
+            'created_at': now,
+        })])
+
+        counts = {name: writer.write(name, docs) for name, docs in collections.items()}
+        summary = {
+            'project_id': project_id,
+            'counts': counts,
+            'build_seconds': round(built - start, 3),
+            'write_seconds': round(time.perf_counter() - built, 3),
+        }
+        print(f"[UPLOAD] Project {project_id}: {counts} in {summary['build_seconds'] + summary['write_seconds']:.2f}s")
+        return summary
+
+    except Exception as e:
+        print(f"[UPLOAD] Error publishing community results: {e}")
+        import traceback
+        traceback.print_exc()
+        return None
@@ -0,0 +1,217 @@
+# services/crawl_checkpoint.py
+import hashlib
+import json
+import os
+from datetime import datetime, timedelta
+from pathlib import Path
+
+CHECKPOINT_MAX_AGE_HOURS = int(os.getenv('CRAWL_CHECKPOINT_MAX_AGE_HOURS', '24'))
+
+
+class CrawlCheckpoint:
+    """Persisted state of one crawl job so a retried job resumes where it stopped.
+
+    State is kept per job key:
+    - a job record with the resolved channel, its metadata and the video list
+    - per video: the next commentThreads page token, the truncated threads
+      still waiting for reply expansion and whether the video is complete
+    - per video: the comment/edge batches fetched so far, one per page
+
+    Uses the crawl_checkpoints / crawl_checkpoint_batches collections when a
+    database handle is given, otherwise JSON files under cache_dir.
+    """
+
+    def __init__(self, job_key, db=None, cache_dir="checkpoints", max_age_hours=CHECKPOINT_MAX_AGE_HOURS):
+        self.job_key = job_key
+        self.db = db
+        self.max_age = timedelta(hours=max_age_hours)
+        self._job_dir = None
+        if db is None:
+            digest = hashlib.sha1(job_key.encode('utf-8')).hexdigest()[:16]
+            self._job_dir = Path(cache_dir) / digest
+
+    # ---- job record -------------------------------------------------------
+
+    def load_job(self):
+        """Return the saved job record, or None if there is none or it is stale"""
+        return self._read_state(None)
+
+    def save_job(self, channel_id, channel_metadata, videos_data):
+        """Record the resolved channel and video list so a resume skips search.list"""
+        self._write_state(None, {
+            'channel_id': channel_id,
+            'channel_metadata': channel_metadata,
+            'videos': videos_data,
+        })
+
+    # ---- per-video progress ----------------------------------------------
+
+    def load_video(self, video_id):
+        """Return saved progress for a video.
+
+        Keys: comments, edges, truncated_threads (list of [comment_index,
+        missing_replies]), page_token, threads_done, completed.
+        None if the video was never started or its progress is stale.
+        """
+        state = self._read_state(video_id)
+        if not state:
+            return None
+
+        comments = []
+        edges = []
+        for batch in self._read_batches(video_id, state['seq']):
+            comments.extend(batch['comments'])
+            edges.extend(batch['edges'])
+
+        return {
+            'comments': comments,
+            'edges': edges,
+            'truncated_threads': state.get('truncated_threads', []),
+            'page_token': state.get('page_token'),
+            'threads_done': state.get('threads_done', False),
+            'completed': state.get('completed', False),
+        }
+
+    def save_page(self, video_id, comments, edges, truncated_threads, page_token):
+        """Append one commentThreads page and move the video's page token forward"""
+        state = self._read_state(video_id) or {'seq': 0, 'truncated_threads': []}
+        seq = state['seq'] + 1
+
+        # Batch first, then the state that makes it visible: a crash in
+        # between leaves an orphan batch that load_video ignores.
+        self._write_batch(video_id, seq, comments, edges)
+        self._write_state(video_id, {
+            'seq': seq,
+            'truncated_threads': state['truncated_threads'] + truncated_threads,
+            'page_token': page_token,
+            'threads_done': not page_token,
+            'completed': False,
+        })
+
+    def complete_video(self, video_id, comments=(), edges=()):
+        """Store the reply-expansion batch and mark the video finished"""
+        state = self._read_state(video_id) or {'seq': 0}
+        seq = state['seq'] + 1
+        self._write_batch(video_id, seq, list(comments), list(edges))
+        self._write_state(video_id, {
+            'seq': seq,
+            'truncated_threads': [],
+            'page_token': None,
+            'threads_done': True,
+            'completed': True,
+        })
+
+    def clear(self):
+        """Delete all state for this job (called once the crawl succeeds)"""
+        try:
+            if self.db is not None:
+                self.db.crawl_checkpoints.delete_many({"job_key": self.job_key})
+                self.db.crawl_checkpoint_batches.delete_many({"job_key": self.job_key})
+            elif self._job_dir.exists():
+                for path in self._job_dir.iterdir():
+                    path.unlink()
+                self._job_dir.rmdir()
+        except Exception as e:
+            print(f"[CHECKPOINT] Error clearing checkpoint {self.job_key}: {e}")
+
+    # ---- storage ----------------------------------------------------------
+
+    def _state_path(self, video_id):
+        return self._job_dir / (f"{video_id}.state.json" if video_id else "job.json")
+
+    def _read_state(self, video_id):
+        """Saved state of the job (video_id None) or a video; state older than
+        max_age is deleted and reads as None"""
+        state = self._load_state(video_id)
+        if not state:
+            return None
+
+        updated_at = state.get('updated_at')
+        if isinstance(updated_at, str):
+            updated_at = datetime.fromisoformat(updated_at)
+        if updated_at and datetime.utcnow() - updated_at > self.max_age:
+            print(f"[CHECKPOINT] Discarding stale checkpoint for {self.job_key}"
+                  + (f" video {video_id}" if video_id else ""))
+            if video_id is None:
+                self.clear()
+            else:
+                self._delete_video(video_id)
+            return None
+
+        return state
+
+    def _load_state(self, video_id):
+        if self.db is not None:
+            doc = self.db.crawl_checkpoints.find_one({"job_key": self.job_key, "video_id": video_id})
+            if doc:
+                doc.pop('_id', None)
+            return doc
+
+        path = self._state_path(video_id)
+        if not path.exists():
+            return None
+        with open(path, encoding='utf-8') as f:
+            return json.load(f)
+
+    def _delete_video(self, video_id):
+        try:
+            if self.db is not None:
+                self.db.crawl_checkpoints.delete_many({"job_key": self.job_key, "video_id": video_id})
+                self.db.crawl_checkpoint_batches.delete_many({"job_key": self.job_key, "video_id": video_id})
+                return
+            for path in (self._state_path(video_id), self._job_dir / f"{video_id}.batches.jsonl"):
+                if path.exists():
+                    path.unlink()
+        except Exception as e:
+            print(f"[CHECKPOINT] Error deleting checkpoint {self.job_key} video {video_id}: {e}")
+
+    def _write_state(self, video_id, state):
+        state = dict(state, job_key=self.job_key, video_id=video_id, updated_at=datetime.utcnow())
+
+        if self.db is not None:
+            self.db.crawl_checkpoints.replace_one(
+                {"job_key": self.job_key, "video_id": video_id}, state, upsert=True
+            )
+            return
+
+        self._job_dir.mkdir(parents=True, exist_ok=True)
+        path = self._state_path(video_id)
+        tmp_path = path.with_suffix('.tmp')
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(state, f, default=str)
+        os.replace(tmp_path, path)
+
+    def _write_batch(self, video_id, seq, comments, edges):
+        if self.db is not None:
+            self.db.crawl_checkpoint_batches.replace_one(
+                {"job_key": self.job_key, "video_id": video_id, "seq": seq},
+                {"job_key": self.job_key, "video_id": video_id, "seq": seq,
+                 "comments": comments, "edges": edges},
+                upsert=True
+            )
+            return
+
+        self._job_dir.mkdir(parents=True, exist_ok=True)
+        with open(self._job_dir / f"{video_id}.batches.jsonl", 'a', encoding='utf-8') as f:
+            f.write(json.dumps({"seq": seq, "comments": comments, "edges": edges}, default=str) + "\n")
+
+    def _read_batches(self, video_id, max_seq):
+        if self.db is not None:
+            return list(self.db.crawl_checkpoint_batches.find(
+                {"job_key": self.job_key, "video_id": video_id, "seq": {"$lte": max_seq}}
+            ).sort("seq", 1))
+
+        path = self._job_dir / f"{video_id}.batches.jsonl"
+        if not path.exists():
+            return []
+
+        batches = {}
+        with open(path, encoding='utf-8') as f:
+            for line in f:
+                try:
+                    batch = json.loads(line)
+                except ValueError:
+                    continue  # torn final line from an interrupted write
+                if batch['seq'] <= max_seq:
+                    batches[batch['seq']] = batch
+        return [batches[seq] for seq in sorted(batches)]
@@ -0,0 +1,130 @@
+# services/graph_centrality.py
+import os
+
+import numpy as np
+import pandas as pd
+
+# Fold the reply-graph centrality_score into influencers' network_score
+CENTRALITY_NETWORK_SCORE = os.getenv('CENTRALITY_NETWORK_SCORE', '0') == '1'
+
+PAGERANK_ALPHA = 0.85
+# Power iterations stop once the scores' total (L1) change drops below TOLERANCE.
+# networkx scales it by the node count, which stops after a few iterations on large graphs
+TOLERANCE = 1e-6
+MAX_ITERATIONS = 200
+
+
+def reply_matrix(reply_edges):
+    """Weighted directed reply graph as sparse COO arrays.
+
+    Returns (nodes, rows, cols, weights): an edge row -> col per replier ->
+    replied-to author pair, weighted by its number of replies. Self-replies
+    are dropped.
+    """
+    edges = pd.DataFrame([(edge['from'], edge['to']) for edge in reply_edges], columns=['from', 'to'])
+    edges = edges[edges['from'] != edges['to']]
+    codes, nodes = pd.factorize(pd.concat([edges['from'], edges['to']], ignore_index=True))
+    if not len(nodes):
+        return [], np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int64), np.zeros(0)
+    n = len(nodes)
+    cells, counts = np.unique(codes[:len(edges)].astype(np.int64) * n + codes[len(edges):], return_counts=True)
+    return list(nodes), cells // n, cells % n, counts.astype(float)
+
+
+def pagerank(rows, cols, weights, n, alpha=PAGERANK_ALPHA, tol=TOLERANCE, max_iter=MAX_ITERATIONS):
+    """Weighted PageRank by power iteration; dangling nodes' rank is spread
+    uniformly. Returns (ranks summing to 1, iterations)."""
+    out_strength = np.bincount(rows, weights=weights, minlength=n)
+    dangling = out_strength == 0
+    transition = weights / out_strength[rows]
+    rank = np.full(n, 1 / n)
+    for iteration in range(1, max_iter + 1):
+        previous = rank
+        rank = alpha * np.bincount(cols, weights=previous[rows] * transition, minlength=n)
+        rank += (alpha * previous[dangling].sum() + 1 - alpha) / n
+        if np.abs(rank - previous).sum() < tol:
+            break
+    return rank, iteration
+
+
+def hits(rows, cols, weights, n, tol=TOLERANCE, max_iter=MAX_ITERATIONS):
+    """HITS hub and authority scores (each summing to 1) by power iteration.
+    Returns (hubs, authorities, iterations)."""
+    hub = np.full(n, 1 / n)
+    authority = np.zeros(n)
+    for iteration in range(1, max_iter + 1):
+        previous = hub
+        authority = np.bincount(cols, weights=previous[rows] * weights, minlength=n)
+        hub = np.bincount(rows, weights=authority[cols] * weights, minlength=n)
+        hub /= hub.sum() or 1
+        if np.abs(hub - previous).sum() < tol:
+            break
+    authority /= authority.sum() or 1
+    return hub, authority, iteration
+
+
+def core_numbers(rows, cols, n):
+    """k-core number of every node of the undirected simple graph under the
+    edges, by peeling every node at or below the current degree at once."""
+    pairs = np.unique(np.minimum(rows, cols) * n + np.maximum(rows, cols))
+    u, v = pairs // n, pairs % n
+    ends, others = np.r_[u, v], np.r_[v, u]
+    order = np.argsort(ends, kind='stable')
+    others = others[order]
+    degree = np.bincount(ends, minlength=n)
+    indptr = np.r_[0, np.cumsum(degree)]
+
+    core = np.zeros(n, dtype=np.int64)
+    alive = np.ones(n, dtype=bool)
+    k = 0
+    while alive.any():
+        k = max(k, degree[alive].min())
+        peel = np.flatnonzero(alive & (degree <= k))
+        while len(peel):
+            core[peel] = k
+            alive[peel] = False
+            counts = indptr[peel + 1] - indptr[peel]
+            offsets = np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts)
+            neighbours = others[np.repeat(indptr[peel], counts) + offsets]
+            degree -= np.bincount(neighbours[alive[neighbours]], minlength=n)
+            peel = np.flatnonzero(alive & (degree <= k))
+    return core
+
+
+def percentile_ranks(values):
+    """Share of values strictly below each value (0 for the lowest)"""
+    if not len(values):
+        return np.zeros(0)
+    return np.searchsorted(np.sort(values), values, side='left') / len(values)
+
+
+def reply_graph_centrality(reply_edges):
+    """PageRank, HITS hub/authority and k-core numbers of every user on the
+    reply graph, plus a 0-10 centrality_score combining their percentile
+    ranks (PageRank, authority) with the user's share of the top k-core.
+
+    Returns ({author_id: {...}}, info) where info records the iterations
+    each power method needed.
+    """
+    nodes, rows, cols, weights = reply_matrix(reply_edges)
+    n = len(nodes)
+    if not n:
+        return {}, {'users': 0}
+
+    rank, pagerank_iterations = pagerank(rows, cols, weights, n)
+    hub, authority, hits_iterations = hits(rows, cols, weights, n)
+    core = core_numbers(rows, cols, n)
+    score = 10 * (percentile_ranks(rank) + percentile_ranks(authority) + core / max(core.max(), 1)) / 3
+
+    centrality = {
+        node: {
+            'pagerank': float(rank[i]),
+            'hub_score': float(hub[i]),
+            'authority_score': float(authority[i]),
+            'core_number': int(core[i]),
+            'centrality_score': float(score[i])
+        }
+        for i, node in enumerate(nodes)
+    }
+    return centrality, {'users': n, 'pagerank_iterations': pagerank_iterations,
+                        'hits_iterations': hits_iterations}
@@ -0,0 +1,125 @@
+# services/incremental_communities.py
+import os
+from collections import Counter, defaultdict
+
+import community as community_louvain
+
+# Fall back to a full Louvain run when the warm-started partition's modularity
+# is this much below the modularity of the partition it was seeded from
+MODULARITY_DROP_THRESHOLD = float(os.getenv('COMMUNITY_MODULARITY_DROP', '0.05'))
+# ... or when less than this share of the graph's nodes has a previous community
+MIN_SEED_COVERAGE = 0.5
+MAX_PASSES = 10
+
+
+def relabel_to_previous(partition, previous):
+    """Renumber partition's communities to the previous community ids they
+    overlap most (largest overlaps first, each previous id used once); new
+    communities get ids above the previous maximum"""
+    overlap = Counter((community, previous[node]) for node, community in partition.items() if node in previous)
+    mapping, used = {}, set()
+    for (community, previous_id), _ in overlap.most_common():
+        if community not in mapping and previous_id not in used:
+            mapping[community] = previous_id
+            used.add(previous_id)
+
+    next_id = max(previous.values(), default=-1) + 1
+    for community in sorted(set(partition.values()) - set(mapping)):
+        mapping[community] = next_id
+        next_id += 1
+    return {node: mapping[community] for node, community in partition.items()}
+
+
+def affected_nodes(G, seed):
+    """Nodes to re-place: new nodes, their neighbors, and nodes with an edge
+    into another community (where new edges between known nodes show up)"""
+    affected = set()
+    for node in G:
+        if node not in seed:
+            affected.add(node)
+            affected.update(G.neighbors(node))
+    for u, v in G.edges():
+        if u in seed and v in seed and seed[u] != seed[v]:
+            affected.add(u)
+            affected.add(v)
+    return affected
+
+
+def local_moving(G, partition, nodes, resolution=1.0, max_passes=MAX_PASSES):
+    """Louvain's first phase restricted to nodes: move each to the neighboring
+    community with the best modularity gain until none moves. Edits partition."""
+    m2 = 2 * G.size(weight='weight')
+    if not m2:
+        return partition
+    degree = dict(G.degree(weight='weight'))
+    totals = defaultdict(float)
+    for node, community in partition.items():
+        totals[community] += degree[node]
+
+    # Deterministic order so repeated runs on the same input agree
+    nodes = sorted(nodes, key=str)
+    for _ in range(max_passes):
+        moved = 0
+        for node in nodes:
+            current = partition[node]
+            k = degree[node]
+            links = defaultdict(float)
+            for neighbor, data in G[node].items():
+                if neighbor != node:
+                    links[partition[neighbor]] += data.get('weight', 1)
+
+            totals[current] -= k
+            best, best_gain = current, links.get(current, 0) - resolution * totals[current] * k / m2
+            for community, weight in links.items():
+                gain = weight - resolution * totals[community] * k / m2
+                if gain > best_gain:
+                    best, best_gain = community, gain
+            totals[best] += k
+            if best != current:
+                partition[node] = best
+                moved += 1
+        if not moved:
+            break
+    return partition
+
+
+def incremental_partition(G, previous, previous_modularity=None,
+                          max_drop=MODULARITY_DROP_THRESHOLD, random_state=None):
+    """Community partition of G warm-started from a previous user_to_community.
+
+    Known nodes keep their previous community; new nodes start alone and only
+    the affected nodes (see affected_nodes) are moved. Community ids of the
+    previous run are kept. Falls back to a full Louvain run (relabelled to
+    the previous ids) when too few nodes are known or modularity drops more
+    than max_drop below previous_modularity.
+
+    Returns (partition, modularity, info) where info describes the run.
+    """
+    seed = {node: community for node, community in (previous or {}).items() if node in G}
+    info = {'mode': 'incremental', 'seeded_nodes': len(seed), 'new_nodes': G.number_of_nodes() - len(seed)}
+
+    if not seed or len(seed) < MIN_SEED_COVERAGE * G.number_of_nodes():
+        info['fallback'] = 'low_seed_coverage'
+    else:
+        partition = dict(seed)
+        next_id = max(previous.values()) + 1
+        for node in G:
+            if node not in partition:
+                partition[node] = next_id
+                next_id += 1
+
+        nodes = affected_nodes(G, seed)
+        info['affected_nodes'] = len(nodes)
+        local_moving(G, partition, nodes)
+        modularity = community_louvain.modularity(partition, G)
+
+        if previous_modularity is None or modularity >= previous_modularity - max_drop:
+            return partition, modularity, info
+        info['fallback'] = 'modularity_drop'
+        info['incremental_modularity'] = round(modularity, 3)
+
+    info['mode'] = 'full'
+    partition = community_louvain.best_partition(G, random_state=random_state)
+    if previous:
+        partition = relabel_to_previous(partition, previous)
+    return partition, community_louvain.modularity(partition, G), info
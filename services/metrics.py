@@ -0,0 +1,221 @@
+# services/metrics.py
+import threading
+import time
+from contextlib import contextmanager
+from urllib.parse import urlsplit
+
+from services.quota_budget import QUOTA_COSTS
+
+DEFAULT_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300, 600)
+
+
+class MetricsRegistry:
+    """In-process counters and histograms rendered in the Prometheus text format"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._meta = {}         # name -> (type, help, buckets)
+        self._counters = {}     # (name, labels) -> value
+        self._histograms = {}   # (name, labels) -> [bucket counts..., sum, count]
+
+    def describe(self, name, kind, help_text, buckets=DEFAULT_BUCKETS):
+        self._meta[name] = (kind, help_text, tuple(buckets))
+
+    def inc(self, name, value=1, **labels):
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + value
+
+    def observe(self, name, value, **labels):
+        buckets = self._meta[name][2]
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            state = self._histograms.setdefault(key, [0] * len(buckets) + [0.0, 0])
+            for i, bound in enumerate(buckets):
+                if value <= bound:
+                    state[i] += 1
+            state[-2] += value
+            state[-1] += 1
+
+    def reset(self):
+        with self._lock:
+            self._counters.clear()
+            self._histograms.clear()
+
+    def render(self):
+        """Exposition text for a /metrics scrape"""
+        with self._lock:
+            counters = dict(self._counters)
+            histograms = {k: list(v) for k, v in self._histograms.items()}
+
+        lines = []
+        for name, (kind, help_text, buckets) in sorted(self._meta.items()):
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} {kind}")
+            if kind == 'counter':
+                for (metric, labels), value in sorted(counters.items()):
+                    if metric == name:
+                        lines.append(f"{name}{_labels(labels)} {_number(value)}")
+            else:
+                for (metric, labels), state in sorted(histograms.items()):
+                    if metric != name:
+                        continue
+                    for bound, count in zip(buckets, state):
+                        lines.append(f"{name}_bucket{_labels(labels + (('le', _number(bound)),))} {count}")
+                    lines.append(f"{name}_bucket{_labels(labels + (('le', '+Inf'),))} {state[-1]}")
+                    lines.append(f"{name}_sum{_labels(labels)} {_number(state[-2])}")
+                    lines.append(f"{name}_count{_labels(labels)} {state[-1]}")
+        return "\n".join(lines) + "\n"
+
+
+def _labels(labels):
+    if not labels:
+        return ""
+    escaped = (str(v).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n') for _, v in labels)
+    return "{" + ",".join(f'{k}="{v}"' for (k, _), v in zip(labels, escaped)) + "}"
+
+
+def _number(value):
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+REGISTRY = MetricsRegistry()
+REGISTRY.describe('orbitlink_analysis_runs_total', 'counter', 'Analyses finished, by type and status')
+REGISTRY.describe('orbitlink_analysis_coalesced_total', 'counter', 'Analysis requests that joined an identical in-flight analysis')
+REGISTRY.describe('orbitlink_analysis_seconds', 'histogram', 'End-to-end analysis duration')
+REGISTRY.describe('orbitlink_analysis_stage_seconds', 'histogram', 'Time spent per analysis stage')
+REGISTRY.describe('orbitlink_analysis_stage_items_total', 'counter', 'Items processed per analysis stage')
+REGISTRY.describe('orbitlink_youtube_api_requests_total', 'counter', 'YouTube Data API requests by endpoint and HTTP status')
+REGISTRY.describe('orbitlink_youtube_api_seconds', 'histogram', 'YouTube Data API request latency',
+                  buckets=(0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30))
+REGISTRY.describe('orbitlink_youtube_api_bytes_total', 'counter', 'YouTube Data API response bytes')
+REGISTRY.describe('orbitlink_youtube_api_units_total', 'counter', 'YouTube Data API quota units spent')
+
+
+def endpoint_from_uri(uri, method='GET'):
+    """'https://.../youtube/v3/commentThreads?...' -> 'commentThreads.list'"""
+    resource = urlsplit(uri).path.rstrip('/').rsplit('/', 1)[-1] or 'unknown'
+    action = {'GET': 'list', 'POST': 'insert', 'PUT': 'update', 'DELETE': 'delete'}.get(method, method.lower())
+    return f"{resource}.{action}"
+
+
+class InstrumentedHttp:
+    """httplib2.Http wrapper reporting latency and response size of every request"""
+
+    def __init__(self, http, on_response):
+        self.http = http
+        self.on_response = on_response
+
+    def request(self, uri, method='GET', *args, **kwargs):
+        start = time.perf_counter()
+        status = 'error'
+        content = b''
+        try:
+            resp, content = self.http.request(uri, method, *args, **kwargs)
+            status = str(resp.status)
+            return resp, content
+        finally:
+            self.on_response(endpoint_from_uri(uri, method), time.perf_counter() - start,
+                             len(content or b''), status)
+
+    def __getattr__(self, name):
+        return getattr(self.http, name)
+
+
+class AnalysisTrace:
+    """Structured per-stage timings of one analysis run.
+
+    Stages are timed with span(); work spread over many small calls (and
+    threads), like per-comment feature extraction, is accumulated with add().
+    API requests are recorded per endpoint with latency, bytes and quota units.
+    Everything is also exported to REGISTRY for the /metrics endpoint.
+    """
+
+    def __init__(self, analysis_type, registry=REGISTRY):
+        self.analysis_type = analysis_type
+        self.registry = registry
+        self.started_at = time.time()
+        self._start = time.perf_counter()
+        self._lock = threading.Lock()
+        self.stages = {}
+        self.api = {}
+        self._accumulated = set()
+        self.total_seconds = None
+
+    @contextmanager
+    def span(self, stage, items=None):
+        """Time a stage; set span['items'] inside the block to record a count"""
+        span = {'items': items}
+        start = time.perf_counter()
+        try:
+            yield span
+        finally:
+            self.record_stage(stage, time.perf_counter() - start, span['items'])
+
+    def record_stage(self, stage, seconds, items=None):
+        """Record a finished stage and export it; returns the stored entry"""
+        entry = {'seconds': round(seconds, 4)}
+        if items is not None:
+            entry['items'] = items
+        with self._lock:
+            self.stages[stage] = entry
+        self.registry.observe('orbitlink_analysis_stage_seconds', seconds, stage=stage)
+        if items:
+            self.registry.inc('orbitlink_analysis_stage_items_total', items, stage=stage)
+        return entry
+
+    def add(self, stage, seconds, items=1):
+        """Accumulate time into a stage; exported when the trace finishes"""
+        with self._lock:
+            entry = self.stages.setdefault(stage, {'seconds': 0.0, 'items': 0})
+            entry['seconds'] += seconds
+            entry['items'] += items
+            self._accumulated.add(stage)
+
+    def record_api_call(self, endpoint, seconds, nbytes, status):
+        units = QUOTA_COSTS.get(endpoint, 1)
+        with self._lock:
+            entry = self.api.setdefault(endpoint, {'calls': 0, 'errors': 0, 'seconds': 0.0, 'bytes': 0, 'units': 0})
+            entry['calls'] += 1
+            entry['errors'] += 0 if status.startswith('2') else 1
+            entry['seconds'] += seconds
+            entry['bytes'] += nbytes
+            entry['units'] += units
+
+    def finish(self, status):
+        """Close the run, export accumulated stages and return to_dict()"""
+        self.total_seconds = time.perf_counter() - self._start
+        with self._lock:
+            accumulated = [(stage, dict(self.stages[stage])) for stage in self._accumulated]
+            self._accumulated.clear()
+        for stage, entry in accumulated:
+            self.registry.observe('orbitlink_analysis_stage_seconds', entry['seconds'], stage=stage)
+            self.registry.inc('orbitlink_analysis_stage_items_total', entry['items'], stage=stage)
+        self.registry.observe('orbitlink_analysis_seconds', self.total_seconds, type=self.analysis_type)
+        self.registry.inc('orbitlink_analysis_runs_total', type=self.analysis_type, status=status)
+        return self.to_dict()
+
+    def to_dict(self):
+        with self._lock:
+            stages = {name: dict(entry, seconds=round(entry['seconds'], 4)) for name, entry in self.stages.items()}
+            api = {name: dict(entry, seconds=round(entry['seconds'], 4)) for name, entry in self.api.items()}
+        return {
+            'analysis_type': self.analysis_type,
+            'started_at': self.started_at,
+            'total_seconds': round(self.total_seconds, 4) if self.total_seconds is not None else None,
+            'stages': stages,
+            'api': api,
+            'api_calls': sum(e['calls'] for e in api.values()),
+            'api_units': sum(e['units'] for e in api.values()),
+            'api_bytes': sum(e['bytes'] for e in api.values()),
+        }
+
+
+def record_api_response(endpoint, seconds, nbytes, status, trace=None):
+    """Export one API response and add it to the active trace, if any"""
+    REGISTRY.inc('orbitlink_youtube_api_requests_total', endpoint=endpoint, status=status)
+    REGISTRY.observe('orbitlink_youtube_api_seconds', seconds, endpoint=endpoint)
+    REGISTRY.inc('orbitlink_youtube_api_bytes_total', nbytes, endpoint=endpoint)
+    REGISTRY.inc('orbitlink_youtube_api_units_total', QUOTA_COSTS.get(endpoint, 1), endpoint=endpoint)
+    if trace is not None:
+        trace.record_api_call(endpoint, seconds, nbytes, status)
@@ -0,0 +1,181 @@
+# services/profiler.py
+import os
+import sys
+import threading
+import time
+import tracemalloc
+from collections import Counter
+
+PROFILE_SAMPLE_INTERVAL = float(os.getenv('PROFILE_SAMPLE_INTERVAL', '0.005'))
+PROFILE_TOP_ALLOCATIONS = int(os.getenv('PROFILE_TOP_ALLOCATIONS', '50'))
+
+# tracemalloc is process-wide: JobProfilers share it through a refcount, the
+# last one out stops it (only if a profiler started it)
+_TRACEMALLOC_LOCK = threading.Lock()
+_tracemalloc_users = 0
+_tracemalloc_started = False
+_peak_owner = None
+
+
+class SamplingProfiler:
+    """Samples the Python stacks of selected threads from a background thread.
+
+    Stacks are kept in the collapsed ("folded") format used by flamegraph.pl
+    and speedscope: one "root;caller;callee count" line per distinct stack.
+    """
+
+    def __init__(self, interval=PROFILE_SAMPLE_INTERVAL, thread_ids=(), thread_name_prefixes=()):
+        self.interval = interval
+        self.thread_ids = set(thread_ids)
+        self.thread_name_prefixes = tuple(thread_name_prefixes)
+        # ThreadPoolExecutor names workers <prefix>_<n>
+        self._worker_names = tuple(f"{prefix}_" for prefix in self.thread_name_prefixes)
+        self.stacks = Counter()
+        self.samples = 0
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self):
+        self._thread = threading.Thread(target=self._run, name='sampling-profiler', daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        if self._thread:
+            self._thread.join()
+
+    def _run(self):
+        own_id = threading.get_ident()
+        while not self._stop.wait(self.interval):
+            names = {t.ident: t.name for t in threading.enumerate()}
+            for ident, frame in sys._current_frames().items():
+                if ident == own_id:
+                    continue
+                name = names.get(ident, '')
+                if ident in self.thread_ids:
+                    root = 'job'
+                elif self.thread_name_prefixes and name.startswith(self._worker_names):
+                    root = name.rsplit('_', 1)[0]
+                else:
+                    continue
+                self.stacks[_collapse(root, frame)] += 1
+            self.samples += 1
+
+    def collapsed(self):
+        return "\n".join(f"{stack} {count}" for stack, count in self.stacks.most_common())
+
+
+def _collapse(root, frame):
+    stack = []
+    while frame is not None:
+        code = frame.f_code
+        module = frame.f_globals.get('__name__', os.path.basename(code.co_filename))
+        stack.append(f"{module}:{code.co_name}:{code.co_firstlineno}".replace(';', ':').replace(' ', '_'))
+        frame = frame.f_back
+    stack.append(root)
+    return ";".join(reversed(stack))
+
+
+class JobProfiler:
+    """Sampling CPU profile plus a tracemalloc snapshot for one analysis job.
+
+    Use as a context manager around the job on the thread that runs it;
+    worker threads named <prefix>_<n> for one of worker_prefixes are sampled
+    too, so give each job's pool its own prefix. tracemalloc is process-wide
+    and shared between overlapping profilers: only the profiler that found
+    no other one running owns the peak and takes the allocation snapshot
+    (the others report none). Profiling errors are logged, never raised;
+    result stays None then.
+    """
+
+    def __init__(self, interval=PROFILE_SAMPLE_INTERVAL, top_allocations=PROFILE_TOP_ALLOCATIONS,
+                 worker_prefixes=()):
+        self.interval = interval
+        self.top_allocations = top_allocations
+        self.worker_prefixes = worker_prefixes
+        self.result = None
+        self._sampler = None
+        self._tracing = False
+
+    def __enter__(self):
+        global _tracemalloc_users, _tracemalloc_started, _peak_owner
+        try:
+            with _TRACEMALLOC_LOCK:
+                if not tracemalloc.is_tracing():
+                    tracemalloc.start()
+                    _tracemalloc_started = True
+                if _tracemalloc_users == 0:
+                    _peak_owner = self
+                    tracemalloc.reset_peak()
+                _tracemalloc_users += 1
+                self._tracing = True
+        except Exception as e:
+            print(f"[PROFILE] Could not start tracemalloc: {e}")
+        self._start = time.perf_counter()
+        self._sampler = SamplingProfiler(self.interval, thread_ids=[threading.get_ident()],
+                                         thread_name_prefixes=self.worker_prefixes).start()
+        return self
+
+    def __exit__(self, *exc):
+        try:
+            self._sampler.stop()
+            duration = time.perf_counter() - self._start
+            snapshot, current, peak = self._memory()
+
+            allocations = []
+            if snapshot is not None:
+                for stat in snapshot.statistics('lineno')[:self.top_allocations]:
+                    frame = stat.traceback[0]
+                    allocations.append({
+                        'file': frame.filename,
+                        'line': frame.lineno,
+                        'size_kb': round(stat.size / 1024, 1),
+                        'count': stat.count,
+                    })
+
+            self.result = {
+                'duration_seconds': round(duration, 3),
+                'sample_interval': self.interval,
+                'samples': self._sampler.samples,
+                'collapsed_stacks': self._sampler.collapsed(),
+                'top_allocations': allocations,
+                'traced_memory_mb': round(current / 1024 / 1024, 2) if current is not None else None,
+                'peak_memory_mb': round(peak / 1024 / 1024, 2) if peak is not None else None,
+            }
+        except Exception as e:
+            print(f"[PROFILE] Profiling failed, the job is not affected: {e}")
+        finally:
+            self._release()
+        return False
+
+    def _memory(self):
+        """(snapshot, current, peak) while tracing; snapshot and peak only for the peak owner"""
+        with _TRACEMALLOC_LOCK:
+            if not (self._tracing and tracemalloc.is_tracing()):
+                return None, None, None
+            current, peak = tracemalloc.get_traced_memory()
+            if _peak_owner is not self:
+                return None, current, None
+            snapshot = tracemalloc.take_snapshot()
+        snapshot = snapshot.filter_traces([
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+        ])
+        return snapshot, current, peak
+
+    def _release(self):
+        global _tracemalloc_users, _tracemalloc_started, _peak_owner
+        if not self._tracing:
+            return
+        self._tracing = False
+        try:
+            with _TRACEMALLOC_LOCK:
+                _tracemalloc_users -= 1
+                if _peak_owner is self:
+                    _peak_owner = None
+                if _tracemalloc_users == 0 and _tracemalloc_started:
+                    tracemalloc.stop()
+                    _tracemalloc_started = False
+        except Exception as e:
+            print(f"[PROFILE] Could not stop tracemalloc: {e}")
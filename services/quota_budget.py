@@ -0,0 +1,47 @@
+# services/quota_budget.py
+import os
+import threading
+
+# YouTube Data API v3 cost in quota units per request
+# https://developers.google.com/youtube/v3/determine_quota_cost
+QUOTA_COSTS = {
+    'search.list': 100,
+    'channels.list': 1,
+    'videos.list': 1,
+    'playlistItems.list': 1,
+    'commentThreads.list': 1,
+    'comments.list': 1,
+}
+
+DEFAULT_QUOTA_BUDGET = int(os.getenv('YOUTUBE_QUOTA_BUDGET', '10000'))
+
+
+class QuotaBudget:
+    """Thread-safe quota-unit budget shared by all requests of one analysis job"""
+
+    def __init__(self, limit=DEFAULT_QUOTA_BUDGET):
+        self.limit = limit
+        self.used = 0
+        self._lock = threading.Lock()
+
+    @property
+    def remaining(self):
+        if self.limit is None:
+            return float('inf')
+        return max(0, self.limit - self.used)
+
+    def charge(self, endpoint, requests=1):
+        """Record units for requests that must run regardless of the budget"""
+        units = QUOTA_COSTS.get(endpoint, 1) * requests
+        with self._lock:
+            self.used += units
+        return units
+
+    def try_spend(self, endpoint, requests=1):
+        """Reserve units for an optional request; False if it would exceed the budget"""
+        units = QUOTA_COSTS.get(endpoint, 1) * requests
+        with self._lock:
+            if self.limit is not None and self.used + units > self.limit:
+                return False
+            self.used += units
+            return True
@@ -32,6 +32,10 @@ _MODEL_CACHE = {
     "model_dir": None,
 }
 
+SENTIMENT_MODEL_ID = "nlptown/bert-base-multilingual-uncased-sentiment"
+# Texts per prediction call between on_progress updates
+PROGRESS_CHUNK_SIZE = 256
+
 # 設定模型保存到專案資料夾
 PROJECT_ROOT = Path(__file__).parent.parent
 MODEL_DIR = PROJECT_ROOT / "models" / "sentiment_bert"
@@ -47,7 +51,7 @@ def ensure_model_download() -> Optional[str]:
         MODEL_DIR.mkdir(parents=True, exist_ok=True)
         
         path = snapshot_download(
-            repo_id="nlptown/bert-base-multilingual-uncased-sentiment",
+            repo_id=SENTIMENT_MODEL_ID,
             cache_dir=str(MODEL_DIR),
             resume_download=True,
         )
@@ -68,7 +72,7 @@ def _get_pipeline():
     device = 0 if torch.cuda.is_available() else -1
     # Try explicit download first to avoid lazy fetch at first inference
     local_dir = ensure_model_download()
-    model_id_or_path = local_dir or "nlptown/bert-base-multilingual-uncased-sentiment"
+    model_id_or_path = local_dir or SENTIMENT_MODEL_ID
     try:
         # Load tokenizer explicitly with fix_mistral_regex flag to suppress warning
         tokenizer = AutoTokenizer.from_pretrained(
@@ -214,8 +218,12 @@ def _build_pie(label_counts):
         return None
 
 
-def run_sentiment_analysis(comments):
-    """Return overall score, word cloud, and top liked comments."""
+def run_sentiment_analysis(comments, on_progress=None):
+    """Return overall score, word cloud, and top liked comments.
+
+    Predictions run in chunks of PROGRESS_CHUNK_SIZE texts; after each chunk
+    on_progress(processed, total, running_score, label_counts) is called if given.
+    """
     print(f"[SENTIMENT] Starting sentiment analysis on {len(comments)} comments")
     
     if not comments:
@@ -231,10 +239,12 @@ def run_sentiment_analysis(comments):
     pipe = _get_pipeline()
 
     texts = []
+    kept = []
     for c in comments:
         text = (c.get("text") or "").strip()
         if text:
             texts.append(text)
+            kept.append(c)
     
     print(f"[SENTIMENT] Extracted {len(texts)} non-empty texts from {len(comments)} comments")
     
@@ -248,32 +258,36 @@ def run_sentiment_analysis(comments):
             "top_like_comments": [],
         }
 
-    try:
-        print(f"[SENTIMENT] Running predictions on {len(texts)} texts")
-        predictions = pipe(texts, batch_size=16, truncation=True)
-        print(f"[SENTIMENT] Predictions complete")
-    except Exception as e:
-        print(f"[SENTIMENT] Prediction error: {e}")
-        raise
-
     label_counts = {"positive": 0, "neutral": 0, "negative": 0}
     scores = []
     enriched = []
 
-    for comment, pred in zip(comments, predictions):
-        label = pred.get("label", "neutral")
-        bucket = _label_to_bucket(label)
-        score = _label_to_score(label)
-        label_counts[bucket] += 1
-        scores.append(score)
-        enriched.append({
-            "text": comment.get("text", ""),
-            "author_name": comment.get("author_name", "Unknown"),
-            "like_count": comment.get("like_count", 0),
-            "published_at": comment.get("published_at"),
-            "label": bucket,
-            "score": score,
-        })
+    print(f"[SENTIMENT] Running predictions on {len(texts)} texts")
+    for start in range(0, len(texts), PROGRESS_CHUNK_SIZE):
+        try:
+            predictions = pipe(texts[start:start + PROGRESS_CHUNK_SIZE], batch_size=16, truncation=True)
+        except Exception as e:
+            print(f"[SENTIMENT] Prediction error: {e}")
+            raise
+
+        for comment, pred in zip(kept[start:start + PROGRESS_CHUNK_SIZE], predictions):
+            label = pred.get("label", "neutral")
+            bucket = _label_to_bucket(label)
+            score = _label_to_score(label)
+            label_counts[bucket] += 1
+            scores.append(score)
+            enriched.append({
+                "text": comment.get("text", ""),
+                "author_name": comment.get("author_name", "Unknown"),
+                "like_count": comment.get("like_count", 0),
+                "published_at": comment.get("published_at"),
+                "label": bucket,
+                "score": score,
+            })
+
+        if on_progress:
+            on_progress(len(scores), len(texts), round(sum(scores) / len(scores), 2), dict(label_counts))
+    print(f"[SENTIMENT] Predictions complete")
 
     overall_score = round(sum(scores) / len(scores), 2) if scores else 0.0
     print(f"[SENTIMENT] Overall score: {overall_score}, Label counts: {label_counts}")
@@ -0,0 +1,59 @@
+# services/single_flight.py
+import threading
+
+
+class _Call:
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+        self.waiters = 0
+
+
+class SingleFlight:
+    """Coalesces concurrent calls with the same key into one execution.
+
+    The first caller for a key runs the function; callers arriving while it
+    is in flight block and receive the same outcome (result or exception).
+    Nothing is cached: once the call finishes, the next caller starts anew.
+
+    copy_result, if given, is applied to the result for every caller so each
+    one can mutate its own copy (e.g. copy.deepcopy).
+    """
+
+    def __init__(self, copy_result=None):
+        self.copy_result = copy_result
+        self._lock = threading.Lock()
+        self._calls = {}
+
+    def do(self, key, fn):
+        """Run fn() once per in-flight key. Returns (result, shared)"""
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+            else:
+                call.waiters += 1
+
+        if leader:
+            try:
+                call.result = fn()
+            except BaseException as e:
+                call.error = e
+            finally:
+                with self._lock:
+                    del self._calls[key]
+                call.done.set()
+        else:
+            call.done.wait()
+
+        if call.error is not None:
+            raise call.error
+        result = self.copy_result(call.result) if self.copy_result else call.result
+        return result, not leader
+
+    def in_flight(self):
+        """Keys currently running, with the number of callers waiting on each"""
+        with self._lock:
+            return {key: call.waiters for key, call in self._calls.items()}
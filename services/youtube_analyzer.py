@@ -5,9 +5,13 @@ import pandas as pd
 import numpy as np
 from googleapiclient.discovery import build
 from googleapiclient.errors import HttpError
+from googleapiclient.http import build_http
 from datetime import datetime, timedelta
 from collections import Counter, defaultdict
+from concurrent.futures import ThreadPoolExecutor
 import os
+import threading
+import time
 from textblob import TextBlob
 import networkx as nx
 import community as community_louvain
@@ -26,12 +30,12 @@ warnings.filterwarnings('ignore')
 
 # Import sentiment analysis service with safe fallback
 try:
-    from services.sentiment_analysis import run_sentiment_analysis
+    from services.sentiment_analysis import run_sentiment_analysis, SENTIMENT_MODEL_ID
     SENTIMENT_ANALYSIS_AVAILABLE = True
 except Exception as e:
     print(f"[WARNING] Sentiment analysis import failed, using fallback: {e}")
 
-    def run_sentiment_analysis(comments):
+    def run_sentiment_analysis(comments, on_progress=None):
         # Fallback returns empty charts and zeroed scores to keep UI alive
         return {
             "overall_score": 0,
@@ -56,41 +60,149 @@ except Exception as e:
         }
 
     SENTIMENT_ANALYSIS_AVAILABLE = False
+    SENTIMENT_MODEL_ID = 'fallback'
+
+from services.quota_budget import QuotaBudget
+from services.incremental_communities import incremental_partition
+from services.community_ensemble import ENSEMBLE_METHOD, ENSEMBLE_RUNS, ensemble_partition
+from services.community_hierarchy import HIERARCHY_RESPLIT, build_hierarchy
+from services.community_keywords import keyword_index
+from services.community_bridges import community_bridges
+from services.graph_centrality import CENTRALITY_NETWORK_SCORE, reply_graph_centrality
+from services.metrics import AnalysisTrace, InstrumentedHttp, record_api_response
+
+# Partial-response field masks. Each mask lists only what the parsing code
+# below actually reads, so the API skips thumbnails, localizations, etags etc.
+COMMENT_FIELDS = (
+    "id,snippet(textDisplay,authorDisplayName,authorChannelId/value,"
+    "likeCount,publishedAt,updatedAt,parentId)"
+)
+COMMENT_THREAD_FIELDS = (
+    f"items(snippet(totalReplyCount,topLevelComment({COMMENT_FIELDS})),"
+    f"replies/comments({COMMENT_FIELDS})),nextPageToken"
+)
+REPLY_LIST_FIELDS = f"items({COMMENT_FIELDS}),nextPageToken"
+CHANNEL_ID_FIELDS = "items(id)"
+CHANNEL_SEARCH_FIELDS = "items(snippet/channelId)"
+CHANNEL_METADATA_FIELDS = (
+    "items(snippet(title,description,publishedAt,thumbnails/high/url),"
+    "statistics(subscriberCount,videoCount,viewCount),"
+    "brandingSettings/channel(country,keywords),"
+    "topicDetails/topicCategories)"
+)
+VIDEO_SEARCH_FIELDS = "items(id/videoId),nextPageToken"
+VIDEO_DETAILS_FIELDS = (
+    "items(snippet(title,publishedAt,description),"
+    "statistics(viewCount,likeCount,commentCount),"
+    "contentDetails/duration)"
+)
+VIDEO_METADATA_FIELDS = (
+    "items(snippet(title,publishedAt,description,channelId,channelTitle),"
+    "statistics(viewCount,likeCount,commentCount))"
+)
+
+# Bump when scoring, community or rendering logic changes so cached
+# analyses (services/analysis_cache.py) are rebuilt instead of served
+ANALYZER_VERSION = 1
+MODEL_VERSION = f"analyzer-{ANALYZER_VERSION}/sentiment-{SENTIMENT_MODEL_ID}"
+
+# Crawl limits per analysis type
+CHANNEL_MAX_VIDEOS = 30
+CHANNEL_MAX_COMMENTS_PER_VIDEO = 2000
+VIDEO_MAX_COMMENTS = 5000
+
+CHANNEL_URL_PATTERNS = [
+    (r"youtube\.com/channel/(UC[\w-]+)", "channel"),
+    (r"youtube\.com/user/([\w-]+)", "user"),
+    (r"youtube\.com/@([\w\.\-]+)", "handle")
+]
+
+# Name prefix of the reply-expansion worker threads (picked up by services/profiler.py)
+REPLY_WORKER_PREFIX = 'reply-expand'
+
+# 4xx HttpError reasons a retried job can get past. Other client errors
+# (commentsDisabled, videoNotFound, commentNotFound...) fail the same way on
+# every retry, so they only cost the video or thread its comments
+RETRYABLE_REASONS = {'quotaExceeded', 'dailyLimitExceeded', 'rateLimitExceeded', 'userRateLimitExceeded'}
+
+
+def is_retryable_error(error):
+    """Whether a crawl error is transient: network errors, 5xx, 429 and quota/rate limits"""
+    if not isinstance(error, HttpError):
+        return True
+    if error.resp.status >= 500 or error.resp.status == 429:
+        return True
+    return any(detail.get('reason') in RETRYABLE_REASONS
+               for detail in (error.error_details or []) if isinstance(detail, dict))
+
+EMOJI_PATTERN = re.compile("["
+    u"\U0001F600-\U0001F64F"  # emoticons
+    u"\U0001F300-\U0001F5FF"  # symbols & pictographs
+    u"\U0001F680-\U0001F6FF"  # transport & map symbols
+    u"\U0001F1E0-\U0001F1FF"  # flags (iOS)
+    "]+", flags=re.UNICODE)
 
 class YouTubeAnalyzer:
-    def __init__(self, api_key):
-        """Initialize YouTube API with provided API key"""
-        self.youtube = build('youtube', 'v3', developerKey=api_key)
+    def __init__(self, api_key, quota_budget=None, reply_workers=8, api_endpoint=None):
+        """Initialize YouTube API with provided API key
+        
+        api_endpoint (or YOUTUBE_API_ENDPOINT) points the client at another
+        server, e.g. the local fake in benchmarks/fake_youtube_api.py.
+        """
+        self.api_key = api_key
+        api_endpoint = api_endpoint or os.getenv('YOUTUBE_API_ENDPOINT')
+        client_options = {'api_endpoint': api_endpoint} if api_endpoint else None
+        self.youtube = build('youtube', 'v3', developerKey=api_key, client_options=client_options,
+                             http=InstrumentedHttp(build_http(), self._on_api_response))
+        self.quota = quota_budget or QuotaBudget()
+        self.reply_workers = reply_workers
+        # Thread name prefix of this analyzer's reply workers; set per job to profile them apart
+        self.worker_prefix = REPLY_WORKER_PREFIX
+        self._local = threading.local()
+        # AnalysisTrace of the running (or last) analysis
+        self.trace = None
+        # Previous {'partition', 'modularity'} to warm-start community detection
+        # from (see services/incremental_communities.py); None runs full Louvain
+        self.community_seed = None
+    
+    def _thread_http(self):
+        """Per-thread HTTP transport (httplib2 connections are not thread-safe)"""
+        http = getattr(self._local, 'http', None)
+        if http is None:
+            http = InstrumentedHttp(build_http(), self._on_api_response)
+            self._local.http = http
+        return http
+    
+    def _on_api_response(self, endpoint, seconds, nbytes, status):
+        record_api_response(endpoint, seconds, nbytes, status, trace=self.trace)
     
     def resolve_channel_id(self, channel_url):
         """Resolve any YouTube URL to channel ID"""
-        patterns = [
-            (r"youtube\.com/channel/(UC[\w-]+)", "channel"),
-            (r"youtube\.com/user/([\w-]+)", "user"),
-            (r"youtube\.com/@([\w\.\-]+)", "handle")
-        ]
-        
-        for pattern, kind in patterns:
+        for pattern, kind in CHANNEL_URL_PATTERNS:
             match = re.search(pattern, channel_url)
             if match:
                 if kind == "channel":
                     return match.group(1)
                 elif kind == "user":
                     try:
+                        self.quota.charge('channels.list')
                         response = self.youtube.channels().list(
                             part="id", 
-                            forUsername=match.group(1)
+                            forUsername=match.group(1),
+                            fields=CHANNEL_ID_FIELDS
                         ).execute()
                         return response['items'][0]['id'] if response.get('items') else None
                     except:
                         continue
                 elif kind == "handle":
                     try:
+                        self.quota.charge('search.list')
                         response = self.youtube.search().list(
                             part="snippet",
                             q=match.group(1),
                             type="channel",
-                            maxResults=1
+                            maxResults=1,
+                            fields=CHANNEL_SEARCH_FIELDS
                         ).execute()
                         return response['items'][0]['snippet']['channelId'] if response.get('items') else None
                     except:
@@ -135,12 +247,42 @@ class YouTubeAnalyzer:
 
         return False
     
+    def canonical_target(self, input_url):
+        """Stable key for the channel/video an input refers to (no API calls)
+        
+        'video:<id>', 'channel:<UC id>', 'user:<name>' or 'handle:<name>';
+        usernames and handles are case-insensitive so they are lower-cased.
+        """
+        if self.looks_like_video_input(input_url):
+            return f"video:{self.extract_video_id(input_url)}"
+        
+        for pattern, kind in CHANNEL_URL_PATTERNS:
+            match = re.search(pattern, input_url)
+            if match:
+                value = match.group(1) if kind == "channel" else match.group(1).lower()
+                return f"{kind}:{value}"
+        
+        return f"url:{input_url.strip()}"
+    
+    def analysis_params(self):
+        """Settings that change what an analysis returns (part of coalescing keys)"""
+        return {
+            'channel_max_videos': CHANNEL_MAX_VIDEOS,
+            'channel_max_comments_per_video': CHANNEL_MAX_COMMENTS_PER_VIDEO,
+            'video_max_comments': VIDEO_MAX_COMMENTS,
+            'quota_limit': self.quota.limit,
+            'community_ensemble': f"{ENSEMBLE_RUNS}:{ENSEMBLE_METHOD}",
+            'centrality_network_score': CENTRALITY_NETWORK_SCORE,
+        }
+    
     def get_channel_metadata(self, channel_id):
         """Get comprehensive channel information"""
         try:
+            self.quota.charge('channels.list')
             response = self.youtube.channels().list(
                 part="snippet,statistics,brandingSettings,topicDetails",
-                id=channel_id
+                id=channel_id,
+                fields=CHANNEL_METADATA_FIELDS
             ).execute()
             
             if not response.get('items'):
@@ -183,6 +325,7 @@ class YouTubeAnalyzer:
         
         try:
             while len(videos) < max_videos:
+                self.quota.charge('search.list')
                 request = self.youtube.search().list(
                     part="id,snippet",
                     channelId=channel_id,
@@ -190,7 +333,8 @@ class YouTubeAnalyzer:
                     order="date",
                     publishedAfter=published_after,
                     maxResults=min(50, max_videos - len(videos)),
-                    pageToken=next_page_token
+                    pageToken=next_page_token,
+                    fields=VIDEO_SEARCH_FIELDS
                 )
                 response = request.execute()
                 
@@ -198,9 +342,11 @@ class YouTubeAnalyzer:
                     video_id = item['id']['videoId']
                     
                     # Get detailed video statistics
+                    self.quota.charge('videos.list')
                     video_response = self.youtube.videos().list(
                         part="statistics,snippet,contentDetails",
-                        id=video_id
+                        id=video_id,
+                        fields=VIDEO_DETAILS_FIELDS
                     ).execute()
                     
                     if video_response.get('items'):
@@ -241,9 +387,11 @@ class YouTubeAnalyzer:
     def get_video_metadata(self, video_id):
         """Get metadata for a single video"""
         try:
+            self.quota.charge('videos.list')
             response = self.youtube.videos().list(
                 part="snippet,statistics",
-                id=video_id
+                id=video_id,
+                fields=VIDEO_METADATA_FIELDS
             ).execute()
             
             if not response.get('items'):
@@ -279,25 +427,53 @@ class YouTubeAnalyzer:
             print(f"Error fetching video metadata: {e}")
             return None
     
-    def analyze_comments(self, video_id, channel_owner_id, max_comments=2000):
-        """Collect and analyze comments"""
+    def analyze_comments(self, video_id, channel_owner_id, max_comments=2000, checkpoint=None, page_callback=None):
+        """Collect and analyze comments
+        
+        With a checkpoint every page is persisted, a partial earlier run of
+        this video is resumed, and transient errors (is_retryable_error)
+        propagate so the job can be retried. Permanent errors, e.g. comments
+        disabled, end the video with the comments collected so far.
+        page_callback(collected) is called after every commentThreads page.
+        """
         all_comments = []
         reply_edges = []
+        # Threads whose totalReplyCount exceeds the replies embedded in commentThreads
+        truncated_threads = []
+        next_page_token = None
+        threads_done = False
         
+        saved = checkpoint.load_video(video_id) if checkpoint else None
+        if saved:
+            all_comments = saved['comments']
+            reply_edges = saved['edges']
+            if saved['completed']:
+                return all_comments, reply_edges
+            truncated_threads = [(all_comments[i], missing) for i, missing in saved['truncated_threads']]
+            next_page_token = saved['page_token']
+            threads_done = saved['threads_done']
+            print(f"[CHECKPOINT] Resuming video {video_id} from {len(all_comments)} saved comments")
+        
+        replies, edges = [], []
         try:
             # Get all comment threads
-            next_page_token = None
-            comment_count = 0
+            comment_count = len(all_comments)
             
-            while True:
+            while not threads_done:
+                self.quota.charge('commentThreads.list')
                 response = self.youtube.commentThreads().list(
                     part="snippet,replies",
                     videoId=video_id,
                     maxResults=100,
                     pageToken=next_page_token,
-                    order="relevance"
+                    order="relevance",
+                    fields=COMMENT_THREAD_FIELDS
                 ).execute()
                 
+                page_start = len(all_comments)
+                edges_start = len(reply_edges)
+                truncated_start = len(truncated_threads)
+                
                 for thread in response.get('items', []):
                     # Top-level comment
                     top_comment = thread['snippet']['topLevelComment']
@@ -312,34 +488,158 @@ class YouTubeAnalyzer:
                     comment_count += 1
                     
                     # Get replies
-                    if 'replies' in thread:
-                        for reply in thread['replies']['comments']:
-                            reply_data = self._extract_comment_metrics(reply, channel_owner_id, is_reply=True)
-                            all_comments.append(reply_data)
-                            comment_count += 1
-                            
-                            # Add reply edge (replier -> original author)
-                            reply_edges.append({
-                                'from': reply_data['author_id'],
-                                'to': top_data['author_id'],
-                                'video_id': video_id,
-                                'timestamp': reply_data['published_at']
-                            })
-                            
-                            if comment_count >= max_comments:
-                                break
+                    embedded_replies = thread.get('replies', {}).get('comments', [])
+                    if thread_total_reply_count > len(embedded_replies):
+                        truncated_threads.append((top_data, thread_total_reply_count - len(embedded_replies)))
+                    
+                    for reply in embedded_replies:
+                        reply_data = self._extract_comment_metrics(reply, channel_owner_id, is_reply=True)
+                        all_comments.append(reply_data)
+                        comment_count += 1
+                        
+                        # Add reply edge (replier -> original author)
+                        reply_edges.append({
+                            'from': reply_data['author_id'],
+                            'to': top_data['author_id'],
+                            'video_id': video_id,
+                            'timestamp': reply_data['published_at']
+                        })
+                        
+                        if comment_count >= max_comments:
+                            break
                 
                 next_page_token = response.get('nextPageToken')
-                if not next_page_token or comment_count >= max_comments:
-                    break
+                threads_done = not next_page_token or comment_count >= max_comments
+                
+                if checkpoint:
+                    index_of = {c['comment_id']: i for i, c in enumerate(all_comments[page_start:], page_start)}
+                    checkpoint.save_page(
+                        video_id,
+                        all_comments[page_start:],
+                        reply_edges[edges_start:],
+                        [[index_of[top['comment_id']], missing] for top, missing in truncated_threads[truncated_start:]],
+                        None if threads_done else next_page_token
+                    )
+                
+                if page_callback:
+                    page_callback(len(all_comments))
+            
+            # Fetch the replies commentThreads left out
+            if truncated_threads and comment_count < max_comments:
+                replies, edges = self.expand_reply_threads(
+                    truncated_threads, video_id, channel_owner_id,
+                    max_replies=max_comments - comment_count,
+                    seen_ids={c['comment_id'] for c in all_comments},
+                    strict=checkpoint is not None
+                )
+                all_comments.extend(replies)
+                reply_edges.extend(edges)
+            
+            if checkpoint:
+                checkpoint.complete_video(video_id, replies, edges)
                     
         except Exception as e:
             print(f"Error analyzing comments for video {video_id}: {e}")
+            if checkpoint:
+                if is_retryable_error(e):
+                    raise
+                checkpoint.complete_video(video_id, replies, edges)
         
         return all_comments, reply_edges
     
+    def fetch_thread_replies(self, parent_id, channel_owner_id, max_replies=None):
+        """Page through comments().list for one thread (runs on worker threads)"""
+        replies = []
+        next_page_token = None
+        http = self._thread_http()
+        
+        while max_replies is None or len(replies) < max_replies:
+            if not self.quota.try_spend('comments.list'):
+                break
+            
+            response = self.youtube.comments().list(
+                part="snippet",
+                parentId=parent_id,
+                maxResults=100,
+                pageToken=next_page_token,
+                fields=REPLY_LIST_FIELDS
+            ).execute(http=http)
+            
+            for reply in response.get('items', []):
+                replies.append(self._extract_comment_metrics(reply, channel_owner_id, is_reply=True))
+            
+            next_page_token = response.get('nextPageToken')
+            if not next_page_token:
+                break
+        
+        return replies[:max_replies] if max_replies is not None else replies
+    
+    def expand_reply_threads(self, threads, video_id, channel_owner_id, max_replies, seen_ids=None, strict=False):
+        """Fetch full reply lists for truncated threads concurrently.
+        
+        threads is a list of (top_comment_data, missing_reply_count); the
+        busiest threads are expanded first so the quota goes where most
+        edges are missing, and each is paged only as far as its share of
+        max_replies (plus the replies commentThreads already embedded, which
+        comments().list returns again). A failed thread is skipped, unless strict and the
+        error is transient (is_retryable_error), in which case it is raised.
+        """
+        seen_ids = set(seen_ids or ())
+        threads = sorted(threads, key=lambda t: t[1], reverse=True)
+        
+        # Only expand as many threads as can fill the remaining comment allowance
+        selected = []
+        remaining = max_replies
+        for top_data, missing in threads:
+            if remaining <= 0:
+                break
+            share = min(missing, remaining)
+            embedded = max(top_data.get('total_reply_count', missing) - missing, 0)
+            selected.append((top_data, share + embedded))
+            remaining -= share
+        threads = selected
+        
+        with ThreadPoolExecutor(max_workers=self.reply_workers, thread_name_prefix=self.worker_prefix) as executor:
+            futures = [
+                executor.submit(self.fetch_thread_replies, top_data['comment_id'], channel_owner_id, limit)
+                for top_data, limit in threads
+            ]
+            fetched = []
+            for (top_data, _), future in zip(threads, futures):
+                try:
+                    fetched.append(future.result())
+                except Exception as e:
+                    if strict and is_retryable_error(e):
+                        raise
+                    print(f"Error fetching replies for thread {top_data['comment_id']}: {e}")
+                    fetched.append([])
+        
+        replies = []
+        reply_edges = []
+        for (top_data, _), thread_replies in zip(threads, fetched):
+            for reply_data in thread_replies:
+                if len(replies) >= max_replies:
+                    break
+                if reply_data['comment_id'] in seen_ids:
+                    continue
+                seen_ids.add(reply_data['comment_id'])
+                replies.append(reply_data)
+                
+                # Add reply edge (replier -> original author)
+                reply_edges.append({
+                    'from': reply_data['author_id'],
+                    'to': top_data['author_id'],
+                    'video_id': video_id,
+                    'timestamp': reply_data['published_at']
+                })
+        
+        print(f"Expanded {len(threads)} reply threads: +{len(replies)} replies "
+              f"(quota used {self.quota.used}/{self.quota.limit})")
+        return replies, reply_edges
+    
     def _extract_comment_metrics(self, comment, channel_owner_id, is_reply=False):
         """Extract comprehensive metrics from a single comment"""
+        start = time.perf_counter()
         snippet = comment['snippet']
         text = snippet.get('textDisplay', '')
         
@@ -367,6 +667,9 @@ class YouTubeAnalyzer:
         metrics['hour_of_day'] = published_time.hour
         metrics['day_of_week'] = published_time.strftime('%A')
         
+        if self.trace:
+            self.trace.add('feature_extraction', time.perf_counter() - start)
+        
         return metrics
     
     def _analyze_comment_text(self, text):
@@ -392,18 +695,18 @@ class YouTubeAnalyzer:
             analysis['sentiment_subjectivity'] = 0
         
         # Emoji detection
-        emoji_pattern = re.compile("["
-            u"\U0001F600-\U0001F64F"  # emoticons
-            u"\U0001F300-\U0001F5FF"  # symbols & pictographs
-            u"\U0001F680-\U0001F6FF"  # transport & map symbols
-            u"\U0001F1E0-\U0001F1FF"  # flags (iOS)
-            "]+", flags=re.UNICODE)
-        analysis['has_emojis'] = int(bool(emoji_pattern.search(text)))
+        analysis['has_emojis'] = int(bool(EMOJI_PATTERN.search(text)))
         
         return analysis
     
     def calculate_influencer_scores(self, all_comments, reply_edges, videos_data, min_comments=3):
-        """Calculate comprehensive influencer scores normalized to 0-10 scale"""
+        """Calculate comprehensive influencer scores normalized to 0-10 scale
+        
+        Every influencer also gets the reply graph's PageRank, HITS hub and
+        authority scores and k-core number (services/graph_centrality.py).
+        With CENTRALITY_NETWORK_SCORE set, network_score averages the
+        reply-count score with the centrality_score built from them.
+        """
         user_metrics = defaultdict(lambda: {
             'total_comments': 0,
             'total_likes': 0,
@@ -418,6 +721,8 @@ class YouTubeAnalyzer:
             'author_name': ''
         })
         
+        comment_authors = {comment['comment_id']: comment['author_id'] for comment in all_comments}
+        
         # Process all comments
         for comment in all_comments:
             author_id = comment['author_id']
@@ -436,8 +741,7 @@ class YouTubeAnalyzer:
             
             # Channel owner interaction
             if comment['is_channel_owner'] and comment['is_reply']:
-                parent_author = next((c['author_id'] for c in all_comments 
-                                    if c['comment_id'] == comment['parent_id']), None)
+                parent_author = comment_authors.get(comment['parent_id'])
                 if parent_author:
                     user_metrics[parent_author]['channel_owner_replies_to'] += 1
             
@@ -450,6 +754,10 @@ class YouTubeAnalyzer:
             user_metrics[edge['to']]['indegree'] += 1
             user_metrics[edge['from']]['outdegree'] += 1
         
+        centrality, _ = reply_graph_centrality(reply_edges)
+        no_centrality = {'pagerank': 0.0, 'hub_score': 0.0, 'authority_score': 0.0,
+                         'core_number': 0, 'centrality_score': 0.0}
+        
         # Calculate final scores
         influencers = []
         for author_id, metrics in user_metrics.items():
@@ -469,6 +777,9 @@ class YouTubeAnalyzer:
                 'activity_score': min(10, (metrics['total_comments'] + metrics['thread_starts']) / 5),
                 'responsiveness_score': min(10, metrics['outdegree'] / 3)
             }
+            graph = centrality.get(author_id, no_centrality)
+            if CENTRALITY_NETWORK_SCORE:
+                scores['network_score'] = (scores['network_score'] + graph['centrality_score']) / 2
             
             # Weighted total score (0-10 scale)
             weights = {
@@ -495,30 +806,140 @@ class YouTubeAnalyzer:
                 'outdegree': metrics['outdegree'],
                 'avg_sentiment': round(metrics['avg_sentiment'], 3),
                 'channel_owner_replies': metrics['channel_owner_replies_to'],
-                'thread_starts': metrics['thread_starts']
+                'thread_starts': metrics['thread_starts'],
+                'pagerank': round(graph['pagerank'], 6),
+                'hub_score': round(graph['hub_score'], 6),
+                'authority_score': round(graph['authority_score'], 6),
+                'core_number': graph['core_number'],
+                'centrality_score': round(graph['centrality_score'], 2)
             })
         
         return sorted(influencers, key=lambda x: x['total_score'], reverse=True)
     
-    def detect_communities(self, all_comments, reply_edges):
-        """Detect communities using Louvain method"""
+    def _build_interaction_graph(self, all_comments, reply_edges, user_to_community=None):
+        """Build the weighted reply graph between commenters
+        
+        Nodes carry the author's first seen display name (and community when
+        user_to_community is given, in which case unassigned users are left out).
+        """
+        G = nx.Graph()
+        
+        # Add nodes (all commenters)
+        user_names = {}
+        for comment in all_comments:
+            user_names.setdefault(comment['author_id'], comment['author_name'])
+        for user_id, user_name in user_names.items():
+            if user_to_community is None:
+                G.add_node(user_id, name=user_name)
+            elif user_id in user_to_community:
+                G.add_node(user_id, name=user_name, community=user_to_community[user_id])
+        
+        # Add edges (reply interactions)
+        for edge in reply_edges:
+            if G.has_node(edge['from']) and G.has_node(edge['to']):
+                if G.has_edge(edge['from'], edge['to']):
+                    G[edge['from']][edge['to']]['weight'] += 1
+                else:
+                    G.add_edge(edge['from'], edge['to'], weight=1)
+        
+        return G
+    
+    def _community_statistics(self, all_comments, reply_edges, user_to_community, influence_scores=None):
+        """Per-community and per-member aggregates in one grouped pass
+        
+        Returns ({community_id: {size, total_comments, total_likes,
+        avg_sentiment, top_members}}, largest community first, and
+        {author_id: member}), members in first-seen order with comment, like
+        and reply counts. top_members are the five most active members.
+        """
+        comments = pd.DataFrame(
+            [(c['author_id'], c['author_name'], c['like_count'], c['sentiment_polarity']) for c in all_comments],
+            columns=['author_id', 'author_name', 'like_count', 'sentiment_polarity']
+        )
+        comments = comments[comments['author_id'].isin(user_to_community.keys())]
+        comments = comments.assign(community_id=comments['author_id'].map(user_to_community))
+        
+        by_author = comments.groupby('author_id', sort=False).agg(
+            author_display_name=('author_name', 'first'),
+            community_id=('community_id', 'first'),
+            comment_count=('like_count', 'size'),
+            likes_received=('like_count', 'sum')
+        )
+        by_community = comments.groupby('community_id').agg(
+            size=('author_id', 'nunique'),
+            total_comments=('like_count', 'size'),
+            total_likes=('like_count', 'sum'),
+            avg_sentiment=('sentiment_polarity', 'mean')
+        )
+        most_active = (by_author.sort_values('comment_count', ascending=False, kind='stable')
+                       .groupby('community_id', sort=False).head(5))
+        top_members = most_active.groupby('community_id')['author_display_name'].agg(list)
+        
+        by_community = by_community.sort_values('size', ascending=False, kind='stable')
+        community_stats = {
+            comm_id: {
+                'size': size,
+                'total_comments': total_comments,
+                'total_likes': total_likes,
+                'avg_sentiment': round(avg_sentiment, 3),
+                'top_members': top_members[comm_id]
+            }
+            for comm_id, size, total_comments, total_likes, avg_sentiment in zip(
+                by_community.index.tolist(), by_community['size'].tolist(), by_community['total_comments'].tolist(),
+                by_community['total_likes'].tolist(), by_community['avg_sentiment'].tolist()
+            )
+        }
+        
+        influence_scores = influence_scores or {}
+        members = {
+            author_id: {
+                'author_channel_id': author_id,
+                'author_display_name': name,
+                'community_id': user_to_community[author_id],
+                'comment_count': count,
+                'likes_received': likes,
+                'replies_given': 0,
+                'replies_received': 0,
+                'influence_score': influence_scores.get(author_id, 0)
+            }
+            for author_id, name, count, likes in zip(by_author.index, by_author['author_display_name'],
+                                                     by_author['comment_count'].tolist(),
+                                                     by_author['likes_received'].tolist())
+        }
+        for edge in reply_edges:
+            if edge['from'] in members and edge['to'] in members:
+                members[edge['from']]['replies_given'] += 1
+                members[edge['to']]['replies_received'] += 1
+        
+        return community_stats, members
+    
+    def detect_communities(self, all_comments, reply_edges, influence_scores=None):
+        """Detect communities using Louvain method
+        
+        Besides the per-community summary, 'members' lists every assigned
+        commenter with comment/like/reply counts (persisted per project by
+        the controller, not shipped to the browser).
+        
+        With community_seed set, the partition is updated incrementally from
+        the seed and keeps its community ids. Otherwise COMMUNITY_ENSEMBLE_RUNS
+        > 1 combines several seeded Louvain runs (services/community_ensemble.py).
+        'detection' describes the run, including the ensemble's stability.
+        
+        'hierarchy' holds every community's sub-communities from the Louvain
+        dendrogram (services/community_hierarchy.py) with per-level aggregates
+        and top influencers by influence_scores ({author_id: total_score}).
+        Incremental runs keep the seed's sub-communities ('paths') where a
+        community's members are unchanged; ensemble runs leave communities
+        unsplit unless COMMUNITY_HIERARCHY_RESPLIT=1.
+        Communities and hierarchy nodes carry their top c-TF-IDF 'keywords'
+        (services/community_keywords.py), scored for every level in one pass.
+        'bridges' ranks the users connecting each pair of communities
+        (services/community_bridges.py); members get their participation
+        coefficient, external connections and sampled betweenness.
+        """
         try:
             # Build interaction graph
-            G = nx.Graph()
-            
-            # Add nodes (all commenters)
-            unique_users = set(comment['author_id'] for comment in all_comments)
-            for user_id in unique_users:
-                user_name = next((c['author_name'] for c in all_comments if c['author_id'] == user_id), 'Unknown')
-                G.add_node(user_id, name=user_name)
-            
-            # Add edges (reply interactions)
-            for edge in reply_edges:
-                if G.has_node(edge['from']) and G.has_node(edge['to']):
-                    if G.has_edge(edge['from'], edge['to']):
-                        G[edge['from']][edge['to']]['weight'] += 1
-                    else:
-                        G.add_edge(edge['from'], edge['to'], weight=1)
+            G = self._build_interaction_graph(all_comments, reply_edges)
             
             # If graph is too small or disconnected, return empty result
             if G.number_of_nodes() < 3 or G.number_of_edges() < 2:
@@ -526,56 +947,67 @@ class YouTubeAnalyzer:
                     'communities': [],
                     'modularity': 0,
                     'num_communities': 0,
-                    'user_to_community': {}
+                    'user_to_community': {},
+                    'members': [],
+                    'hierarchy': [],
+                    'bridges': {'pairs': [], 'betweenness_samples': 0}
                 }
             
             # Detect communities using Louvain method
-            user_to_community = community_louvain.best_partition(G)
-            modularity = community_louvain.modularity(user_to_community, G)
-            
-            # Calculate community statistics
-            community_stats = defaultdict(lambda: {
-                'members': [],
-                'member_names': [],
-                'total_comments': 0,
-                'total_likes': 0,
-                'avg_sentiment': 0,
-                'sentiment_count': 0
-            })
-            
-            for comment in all_comments:
-                author_id = comment['author_id']
-                if author_id in user_to_community:
-                    comm_id = user_to_community[author_id]
-                    stats = community_stats[comm_id]
-                    
-                    if author_id not in stats['members']:
-                        stats['members'].append(author_id)
-                        stats['member_names'].append(comment['author_name'])
-                    
-                    stats['total_comments'] += 1
-                    stats['total_likes'] += comment['like_count']
-                    stats['avg_sentiment'] = (stats['avg_sentiment'] * stats['sentiment_count'] + 
-                                             comment['sentiment_polarity']) / (stats['sentiment_count'] + 1)
-                    stats['sentiment_count'] += 1
+            dendrogram = None
+            if self.community_seed:
+                user_to_community, modularity, detection = incremental_partition(
+                    G, self.community_seed['partition'], self.community_seed.get('modularity')
+                )
+                print(f"[YOUTUBE_ANALYZER] Incremental community detection: {detection}")
+            elif ENSEMBLE_RUNS > 1:
+                user_to_community, modularity, stability = ensemble_partition(G)
+                detection = {'mode': 'ensemble', **stability}
+            else:
+                # best_partition's own steps, keeping the dendrogram for the hierarchy
+                dendrogram = community_louvain.generate_dendrogram(G)
+                user_to_community = community_louvain.partition_at_level(dendrogram, len(dendrogram) - 1)
+                modularity = community_louvain.modularity(user_to_community, G)
+                detection = {'mode': 'full'}
+            
+            community_stats, members = self._community_statistics(all_comments, reply_edges, user_to_community,
+                                                                  influence_scores)
+            
+            # Without a dendrogram, incremental runs only re-split the communities
+            # that changed; ensemble runs split only with HIERARCHY_RESPLIT
+            hierarchy = build_hierarchy(G, user_to_community, members, dendrogram,
+                                        previous_paths=(self.community_seed or {}).get('paths'),
+                                        resplit=bool(self.community_seed) or HIERARCHY_RESPLIT)
+            keywords = keyword_index(all_comments, {author: m['paths'] for author, m in members.items()})
+            for node in hierarchy:
+                node['keywords'] = keywords.get(node['path'], [])
+            bridges = community_bridges(G, user_to_community, members)
+            
+            internal_connections = Counter(
+                user_to_community[u] for u, v in G.edges() if user_to_community[u] == user_to_community[v]
+            )
             
             # Format communities list
             communities = []
-            for comm_id, stats in sorted(community_stats.items(), key=lambda x: len(x[1]['members']), reverse=True):
+            for comm_id, stats in community_stats.items():
+                size = stats['size']
                 communities.append({
                     'community_id': comm_id,
-                    'size': len(stats['members']),
-                    'total_comments': stats['total_comments'],
-                    'total_likes': stats['total_likes'],
-                    'avg_sentiment': round(stats['avg_sentiment'], 3),
-                    'top_members': stats['member_names'][:5]
+                    **stats,
+                    'keywords': keywords.get(str(comm_id), []),
+                    'internal_connections': internal_connections[comm_id],
+                    'density': round(2 * internal_connections[comm_id] / (size * (size - 1)), 4) if size > 1 else 0
                 })
             
             return {
                 'communities': communities,
                 'modularity': round(modularity, 3),
                 'num_communities': len(communities),
-                'user_to_community': user_to_community
+                'user_to_community': user_to_community,
+                'members': list(members.values()),
+                'hierarchy': hierarchy,
+                'bridges': bridges,
+                'detection': detection
             }
             
         except Exception as e:
@@ -584,7 +1016,10 @@ class YouTubeAnalyzer:
                 'communities': [],
                 'modularity': 0,
                 'num_communities': 0,
-                'user_to_community': {}
+                'user_to_community': {},
+                'members': [],
+                'hierarchy': [],
+                'bridges': {'pairs': [], 'betweenness_samples': 0}
             }
     
     def generate_community_network_visualization(self, all_comments, reply_edges, user_to_community):
@@ -593,23 +1028,8 @@ class YouTubeAnalyzer:
             if not user_to_community or len(user_to_community) == 0:
                 return None
             
-            # Build interaction graph
-            G = nx.Graph()
-            
-            # Add nodes with community assignments
-            unique_users = set(comment['author_id'] for comment in all_comments)
-            for user_id in unique_users:
-                if user_id in user_to_community:
-                    user_name = next((c['author_name'] for c in all_comments if c['author_id'] == user_id), 'Unknown')
-                    G.add_node(user_id, name=user_name, community=user_to_community[user_id])
-            
-            # Add edges
-            for edge in reply_edges:
-                if G.has_node(edge['from']) and G.has_node(edge['to']):
-                    if G.has_edge(edge['from'], edge['to']):
-                        G[edge['from']][edge['to']]['weight'] += 1
-                    else:
-                        G.add_edge(edge['from'], edge['to'], weight=1)
+            # Build interaction graph with community assignments
+            G = self._build_interaction_graph(all_comments, reply_edges, user_to_community)
             
             if G.number_of_nodes() < 2:
                 return None
@@ -667,131 +1087,117 @@ class YouTubeAnalyzer:
             traceback.print_exc()
             return None
     
-    def analyze_channel(self, channel_url, progress_callback=None):
-        """Analyze a YouTube channel"""
+    def analyze_channel(self, channel_url, progress_callback=None, checkpoint=None, partial_callback=None):
+        """Analyze a YouTube channel
+        
+        Pass a CrawlCheckpoint to persist crawl progress; a failed job retried
+        with the same checkpoint resumes from the last saved page.
+        Stage timings and API usage are returned under data['metrics'].
+        partial_callback(kind, data) receives partial results as they become
+        available (see _build_result).
+        """
+        trace = self.trace = AnalysisTrace('channel')
         try:
             if progress_callback:
                 progress_callback('Starting channel analysis...', 5)
             
-            # Resolve channel
-            if progress_callback:
-                progress_callback('Resolving channel URL...', 10)
-            
-            channel_id = self.resolve_channel_id(channel_url)
-            
-            # Get channel metadata
-            if progress_callback:
-                progress_callback('Fetching channel information...', 20)
-            
-            channel_metadata = self.get_channel_metadata(channel_id)
-            if not channel_metadata:
-                return {'success': False, 'error': 'Could not fetch channel metadata'}
-            
-            # Get recent videos
-            if progress_callback:
-                progress_callback('Collecting recent videos...', 30)
-            
-            videos_data = self.get_channel_videos(channel_id, max_videos=30)
-            
-            if len(videos_data) == 0:
-                return {'success': False, 'error': 'No videos found for analysis'}
+            with trace.span('channel_lookup'):
+                saved_job = checkpoint.load_job() if checkpoint else None
+                if saved_job:
+                    channel_id = saved_job['channel_id']
+                    channel_metadata = saved_job['channel_metadata']
+                    videos_data = saved_job['videos']
+                    print(f"[CHECKPOINT] Resuming channel {channel_id} crawl ({len(videos_data)} videos)")
+                else:
+                    # Resolve channel
+                    if progress_callback:
+                        progress_callback('Resolving channel URL...', 10)
+                
+                    channel_id = self.resolve_channel_id(channel_url)
+                
+                    # Get channel metadata
+                    if progress_callback:
+                        progress_callback('Fetching channel information...', 20)
+                
+                    channel_metadata = self.get_channel_metadata(channel_id)
+                    if not channel_metadata:
+                        return self._analysis_failed('Could not fetch channel metadata')
+                
+                    # Get recent videos
+                    if progress_callback:
+                        progress_callback('Collecting recent videos...', 30)
+                
+                    videos_data = self.get_channel_videos(channel_id, max_videos=CHANNEL_MAX_VIDEOS)
+                
+                    if len(videos_data) == 0:
+                        return self._analysis_failed('No videos found for analysis')
+                
+                    if checkpoint:
+                        checkpoint.save_job(channel_id, channel_metadata, videos_data)
             
             # Analyze comments from each video
-            all_comments = []
-            all_edges = []
-            
-            for i, video in enumerate(videos_data):
-                if progress_callback:
-                    progress = 30 + (i / len(videos_data)) * 50
-                    progress_callback(f'Analyzing video {i+1}/{len(videos_data)}...', progress)
+            with trace.span('comment_fetch') as span:
+                all_comments = []
+                all_edges = []
+            
+                for i, video in enumerate(videos_data):
+                    if progress_callback:
+                        progress = 30 + (i / len(videos_data)) * 50
+                        progress_callback(f'Analyzing video {i+1}/{len(videos_data)}...', progress)
                 
-                comments, edges = self.analyze_comments(video['video_id'], channel_id, max_comments=2000)
-                all_comments.extend(comments)
-                all_edges.extend(edges)
+                    page_callback = None
+                    if partial_callback:
+                        def page_callback(collected, i=i):
+                            partial_callback('comments', {'collected': len(all_comments) + collected,
+                                                          'videos_done': i, 'videos_total': len(videos_data)})
+                    
+                    comments, edges = self.analyze_comments(video['video_id'], channel_id,
+                                                            max_comments=CHANNEL_MAX_COMMENTS_PER_VIDEO,
+                                                            checkpoint=checkpoint, page_callback=page_callback)
+                    all_comments.extend(comments)
+                    all_edges.extend(edges)
+                    if partial_callback:
+                        partial_callback('comments', {'collected': len(all_comments),
+                                                      'videos_done': i + 1, 'videos_total': len(videos_data)})
                 
-                # Add video ID to comments for tracking
-                for comment in comments[-len(comments):]:
-                    comment['video_id'] = video['video_id']
-            
-            # Calculate influencer scores
-            if progress_callback:
-                progress_callback('Calculating influencer scores...', 85)
-            
-            influencers = self.calculate_influencer_scores(all_comments, all_edges, videos_data)
-            
-            # Run sentiment analysis
-            if progress_callback:
-                progress_callback('Running sentiment analysis...', 94)
-            
-            sentiment_analysis_result = None
-            if all_comments:
-                try:
-                    print(f"[YOUTUBE_ANALYZER] Channel: Running sentiment analysis on {len(all_comments)} comments...")
-                    sentiment_analysis_result = run_sentiment_analysis(all_comments)
-                    print(f"[YOUTUBE_ANALYZER] Channel: Sentiment complete. Score: {sentiment_analysis_result.get('overall_score')}")
-                    print(f"[YOUTUBE_ANALYZER] Channel: Word cloud exists: {bool(sentiment_analysis_result.get('word_cloud'))}")
-                    print(f"[YOUTUBE_ANALYZER] Channel: Top comments: {len(sentiment_analysis_result.get('top_like_comments', []))}")
-                except Exception as e:
-                    print(f"[YOUTUBE_ANALYZER] Channel: Sentiment analysis error: {e}")
-                    import traceback
-                    traceback.print_exc()
-                    sentiment_analysis_result = {
-                        "overall_score": 0,
-                        "label_counts": {"positive": 0, "neutral": 0, "negative": 0},
-                        "word_cloud": None,
-                        "pie_chart": None,
-                        "top_like_comments": [],
-                    }
-            
-            # Detect communities
-            if progress_callback:
-                progress_callback('Detecting communities...', 96)
-            
-            community_data = self.detect_communities(all_comments, all_edges)
-            
-            # Generate network visualization
-            if progress_callback:
-                progress_callback('Generating network visualization...', 98)
-            
-            network_viz = None
-            if community_data.get('user_to_community'):
-                network_viz = self.generate_community_network_visualization(
-                    all_comments, all_edges, community_data['user_to_community']
-                )
-            
-            # Add visualization to community data
-            if network_viz:
-                community_data['network_visualization'] = network_viz
-            
-            # Prepare result data
-            result_data = {
-                'success': True,
+                    # Add video ID to comments for tracking
+                    for comment in comments[-len(comments):]:
+                        comment['video_id'] = video['video_id']
+                span['items'] = len(all_comments)
+            
+            # Crawl output; also returned so callers can cache it (see analyze_raw)
+            raw = {
+                'analysis_type': 'channel',
                 'channel_metadata': channel_metadata,
-                'videos_analyzed': len(videos_data),
-                'total_comments': len(all_comments),
-                'influencers': influencers[:20],
-                'sentiment_analysis': sentiment_analysis_result,
-                'community_detection': community_data,
-                'analysis_time': datetime.now().isoformat(),
-                'analysis_type': 'channel'
+                'videos': videos_data,
+                'comments': all_comments,
+                'edges': all_edges
             }
+            result_data = self._build_result(raw, progress_callback, partial_callback)
+            
+            if checkpoint:
+                checkpoint.clear()
+            
+            result_data['metrics'] = trace.finish('success')
             
             if progress_callback:
                 progress_callback('Analysis complete!', 100)
             
             return {
                 'success': True,
-                'data': result_data
+                'data': result_data,
+                'raw': raw
             }
             
         except Exception as e:
             print(f"Error during channel analysis: {e}")
             import traceback
             traceback.print_exc()
-            return {'success': False, 'error': str(e)}
+            return self._analysis_failed(str(e))
     
-    def analyze_video(self, video_url, progress_callback=None):
-        """Analyze a single YouTube video"""
+    def analyze_video(self, video_url, progress_callback=None, checkpoint=None, partial_callback=None):
+        """Analyze a single YouTube video (resumable with a CrawlCheckpoint)"""
+        trace = self.trace = AnalysisTrace('video')
         try:
             if progress_callback:
                 progress_callback('Starting video analysis...', 5)
@@ -800,55 +1206,129 @@ class YouTubeAnalyzer:
             if progress_callback:
                 progress_callback('Extracting video ID...', 10)
             
-            video_id = self.extract_video_id(video_url)
+            with trace.span('video_lookup'):
+                video_id = self.extract_video_id(video_url)
             
-            # Get video metadata
-            if progress_callback:
-                progress_callback('Fetching video information...', 20)
+                # Get video metadata
+                if progress_callback:
+                    progress_callback('Fetching video information...', 20)
             
-            video_metadata = self.get_video_metadata(video_id)
-            if not video_metadata:
-                return {'success': False, 'error': 'Could not fetch video metadata'}
+                video_metadata = self.get_video_metadata(video_id)
+                if not video_metadata:
+                    return self._analysis_failed('Could not fetch video metadata')
             
-            # Get channel ID from video metadata
-            channel_id = video_metadata['channel_id']
+                # Get channel ID from video metadata
+                channel_id = video_metadata['channel_id']
             
-            # Get channel metadata for context
-            channel_metadata = self.get_channel_metadata(channel_id)
+                # Get channel metadata for context
+                channel_metadata = self.get_channel_metadata(channel_id)
             
-            # Create videos_data with just this video
-            videos_data = [video_metadata]
+                # Create videos_data with just this video
+                videos_data = [video_metadata]
             
             # Analyze comments
             if progress_callback:
                 progress_callback('Analyzing comments...', 40)
             
-            all_comments, all_edges = self.analyze_comments(video_id, channel_id, max_comments=5000)
+            with trace.span('comment_fetch') as span:
+                page_callback = None
+                if partial_callback:
+                    def page_callback(collected):
+                        partial_callback('comments', {'collected': collected, 'videos_done': 0, 'videos_total': 1})
+                
+                all_comments, all_edges = self.analyze_comments(video_id, channel_id, max_comments=VIDEO_MAX_COMMENTS,
+                                                                checkpoint=checkpoint, page_callback=page_callback)
             
-            # Add video ID to comments for tracking
-            for comment in all_comments:
-                comment['video_id'] = video_id
+                # Add video ID to comments for tracking
+                for comment in all_comments:
+                    comment['video_id'] = video_id
+                span['items'] = len(all_comments)
             
-            # Calculate influencer scores (lower min_comments for single video)
-            if progress_callback:
-                progress_callback('Calculating influencer scores...', 75)
+            # Crawl output; also returned so callers can cache it (see analyze_raw)
+            raw = {
+                'analysis_type': 'video',
+                'video_metadata': video_metadata,
+                'channel_metadata': channel_metadata,
+                'videos': videos_data,
+                'comments': all_comments,
+                'edges': all_edges
+            }
+            result_data = self._build_result(raw, progress_callback, partial_callback)
+            
+            if checkpoint:
+                checkpoint.clear()
             
-            influencers = self.calculate_influencer_scores(all_comments, all_edges, videos_data, min_comments=1)
+            result_data['metrics'] = trace.finish('success')
             
-            # Run sentiment analysis
             if progress_callback:
-                progress_callback('Running sentiment analysis...', 82)
+                progress_callback('Analysis complete!', 100)
             
+            return {
+                'success': True,
+                'data': result_data,
+                'raw': raw
+            }
+            
+        except Exception as e:
+            print(f"Error during video analysis: {e}")
+            import traceback
+            traceback.print_exc()
+            return self._analysis_failed(str(e))
+    
+    # Progress percentages of the post-crawl stages per analysis type
+    BUILD_PROGRESS = {
+        'channel': {'influencers': 85, 'sentiment': 94, 'communities': 96, 'rendering': 98},
+        'video': {'influencers': 75, 'sentiment': 82, 'communities': 88, 'rendering': 95},
+    }
+    
+    def _build_result(self, raw, progress_callback=None, partial_callback=None):
+        """Score, classify and render crawled comments into the result data
+        
+        raw holds what the crawl produced (see analyze_channel/analyze_video):
+        analysis_type, channel_metadata, video_metadata (videos only),
+        videos, comments and edges.
+        
+        partial_callback(kind, data) is sent 'influencers' (top 10), running
+        'sentiment' scores and 'communities' before the full result is ready.
+        """
+        trace = self.trace
+        analysis_type = raw['analysis_type']
+        label = analysis_type.capitalize()
+        progress = self.BUILD_PROGRESS[analysis_type]
+        all_comments = raw['comments']
+        all_edges = raw['edges']
+        videos_data = raw['videos']
+        
+        # Calculate influencer scores (lower min_comments for single video)
+        if progress_callback:
+            progress_callback('Calculating influencer scores...', progress['influencers'])
+        
+        with trace.span('influencer_scoring', items=len(all_comments)):
+            influencers = self.calculate_influencer_scores(all_comments, all_edges, videos_data,
+                                                           min_comments=1 if analysis_type == 'video' else 3)
+        if partial_callback:
+            partial_callback('influencers', {'top': influencers[:10]})
+        
+        # Run sentiment analysis
+        if progress_callback:
+            progress_callback('Running sentiment analysis...', progress['sentiment'])
+        
+        with trace.span('sentiment', items=len(all_comments)):
             sentiment_analysis_result = None
             if all_comments:
                 try:
-                    print(f"[YOUTUBE_ANALYZER] Video: Running sentiment analysis on {len(all_comments)} comments...")
-                    sentiment_analysis_result = run_sentiment_analysis(all_comments)
-                    print(f"[YOUTUBE_ANALYZER] Video: Sentiment complete. Score: {sentiment_analysis_result.get('overall_score')}")
-                    print(f"[YOUTUBE_ANALYZER] Video: Word cloud exists: {bool(sentiment_analysis_result.get('word_cloud'))}")
-                    print(f"[YOUTUBE_ANALYZER] Video: Top comments: {len(sentiment_analysis_result.get('top_like_comments', []))}")
+                    print(f"[YOUTUBE_ANALYZER] {label}: Running sentiment analysis on {len(all_comments)} comments...")
+                    on_progress = None
+                    if partial_callback:
+                        def on_progress(processed, total, score, label_counts):
+                            partial_callback('sentiment', {'processed': processed, 'total': total,
+                                                           'overall_score': score, 'label_counts': label_counts})
+                    sentiment_analysis_result = run_sentiment_analysis(all_comments, on_progress=on_progress)
+                    print(f"[YOUTUBE_ANALYZER] {label}: Sentiment complete. Score: {sentiment_analysis_result.get('overall_score')}")
+                    print(f"[YOUTUBE_ANALYZER] {label}: Word cloud exists: {bool(sentiment_analysis_result.get('word_cloud'))}")
+                    print(f"[YOUTUBE_ANALYZER] {label}: Top comments: {len(sentiment_analysis_result.get('top_like_comments', []))}")
                 except Exception as e:
-                    print(f"[YOUTUBE_ANALYZER] Video: Sentiment analysis error: {e}")
+                    print(f"[YOUTUBE_ANALYZER] {label}: Sentiment analysis error: {e}")
                     import traceback
                     traceback.print_exc()
                     sentiment_analysis_result = {
@@ -858,65 +1338,93 @@ class YouTubeAnalyzer:
                         "pie_chart": None,
                         "top_like_comments": [],
                     }
-            
-            # Detect communities
-            if progress_callback:
-                progress_callback('Detecting communities...', 88)
-            
-            community_data = self.detect_communities(all_comments, all_edges)
-            
-            # Generate network visualization
-            if progress_callback:
-                progress_callback('Generating network visualization...', 95)
-            
+        
+        # Detect communities
+        if progress_callback:
+            progress_callback('Detecting communities...', progress['communities'])
+        
+        with trace.span('community_detection') as span:
+            community_data = self.detect_communities(
+                all_comments, all_edges, {i['author_id']: i['total_score'] for i in influencers}
+            )
+            span['items'] = community_data.get('num_communities', 0)
+        if partial_callback:
+            partial_callback('communities', {'num_communities': community_data.get('num_communities', 0),
+                                             'modularity': community_data.get('modularity')})
+        
+        # Generate network visualization
+        if progress_callback:
+            progress_callback('Generating network visualization...', progress['rendering'])
+        
+        with trace.span('rendering'):
             network_viz = None
             if community_data.get('user_to_community'):
                 network_viz = self.generate_community_network_visualization(
                     all_comments, all_edges, community_data['user_to_community']
                 )
-            
+        
             # Add visualization to community data
             if network_viz:
                 community_data['network_visualization'] = network_viz
-            
-            # Prepare result data
-            result_data = {
-                'success': True,
-                'video_metadata': video_metadata,
-                'channel_metadata': channel_metadata,
-                'videos_analyzed': 1,
-                'total_comments': len(all_comments),
-                'influencers': influencers[:20],
-                'sentiment_analysis': sentiment_analysis_result,
-                'community_detection': community_data,
-                'analysis_time': datetime.now().isoformat(),
-                'analysis_type': 'video'
-            }
+        
+        # Prepare result data
+        result_data = {'success': True}
+        if analysis_type == 'video':
+            result_data['video_metadata'] = raw['video_metadata']
+        result_data.update({
+            'channel_metadata': raw['channel_metadata'],
+            'videos_analyzed': len(videos_data),
+            'total_comments': len(all_comments),
+            'influencers': influencers[:20],
+            'sentiment_analysis': sentiment_analysis_result,
+            'community_detection': community_data,
+            'analysis_time': datetime.now().isoformat(),
+            'analysis_type': analysis_type
+        })
+        return result_data
+    
+    def analyze_raw(self, raw, progress_callback=None, partial_callback=None):
+        """Rebuild an analysis from previously crawled comments (no API calls)
+        
+        Used to serve cached crawls when only the scoring/model side changed
+        or the cached result expired.
+        """
+        trace = self.trace = AnalysisTrace(raw['analysis_type'])
+        try:
+            result_data = self._build_result(raw, progress_callback, partial_callback)
+            result_data['metrics'] = trace.finish('success')
             
             if progress_callback:
                 progress_callback('Analysis complete!', 100)
             
             return {
                 'success': True,
-                'data': result_data
+                'data': result_data,
+                'raw': raw
             }
             
         except Exception as e:
-            print(f"Error during video analysis: {e}")
+            print(f"Error rebuilding analysis from cached comments: {e}")
             import traceback
             traceback.print_exc()
-            return {'success': False, 'error': str(e)}
+            return self._analysis_failed(str(e))
+    
+    def _analysis_failed(self, error):
+        """Close the running trace as failed and build the error result"""
+        if self.trace:
+            self.trace.finish('error')
+        return {'success': False, 'error': error}
     
-    def analyze(self, input_url, progress_callback=None):
+    def analyze(self, input_url, progress_callback=None, checkpoint=None, partial_callback=None):
         """Analyze YouTube input (auto-detects channel or video)"""
         try:
             # Auto-detect if it's a video or channel
             if self.looks_like_video_input(input_url):
                 print(f"Detected video input: {input_url}")
-                return self.analyze_video(input_url, progress_callback)
+                return self.analyze_video(input_url, progress_callback, checkpoint, partial_callback)
             else:
                 print(f"Detected channel input: {input_url}")
-                return self.analyze_channel(input_url, progress_callback)
+                return self.analyze_channel(input_url, progress_callback, checkpoint, partial_callback)
                 
         except Exception as e:
             return {'success': False, 'error': f'Analysis error: {str(e)}'}
\ No newline at end of file
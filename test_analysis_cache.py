@@ -0,0 +1,140 @@
+"""
+Tests for the shared analysis cache against a database that enforces MongoDB's document size limit.
+Run: python -m pytest -q test_analysis_cache.py   (or python test_analysis_cache.py)
+"""
+import copy
+
+import bson
+
+from services.analysis_cache import AnalysisCache
+from services.metrics import REGISTRY
+
+MAX_BSON_SIZE = 16 * 1024 * 1024
+
+
+class DocumentTooLarge(Exception):
+    pass
+
+
+def matches(doc, query):
+    for field, expected in query.items():
+        if isinstance(expected, dict) and '$ne' in expected:
+            if doc.get(field) == expected['$ne']:
+                return False
+        elif doc.get(field) != expected:
+            return False
+    return True
+
+
+class Cursor(list):
+    def sort(self, field, direction):
+        return Cursor(sorted(self, key=lambda doc: doc[field], reverse=direction < 0))
+
+
+class StubCollection:
+    """The slice of a pymongo collection AnalysisCache uses, rejecting documents over 16 MB"""
+
+    def __init__(self):
+        self.docs = []
+
+    def _check(self, doc):
+        if len(bson.encode(doc)) > MAX_BSON_SIZE:
+            raise DocumentTooLarge("BSON document too large")
+
+    def insert_many(self, docs):
+        for doc in docs:
+            self._check(doc)
+        self.docs.extend(copy.deepcopy(docs))
+
+    def replace_one(self, query, doc, upsert=False):
+        self._check(doc)
+        self.delete_many(query)
+        self.docs.append(copy.deepcopy(doc))
+
+    def update_one(self, query, update):
+        for doc in self.docs:
+            if matches(doc, query):
+                for field, value in update.get('$set', {}).items():
+                    doc[field] = value
+                return
+
+    def delete_many(self, query):
+        self.docs = [doc for doc in self.docs if not matches(doc, query)]
+
+    def delete_one(self, query):
+        self.delete_many(query)
+
+    def find(self, query, projection=None):
+        return Cursor(copy.deepcopy(doc) for doc in self.docs if matches(doc, query))
+
+    def find_one(self, query, projection=None):
+        return next(iter(self.find(query)), None)
+
+
+class StubDatabase:
+    def __init__(self):
+        self.analysis_cache = StubCollection()
+        self.analysis_cache_chunks = StubCollection()
+
+
+def large_result(communities=400, members=500):
+    """A result whose community lists alone take well over 16 MB of BSON"""
+    return {
+        'total_comments': communities * members,
+        'community_detection': {
+            'communities': [
+                {'community_id': c, 'members': [
+                    {'author_channel_id': f"UC{c:04d}{m:06d}", 'author_display_name': f"@member{m}",
+                     'comment_count': m % 7, 'sample_comment': "great video, thanks for the upload " * 2}
+                    for m in range(members)
+                ]}
+                for c in range(communities)
+            ]
+        },
+        'influencers': [],
+    }
+
+
+def raw_crawl():
+    return {'analysis_type': 'video', 'comments': [{'comment_id': 'c1'}], 'edges': []}
+
+
+def test_results_over_the_bson_limit_are_cached_compressed():
+    result = large_result()
+    assert len(bson.encode(result)) > MAX_BSON_SIZE
+    db = StubDatabase()
+    cache = AnalysisCache(db=db, ttl_hours=1)
+
+    cache.put("video:large", "v1", result, raw_crawl())
+
+    stored = db.analysis_cache.find_one({'key': "video:large"})
+    assert stored is not None and 'compressed' in stored['result']
+    assert 'community_detection' not in stored['result']
+    tier, cached = cache.lookup("video:large", "v1")
+    assert tier == "result"
+    assert cached['community_detection'] == result['community_detection']
+    assert cached['total_comments'] == result['total_comments']
+
+
+def test_failed_puts_are_counted_and_leave_no_chunks():
+    REGISTRY.reset()
+    db = StubDatabase()
+
+    def rejected(*args, **kwargs):
+        raise DocumentTooLarge("BSON document too large")
+
+    db.analysis_cache.replace_one = rejected
+    cache = AnalysisCache(db=db)
+
+    cache.put("video:rejected", "v1", {'total_comments': 1}, raw_crawl())
+
+    assert 'orbitlink_analysis_cache_write_failures_total{operation="put"} 1' in REGISTRY.render()
+    assert db.analysis_cache_chunks.docs == []
+    assert cache.lookup("video:rejected", "v1") == (None, None)
+
+
+if __name__ == "__main__":
+    for name, fn in list(globals().items()):
+        if name.startswith("test_") and callable(fn):
+            fn()
+            print(f"[OK] {name}")
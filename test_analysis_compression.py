@@ -0,0 +1,80 @@
+"""
+Tests for the compressed storage of analysis documents.
+Run: python -m pytest -q test_analysis_compression.py   (or python test_analysis_compression.py)
+"""
+import bson
+
+import services.analysis_compression as compression
+from services.analysis_compression import PACKED_KEY, pack_analysis, unpack_analysis
+
+
+def small_analysis():
+    return {
+        'total_comments': 3,
+        'metrics': {'api_calls': 2},
+        'community_detection': {'communities': [{'community_id': 0, 'size': 3}]},
+        'influencers': [{'author_id': 'UC1', 'total_score': 4.5}],
+        'sentiment_analysis': {'overall_score': 0.2, 'pie_chart': 'aGVsbG8=' * 20},
+    }
+
+
+def stored(doc):
+    """The document as read back from MongoDB"""
+    return bson.decode(bson.encode(doc))
+
+
+def without_zstandard(fn):
+    original = compression.zstandard
+    compression.zstandard = None
+    try:
+        return fn()
+    finally:
+        compression.zstandard = original
+
+
+def test_heavy_fields_are_packed_and_restored():
+    data = small_analysis()
+    packed = stored(pack_analysis(data))
+
+    assert set(packed) == {'total_comments', 'metrics', PACKED_KEY}
+    assert packed[PACKED_KEY]['fields'] == ['community_detection', 'influencers', 'sentiment_analysis']
+    assert packed[PACKED_KEY]['codec'] == ('zstd' if compression.zstandard else 'zlib')
+    assert unpack_analysis(packed) == data
+
+
+def test_zlib_fallback_without_zstandard():
+    data = small_analysis()
+    packed = without_zstandard(lambda: stored(pack_analysis(data)))
+
+    assert packed[PACKED_KEY]['codec'] == 'zlib'
+    assert without_zstandard(lambda: unpack_analysis(packed)) == data
+    assert unpack_analysis(packed) == data  # readable whichever codecs are installed
+
+
+def test_zstd_document_without_zstandard_raises():
+    if compression.zstandard is None:
+        return  # nothing can write a zstd document here
+    packed = stored(pack_analysis(small_analysis()))
+    assert packed[PACKED_KEY]['codec'] == 'zstd'
+    try:
+        without_zstandard(lambda: unpack_analysis(packed))
+        raise AssertionError("expected RuntimeError")
+    except RuntimeError as e:
+        assert "zstandard" in str(e)
+
+
+def test_passthrough_documents():
+    packed = pack_analysis(small_analysis())
+    assert pack_analysis(packed) is packed  # already packed
+    light = {'total_comments': 0, 'metrics': {}}
+    assert pack_analysis(light) is light  # nothing to compress
+    assert pack_analysis({}) == {} and pack_analysis(None) is None
+    data = small_analysis()
+    assert unpack_analysis(data) is data  # saved before compression
+
+
+if __name__ == "__main__":
+    for name, fn in list(globals().items()):
+        if name.startswith("test_") and callable(fn):
+            fn()
+            print(f"[OK] {name}")
@@ -0,0 +1,49 @@
+"""
+Tests for cross-community bridge detection.
+Run: python -m pytest -q test_community_bridges.py   (or python test_community_bridges.py)
+"""
+import networkx as nx
+
+from services.community_bridges import adjacency, community_bridges, sampled_betweenness
+
+
+def test_betweenness_matches_networkx_when_exact():
+    G = nx.les_miserables_graph()
+    nodes = list(G)
+    indptr, indices, _ = adjacency(G, nodes)
+
+    betweenness, sources = sampled_betweenness(indptr, indices, samples=len(nodes))
+
+    expected = nx.betweenness_centrality(G)
+    assert sources == len(nodes)
+    assert all(abs(betweenness[i] - expected[node]) < 1e-9 for i, node in enumerate(nodes))
+
+
+def test_bridges_rank_the_users_between_each_pair():
+    G = nx.Graph()
+    for community in "abc":
+        G.add_edges_from(((f"{community}{i}", f"{community}{j}") for i in range(5) for j in range(i + 1, 5)),
+                         weight=1)
+    G.add_edge("a0", "b0", weight=3)
+    G.add_edge("a0", "b1", weight=1)
+    G.add_edge("b4", "c4", weight=1)
+    partition = {node: "abc".index(node[0]) for node in G}
+    members = {node: {} for node in G}
+
+    result = community_bridges(G, partition, members)
+
+    pairs = {tuple(pair["communities"]): pair for pair in result["pairs"]}
+    assert list(pairs) == [(0, 1), (1, 2)]
+    assert pairs[(0, 1)]["connections"] == 4 and pairs[(0, 1)]["edges"] == 2
+    assert [b["author_channel_id"] for b in pairs[(0, 1)]["bridges"]] == ["a0", "b0", "b1"]
+    assert [b["pair_connections"] for b in pairs[(0, 1)]["bridges"]] == [4, 3, 1]
+    assert members["a1"]["participation"] == 0 and members["a1"]["external_connections"] == 0
+    assert members["a0"]["participation"] > 0 and members["a0"]["external_connections"] == 4
+    assert members["b4"]["betweenness"] > members["b3"]["betweenness"]
+
+
+if __name__ == "__main__":
+    for name, fn in list(globals().items()):
+        if name.startswith("test_") and callable(fn):
+            fn()
+            print(f"[OK] {name}")
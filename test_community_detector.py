@@ -0,0 +1,124 @@
+"""
+Tests for CommunityDetector's cached community data.
+Run: python -m pytest -q test_community_detector.py   (or python test_community_detector.py)
+"""
+import os
+import shutil
+import tempfile
+from pathlib import Path
+
+import community as community_louvain
+import networkx as nx
+import pandas as pd
+
+from services.columnar_store import ColumnarStore
+from services.community_detector import CommunityDetector
+
+COMMUNITIES_CSV = Path("DatabaseExtract/CommunityCSV/consolidated_community_analysis.csv")
+
+
+def make_detector(tmp):
+    shutil.copy(COMMUNITIES_CSV, Path(tmp) / COMMUNITIES_CSV.name)
+    detector = CommunityDetector.__new__(CommunityDetector)
+    detector.cache_dir = Path(tmp)
+    detector.store = ColumnarStore(Path(tmp) / "columnar")
+    return detector
+
+
+def test_reply_edges_from_columns():
+    tmp = tempfile.mkdtemp()
+    try:
+        data = make_detector(tmp).load_analysis_data()
+        csv = pd.read_csv(COMMUNITIES_CSV)
+        replies = csv[csv["parent_author_id"].notna()]
+        expected = set(zip(replies["author_channel_id"], replies["parent_author_id"]))
+        assert set(data["network"].edges()) == expected
+    finally:
+        shutil.rmtree(tmp)
+
+
+def test_cached_until_csv_changes():
+    tmp = tempfile.mkdtemp()
+    try:
+        detector = make_detector(tmp)
+        first = detector.load_analysis_data()
+        assert detector.load_analysis_data() is first
+
+        csv_path = Path(tmp) / COMMUNITIES_CSV.name
+        stat = csv_path.stat()
+        os.utime(csv_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+        assert detector.load_analysis_data() is not first
+    finally:
+        shutil.rmtree(tmp)
+
+
+def test_projects_read_only_their_partition():
+    tmp = tempfile.mkdtemp()
+    try:
+        detector = make_detector(tmp)
+        csv = pd.read_csv(COMMUNITIES_CSV)
+        detector.store.write("community_analysis", csv.head(10), project_id=7)
+
+        assert detector.load_analysis_data(7)["total_comments"] == 10
+        assert detector.load_analysis_data()["total_comments"] == len(csv)
+        assert detector.load_analysis_data(8) is None
+    finally:
+        shutil.rmtree(tmp)
+
+
+def test_projects_without_data_never_get_the_default_partition():
+    tmp = tempfile.mkdtemp()
+    try:
+        detector = make_detector(tmp)
+        detector._stored_response = lambda project_id, user_id=None: None
+
+        assert detector.get_community_data(8, "user") == {"success": False, "error": "No analysis data found"}
+        data = detector.load_analysis_data()
+        graph = nx.Graph(data["network"].subgraph(data["user_to_community"]))
+        assert data["modularity"] == community_louvain.modularity(data["user_to_community"], graph)
+        assert data["channel_title"] is None and data["channel_url"] is None
+    finally:
+        shutil.rmtree(tmp)
+
+
+def test_default_store_is_anchored_to_the_repo():
+    cwd = os.getcwd()
+    tmp = tempfile.mkdtemp()
+    try:
+        os.chdir(tmp)
+        detector = CommunityDetector()
+        assert detector.store.root == Path(__file__).resolve().parent / "DatabaseExtract" / "columnar"
+        assert detector.cache_dir == Path(__file__).resolve().parent / COMMUNITIES_CSV.parent
+        assert not (Path(tmp) / "CommunityCSV").exists()
+    finally:
+        os.chdir(cwd)
+        shutil.rmtree(tmp)
+
+
+def test_columnar_store_roundtrip_and_video_filter():
+    tmp = tempfile.mkdtemp()
+    try:
+        store = ColumnarStore(tmp)
+        csv = pd.read_csv(COMMUNITIES_CSV)
+        store.write("community_analysis", csv, project_id=7)
+        store.write("community_analysis", csv.head(10), project_id=8)
+
+        back = store.read("community_analysis", project_id=7)
+        assert len(back) == len(csv)
+        assert back["is_reply"].dtype == bool and back["like_count"].dtype == "int64"
+        assert sorted(back["comment_id"]) == sorted(csv["comment_id"])
+
+        video_id = csv["video_id"].iloc[0]
+        one_video = store.read("community_analysis", project_id=7, video_ids=[video_id], categorical=True)
+        assert len(one_video) == (csv["video_id"] == video_id).sum()
+        assert one_video["author_channel_id"].dtype == "category"
+        assert len(store.read("community_analysis", project_id="*")) == len(csv) + 10
+    finally:
+        shutil.rmtree(tmp)
+
+
+if __name__ == "__main__":
+    for name, fn in list(globals().items()):
+        if name.startswith("test_") and callable(fn):
+            fn()
+            print(f"[OK] {name}")
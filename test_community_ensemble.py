@@ -0,0 +1,55 @@
+"""
+Tests for the seeded Louvain ensemble.
+Run: python -m pytest -q test_community_ensemble.py   (or python test_community_ensemble.py)
+"""
+import networkx as nx
+
+import services.community_ensemble as ensemble
+from services.community_ensemble import ensemble_partition, normalized_mutual_information
+
+
+def planted_graph():
+    return nx.planted_partition_graph(8, 25, 0.25, 0.01, seed=4)
+
+
+def ground_truth(G):
+    return {node: group for group, nodes in enumerate(G.graph["partition"]) for node in nodes}
+
+
+def test_best_run_is_kept_and_stability_reported():
+    G = planted_graph()
+    partition, modularity, stability = ensemble_partition(G, runs=6, method="best", workers=1)
+
+    assert round(modularity, 4) == stability["modularity_max"]
+    assert stability["modularity_min"] <= stability["modularity_mean"] <= stability["modularity_max"]
+    assert 0 <= stability["mean_pairwise_nmi"] <= 1
+    assert ensemble_partition(G, runs=6, method="best", workers=1)[0] == partition
+
+
+def test_consensus_recovers_planted_groups_in_pool():
+    G = planted_graph()
+    original = ensemble.PARALLEL_MIN_EDGES
+    ensemble.PARALLEL_MIN_EDGES = 0
+    try:
+        parallel = ensemble_partition(G, runs=4, method="consensus", workers=2)
+    finally:
+        ensemble.PARALLEL_MIN_EDGES = original
+    sequential = ensemble_partition(G, runs=4, method="consensus", workers=1)
+
+    assert parallel[0] == sequential[0]
+    assert parallel[2]["workers"] == 2 and sequential[2]["workers"] == 1
+    assert ensemble_partition(G, runs=4, workers=2)[2]["workers"] == 1  # below PARALLEL_MIN_EDGES
+    assert normalized_mutual_information(parallel[0], ground_truth(G)) > 0.9
+
+
+def test_nmi_bounds():
+    a = {1: 0, 2: 0, 3: 1, 4: 1}
+    assert normalized_mutual_information(a, {1: 5, 2: 5, 3: 7, 4: 7}) == 1.0
+    assert normalized_mutual_information(a, {1: 0, 2: 1, 3: 0, 4: 1}) == 0.0
+
+
+if __name__ == "__main__":
+    for name, fn in list(globals().items()):
+        if name.startswith("test_") and callable(fn):
+            fn()
+            print(f"[OK] {name}")
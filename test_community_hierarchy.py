@@ -0,0 +1,122 @@
+"""
+Tests for the Louvain community hierarchy used by the drill-down API.
+Run: python -m pytest -q test_community_hierarchy.py   (or python test_community_hierarchy.py)
+"""
+import community as community_louvain
+import networkx as nx
+
+from services.community_hierarchy import build_hierarchy
+
+
+def nested_graph():
+    """4 groups of 3 dense cliques each: two natural levels"""
+    G = nx.Graph()
+    for group in range(4):
+        for clique in range(3):
+            nodes = [f"u{group}{clique}{i}" for i in range(6)]
+            G.add_edges_from((a, b) for i, a in enumerate(nodes) for b in nodes[i + 1:])
+        for clique in range(3):
+            for i in range(6):
+                G.add_edge(f"u{group}{clique}{i}", f"u{group}{(clique + 1) % 3}{i}")
+        G.add_edge(f"u{group}00", f"u{(group + 1) % 4}05")
+    return G
+
+
+def members_of(G):
+    return {node: {'author_channel_id': node, 'author_display_name': node, 'comment_count': G.degree(node),
+                   'likes_received': 1, 'influence_score': G.degree(node) / 10} for node in G}
+
+
+def test_levels_nest_and_member_paths_follow_the_tree():
+    G = nested_graph()
+    dendrogram = community_louvain.generate_dendrogram(G, random_state=1)
+    partition = community_louvain.partition_at_level(dendrogram, len(dendrogram) - 1)
+    members = members_of(G)
+
+    nodes = {node["path"]: node for node in build_hierarchy(G, partition, members, dendrogram)}
+
+    roots = [node for node in nodes.values() if node["parent"] is None]
+    assert sorted(node["path"] for node in roots) == sorted(str(c) for c in set(partition.values()))
+    assert sum(node["size"] for node in roots) == G.number_of_nodes()
+    assert sorted(len(node["children"]) for node in roots) == [3, 3, 3, 3]
+    for node in nodes.values():
+        if node["children"]:
+            assert sum(nodes[child]["size"] for child in node["children"]) == node["size"]
+            assert all(child.startswith(node["path"] + ".") for child in node["children"])
+        assert node["internal_connections"] <= node["size"] * (node["size"] - 1) / 2
+
+    for author, member in members.items():
+        assert member["paths"][0] == str(partition[author])
+        assert all(nodes[path]["parent"] == parent for parent, path in zip(member["paths"], member["paths"][1:]))
+        assert nodes[member["paths"][-1]]["children"] == []
+
+
+def test_hierarchy_fits_a_partition_from_another_run():
+    G = nested_graph()
+    partition = {node: int(node[1]) for node in G}  # the four groups, not from a dendrogram
+    members = members_of(G)
+
+    nodes = build_hierarchy(G, partition, members, random_state=2)
+
+    roots = [node for node in nodes if node["parent"] is None]
+    assert sorted(node["size"] for node in roots) == [18, 18, 18, 18]
+    assert all(member["paths"][0] == node[1] for node, member in members.items())
+    top = max(roots, key=lambda node: node["size"])
+    assert top["influencers"][0]["influence_score"] == max(
+        m["influence_score"] for m in members.values() if m["paths"][0] == top["path"]
+    )
+
+
+def test_unchanged_communities_reuse_previous_paths():
+    G = nested_graph()
+    dendrogram = community_louvain.generate_dendrogram(G, random_state=1)
+    partition = community_louvain.partition_at_level(dendrogram, len(dendrogram) - 1)
+    previous = members_of(G)
+    build_hierarchy(G, partition, previous, dendrogram)
+    previous_paths = {author: m["paths"] for author, m in previous.items()}
+
+    # A new commenter joins one community; the other three are unchanged
+    joined = partition["u000"]
+    G.add_edges_from(("new", f"u00{i}") for i in range(6))
+    partition = dict(partition, new=joined)
+    members = members_of(G)
+    original = community_louvain.generate_dendrogram
+    split = []
+    community_louvain.generate_dendrogram = lambda graph, **kwargs: split.append(set(graph)) or original(graph, **kwargs)
+    try:
+        build_hierarchy(G, partition, members, previous_paths=previous_paths, random_state=1)
+        flat = members_of(G)
+        build_hierarchy(G, partition, flat, previous_paths=previous_paths, resplit=False)
+    finally:
+        community_louvain.generate_dendrogram = original
+
+    assert split == [{node for node, community in partition.items() if community == joined}]
+    assert all(members[author]["paths"] == paths for author, paths in previous_paths.items()
+               if partition[author] != joined)
+    assert len(members["new"]["paths"]) > 1
+    assert all(m["paths"] == [str(joined)] for author, m in flat.items() if partition[author] == joined)
+
+
+def test_collapsed_levels_count_each_internal_edge_once():
+    G = nx.relaxed_caveman_graph(30, 8, 0.2, seed=1)
+    dendrogram = community_louvain.generate_dendrogram(G, random_state=1)
+    partition = community_louvain.partition_at_level(dendrogram, len(dendrogram) - 1)
+    members = members_of(G)
+
+    nodes = build_hierarchy(G, partition, members, dendrogram)
+
+    in_path = {node["path"]: {author for author, m in members.items() if node["path"] in m["paths"]}
+               for node in nodes}
+    assert any(len(set(m["paths"])) < len(dendrogram) for m in members.values())  # some level collapsed
+    for node in nodes:
+        assert node["size"] == len(in_path[node["path"]])
+        inside = in_path[node["path"]]
+        assert node["internal_connections"] == sum(u != v and u in inside and v in inside for u, v in G.edges())
+        assert node["density"] <= 1
+
+
+if __name__ == "__main__":
+    for name, fn in list(globals().items()):
+        if name.startswith("test_") and callable(fn):
+            fn()
+            print(f"[OK] {name}")
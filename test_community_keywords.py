@@ -0,0 +1,62 @@
+"""
+Tests for the per-community c-TF-IDF keyword index.
+Run: python -m pytest -q test_community_keywords.py   (or python test_community_keywords.py)
+"""
+from services.community_keywords import ctfidf, keyword_index
+
+
+def comments_of(author, texts):
+    return [{'author_id': author, 'text': text} for text in texts]
+
+
+def test_each_community_gets_its_distinctive_terms():
+    all_comments = (
+        comments_of('a1', ["The guitar solo was amazing", "That guitar tone &amp; the<br>settings"])
+        + comments_of('a2', ["Guitar solo again, what a guitar", "Video was amazing"])
+        + comments_of('b1', ["Recipe needs more garlic", "Garlic bread recipe please"])
+        + comments_of('b2', ["The video was amazing, garlic everywhere", "Best recipe on https://example.com/x"])
+        + comments_of('outsider', ["guitar guitar guitar garlic"])
+    )
+    author_groups = {'a1': ['0', '0.1'], 'a2': ['0', '0.2'], 'b1': ['1'], 'b2': ['1']}
+
+    keywords = keyword_index(all_comments, author_groups)
+
+    assert [k['term'] for k in keywords['0']][:2] == ['guitar', 'solo']
+    assert {k['term'] for k in keywords['1'][:2]} == {'garlic', 'recipe'}
+    assert [k['term'] for k in keywords['0.1']] == ['guitar', 'solo', 'amazing']  # 'tone' is used once
+    terms = {k['term'] for group in keywords.values() for k in group}
+    assert not terms & {'the', 'was', 'amp', 'https', 'example'}
+    assert all(k['score'] >= group[i + 1]['score'] for group in keywords.values()
+               for i, k in enumerate(group[:-1]))
+
+
+def test_contractions_never_become_keywords():
+    texts = [
+        "I don't know, doesn't matter", "Didn&#39;t expect that, isn&#39;t it wild",
+        "Wasn\u2019t ready, can't stop, won't stop", "Y'all couldn't've known, it's the creator's drums",
+        "We'll see, they're drumming, the creator&#39;s drums again",
+    ]
+    keywords = keyword_index(comments_of('a', texts) + comments_of('b', texts), {'a': ['0'], 'b': ['1']})
+
+    terms = {k['term'] for group in keywords.values() for k in group}
+    assert {'drums', 'creator', 'know', 'ready'} <= terms
+    assert not any("'" in term for term in terms)
+    assert not terms & {'don', 'doesn', 'didn', 'isn', 'wasn', 'can', 'won', 'couldn', 'all', 'they', 'let'}
+
+
+def test_shared_terms_score_below_distinctive_ones():
+    groups = ['x'] * 4 + ['y'] * 4
+    terms = ['shared', 'shared', 'apple', 'apple', 'shared', 'shared', 'pear', 'pear']
+
+    keywords = ctfidf(groups, terms, top_n=1)
+
+    assert keywords == {'x': [keywords['x'][0]], 'y': [keywords['y'][0]]}
+    assert keywords['x'][0]['term'] == 'apple' and keywords['y'][0]['term'] == 'pear'
+    assert ctfidf([], []) == {}
+
+
+if __name__ == "__main__":
+    for name, fn in list(globals().items()):
+        if name.startswith("test_") and callable(fn):
+            fn()
+            print(f"[OK] {name}")
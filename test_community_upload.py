@@ -0,0 +1,135 @@
+"""
+Tests for the batched community upload writers (no database needed).
+Run: python -m pytest -q test_community_upload.py   (or python test_community_upload.py)
+"""
+import threading
+from datetime import datetime
+
+import pandas as pd
+from pymongo import ReplaceOne
+from pymongo.errors import AutoReconnect
+
+import services.community_upload as community_upload
+from services.community_upload import BatchWriter, MongoBatchWriter, build_documents, publish_community_results
+
+COMMUNITIES_CSV = "DatabaseExtract/CommunityCSV/consolidated_community_analysis.csv"
+
+
+NOW = datetime(2026, 1, 2, 3, 4, 5)
+
+
+class FixedClock(datetime):
+    @classmethod
+    def now(cls, tz=None):
+        return NOW
+
+
+class FlakyCollection:
+    """Records the operations of every bulk_write that went through"""
+
+    def __init__(self, failures):
+        self.failures = failures
+        self.operations = []
+        self.calls = 0
+        self.lock = threading.Lock()
+
+    def bulk_write(self, operations, ordered=True):
+        assert not ordered
+        with self.lock:
+            self.calls += 1
+            if self.failures:
+                self.failures -= 1
+                raise AutoReconnect("connection reset")
+            self.operations.extend(operations)
+
+
+class FakeDb(dict):
+    def __missing__(self, name):
+        self[name] = FlakyCollection(failures=1 if name == "comments" else 0)
+        return self[name]
+
+
+def load_inputs():
+    comments_df = pd.read_csv(COMMUNITIES_CSV)
+    user_to_community = dict(zip(comments_df["author_channel_id"], comments_df["community_id"]))
+    communities_df = pd.DataFrame({
+        "community_id": comments_df["community_id"].unique(),
+    })
+    for column in ("size", "total_comments", "total_likes", "total_replies_given",
+                   "total_replies_received", "internal_connections"):
+        communities_df[column] = 1
+    communities_df["density"] = 0.5
+    communities_df["avg_comments_per_user"] = 1.0
+    communities_df["top_contributor"] = "someone"
+    communities_df["top_contributor_id"] = "UC123"
+    return comments_df, user_to_community, communities_df
+
+
+def test_user_stats_match_per_user_filter():
+    comments_df, user_to_community, communities_df = load_inputs()
+    users = dict(build_documents("p", communities_df, user_to_community, comments_df)["users"])
+
+    user_id = comments_df["author_channel_id"].value_counts().index[0]
+    own = comments_df[comments_df["author_channel_id"] == user_id]
+    doc = users[f"p:{user_id}"]
+    assert doc["total_comments"] == len(own[~own["is_reply"]])
+    assert doc["total_replies"] == len(own[own["is_reply"]])
+    assert doc["total_likes"] == own["like_count"].sum()
+
+
+def upserts(docs):
+    return sorted((ReplaceOne({"_id": doc_id}, doc, upsert=True) for doc_id, doc in docs), key=repr)
+
+
+def test_publish_retries_failed_batches():
+    comments_df, user_to_community, communities_df = load_inputs()
+    db = FakeDb()
+    writer = MongoBatchWriter(db, batch_size=500, workers=4, backoff=0.01)
+
+    community_upload.datetime = FixedClock
+    try:
+        summary = publish_community_results(writer, "url", "UC1", communities_df, user_to_community,
+                                            comments_df, 0.42, project_name="p")
+    finally:
+        community_upload.datetime = datetime
+
+    assert summary["counts"]["comments"] == len(comments_df)
+    assert db["comments"].calls == -(-len(comments_df) // 500) + 1  # one batch retried
+    expected = build_documents("p", communities_df, user_to_community, comments_df)
+    for name, docs in expected.items():
+        assert sorted(db[name].operations, key=repr) == upserts(docs)
+    assert db["projects"].operations == upserts([("p", {
+        "channel_url": "url", "channel_id": "UC1", "total_communities": len(communities_df),
+        "total_users": len(user_to_community), "total_comments": len(comments_df),
+        "modularity_score": 0.42, "analysis_date": NOW, "created_at": NOW,
+    })])
+
+
+def test_only_declared_errors_are_retried():
+    class BrokenCollection:
+        calls = 0
+
+        def bulk_write(self, operations, ordered=True):
+            BrokenCollection.calls += 1
+            raise TypeError("document must be a dict")
+
+    writer = MongoBatchWriter({"users": BrokenCollection()}, workers=1, backoff=0.01)
+    try:
+        writer.write("users", [("u1", {"user_id": "u1"})])
+        raise AssertionError("expected TypeError")
+    except TypeError:
+        pass
+    assert BrokenCollection.calls == 1
+    assert BatchWriter.retryable == ()
+    try:
+        BatchWriter()
+        raise AssertionError("BatchWriter is abstract")
+    except TypeError:
+        pass
+
+
+if __name__ == "__main__":
+    for name, fn in list(globals().items()):
+        if name.startswith("test_") and callable(fn):
+            fn()
+            print(f"[OK] {name}")
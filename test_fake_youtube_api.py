@@ -0,0 +1,302 @@
+"""
+Regression tests for YouTubeAnalyzer against the local fake YouTube Data API.
+No API key or network needed.
+Run: python -m pytest -q test_fake_youtube_api.py   (or python test_fake_youtube_api.py)
+"""
+import shutil
+import tempfile
+
+import bson
+
+from benchmarks.fake_youtube_api import (
+    FakeYouTubeDataset, FakeYouTubeServer, apply_fields, parse_fields, RECORDED_COMMENTS_CSV
+)
+import services.youtube_analyzer as ya
+from services.analysis_cache import AnalysisCache
+from services.analysis_compression import pack_analysis, unpack_analysis
+from services.analysis_progress import AnalysisJob, sse_message
+from services.crawl_checkpoint import CrawlCheckpoint
+from services.metrics import REGISTRY
+from services.profiler import JobProfiler
+from services.quota_budget import QuotaBudget
+
+# Keep the transformers model out of these runs
+ya.run_sentiment_analysis = lambda comments, on_progress=None: {
+    "overall_score": 0,
+    "label_counts": {"positive": 0, "neutral": 0, "negative": 0},
+    "word_cloud": None,
+    "pie_chart": None,
+    "top_like_comments": [],
+}
+
+
+def test_fields_mask():
+    tree = parse_fields("items(id,snippet(title,thumbnails/high/url)),nextPageToken")
+    body = {
+        "kind": "x",
+        "nextPageToken": "5",
+        "items": [{"id": "a", "etag": "e",
+                   "snippet": {"title": "t", "description": "d",
+                               "thumbnails": {"high": {"url": "u", "width": 1}, "low": {}}}}],
+    }
+    assert apply_fields(body, tree) == {
+        "nextPageToken": "5",
+        "items": [{"id": "a", "snippet": {"title": "t", "thumbnails": {"high": {"url": "u"}}}}],
+    }
+
+
+def test_analyze_video_collects_full_reply_threads():
+    dataset = FakeYouTubeDataset.synthetic(num_videos=1, threads_per_video=120, seed=7)
+    video_id = next(iter(dataset.videos))
+
+    with FakeYouTubeServer(dataset) as server:
+        analyzer = ya.YouTubeAnalyzer("fake-key", api_endpoint=server.endpoint)
+        result = analyzer.analyze(f"https://www.youtube.com/watch?v={video_id}")
+
+    assert result["success"], result
+    assert result["data"]["total_comments"] == dataset.total_comments
+    assert server.stats["requests"].get("comments.list", 0) > 0
+
+
+def test_reply_expansion_stops_at_the_comment_allowance():
+    dataset = FakeYouTubeDataset()
+    dataset.add_channel("UCbusyThreadChannel000001", "Busy Thread")
+    dataset.add_video("vidbusy0001", "UCbusyThreadChannel000001", "Busy thread", "2025-01-01T00:00:00Z")
+    dataset.add_comment("Ugbusy", "vidbusy0001", "UCauthor000000", "@author", "first")
+    for r in range(1000):
+        dataset.add_comment(f"Ugbusy.r{r:04d}", "vidbusy0001", f"UCauthor{r + 1:06d}", f"@user{r}", "reply",
+                            parent_id="Ugbusy")
+
+    with FakeYouTubeServer(dataset) as server:
+        analyzer = ya.YouTubeAnalyzer("fake-key", api_endpoint=server.endpoint)
+        comments, edges = analyzer.analyze_comments("vidbusy0001", "UCbusyThreadChannel000001", max_comments=150)
+
+    assert len(comments) == 150 and len(edges) == 149
+    assert len({c["comment_id"] for c in comments}) == 150
+    # One commentThreads page, then only the two reply pages the allowance needs (not all ten)
+    assert server.stats["requests"] == {"commentThreads.list": 1, "comments.list": 2}
+    assert server.stats["quota_used"] == 3
+
+
+def test_analyze_channel_resolves_handle():
+    dataset = FakeYouTubeDataset.synthetic(num_videos=3, threads_per_video=40, seed=3)
+
+    with FakeYouTubeServer(dataset) as server:
+        analyzer = ya.YouTubeAnalyzer("fake-key", api_endpoint=server.endpoint)
+        result = analyzer.analyze("https://www.youtube.com/@syntheticchannel")
+
+    assert result["success"], result
+    assert result["data"]["videos_analyzed"] == 3
+    assert result["data"]["total_comments"] == dataset.total_comments
+
+
+def test_quota_error_then_resume_from_checkpoint():
+    dataset = FakeYouTubeDataset.synthetic(num_videos=4, threads_per_video=150, seed=11)
+    cache_dir = tempfile.mkdtemp()
+    try:
+        checkpoint = CrawlCheckpoint("test-job", cache_dir=cache_dir)
+        url = "https://www.youtube.com/@syntheticchannel"
+
+        with FakeYouTubeServer(dataset, quota_limit=215) as server:
+            analyzer = ya.YouTubeAnalyzer("fake-key", api_endpoint=server.endpoint)
+            first = analyzer.analyze(url, checkpoint=checkpoint)
+        assert not first["success"]
+        assert checkpoint.load_job() is not None
+
+        with FakeYouTubeServer(dataset) as server:
+            analyzer = ya.YouTubeAnalyzer("fake-key", api_endpoint=server.endpoint,
+                                          quota_budget=QuotaBudget(None))
+            second = analyzer.analyze(url, checkpoint=checkpoint)
+
+        assert second["success"], second
+        assert second["data"]["total_comments"] == dataset.total_comments
+        # Resumed run must not repeat the channel search
+        assert "search.list" not in server.stats["requests"]
+        assert checkpoint.load_job() is None
+    finally:
+        shutil.rmtree(cache_dir)
+
+
+def test_expired_video_checkpoint_is_not_resumed():
+    dataset = FakeYouTubeDataset.synthetic(num_videos=1, threads_per_video=250, seed=13)
+    video_id = next(iter(dataset.videos))
+    url = f"https://www.youtube.com/watch?v={video_id}"
+    cache_dir = tempfile.mkdtemp()
+    try:
+        with FakeYouTubeServer(dataset, quota_limit=3) as server:
+            analyzer = ya.YouTubeAnalyzer("fake-key", api_endpoint=server.endpoint)
+            first = analyzer.analyze(url, checkpoint=CrawlCheckpoint("video-job", cache_dir=cache_dir))
+        assert not first["success"]
+        assert CrawlCheckpoint("video-job", cache_dir=cache_dir).load_video(video_id)["page_token"]
+
+        expired = CrawlCheckpoint("video-job", cache_dir=cache_dir, max_age_hours=0)
+        with FakeYouTubeServer(dataset) as server:
+            analyzer = ya.YouTubeAnalyzer("fake-key", api_endpoint=server.endpoint,
+                                          quota_budget=QuotaBudget(None))
+            second = analyzer.analyze(url, checkpoint=expired)
+
+        assert second["success"], second
+        assert second["data"]["total_comments"] == dataset.total_comments
+        # Crawled from the first page again, not from the stale page token
+        assert server.stats["requests"]["commentThreads.list"] == 3
+        assert expired.load_video(video_id) is None
+    finally:
+        shutil.rmtree(cache_dir)
+
+
+def test_comments_disabled_video_does_not_fail_the_channel():
+    dataset = FakeYouTubeDataset.synthetic(num_videos=3, threads_per_video=40, seed=3)
+    disabled = dataset.channel_videos["UCfakeSyntheticChannel0001"][1]
+    dataset.comments_disabled.add(disabled)
+    cache_dir = tempfile.mkdtemp()
+    try:
+        checkpoint = CrawlCheckpoint("disabled-job", cache_dir=cache_dir)
+        with FakeYouTubeServer(dataset) as server:
+            analyzer = ya.YouTubeAnalyzer("fake-key", api_endpoint=server.endpoint)
+            result = analyzer.analyze("https://www.youtube.com/@syntheticchannel", checkpoint=checkpoint)
+
+        assert result["success"], result
+        assert result["data"]["videos_analyzed"] == 3
+        disabled_comments = sum(c["video_id"] == disabled for c in dataset.comments.values())
+        assert result["data"]["total_comments"] == dataset.total_comments - disabled_comments
+        assert server.stats["errors"] == 1
+        assert checkpoint.load_job() is None
+    finally:
+        shutil.rmtree(cache_dir)
+
+
+def test_analysis_metrics_trace():
+    dataset = FakeYouTubeDataset.synthetic(num_videos=2, threads_per_video=60, seed=5)
+
+    with FakeYouTubeServer(dataset) as server:
+        analyzer = ya.YouTubeAnalyzer("fake-key", api_endpoint=server.endpoint)
+        result = analyzer.analyze("https://www.youtube.com/@syntheticchannel")
+
+    metrics = result["data"]["metrics"]
+    assert {"channel_lookup", "comment_fetch", "feature_extraction", "sentiment",
+            "community_detection", "rendering"} <= set(metrics["stages"])
+    assert metrics["stages"]["feature_extraction"]["items"] >= dataset.total_comments
+    assert metrics["api"]["commentThreads.list"]["calls"] == server.stats["requests"]["commentThreads.list"]
+    assert metrics["api_units"] == server.stats["quota_used"]
+    assert metrics["api_bytes"] > 0
+    assert 'orbitlink_youtube_api_requests_total{endpoint="search.list",status="200"}' in REGISTRY.render()
+
+
+def test_job_profiler_captures_stacks_and_allocations():
+    dataset = FakeYouTubeDataset.synthetic(num_videos=1, threads_per_video=150, seed=9)
+    video_id = next(iter(dataset.videos))
+
+    with FakeYouTubeServer(dataset) as server:
+        analyzer = ya.YouTubeAnalyzer("fake-key", api_endpoint=server.endpoint)
+        with JobProfiler(interval=0.001, worker_prefixes=(ya.REPLY_WORKER_PREFIX,)) as profiler:
+            analyzer.analyze(f"https://www.youtube.com/watch?v={video_id}")
+
+    profile = profiler.result
+    assert profile["samples"] > 0
+    lines = profile["collapsed_stacks"].splitlines()
+    assert lines and all(line.rsplit(" ", 1)[1].isdigit() for line in lines)
+    assert any("services.youtube_analyzer:analyze_comments" in line for line in lines)
+    assert any(line.startswith(ya.REPLY_WORKER_PREFIX) for line in lines)
+    assert profile["top_allocations"]
+
+
+def test_analysis_cache_tiers():
+    dataset = FakeYouTubeDataset.synthetic(num_videos=1, threads_per_video=80, seed=11)
+    video_id = next(iter(dataset.videos))
+
+    with FakeYouTubeServer(dataset) as server:
+        analyzer = ya.YouTubeAnalyzer("fake-key", api_endpoint=server.endpoint)
+        result = analyzer.analyze(f"https://www.youtube.com/watch?v={video_id}")
+
+    key = f"video:{video_id}|test"
+    cache = AnalysisCache(ttl_hours=1, raw_ttl_hours=24)
+    cache.invalidate(key)
+    cache.put(key, ya.MODEL_VERSION, result["data"], result["raw"])
+
+    tier, cached = cache.lookup(key, ya.MODEL_VERSION)
+    assert tier == "result" and cached["total_comments"] == result["data"]["total_comments"]
+
+    # A new model version falls back to the cached crawl, rebuilt without API calls
+    tier, raw = cache.lookup(key, "other-model")
+    assert tier == "raw" and len(raw["comments"]) == len(result["raw"]["comments"])
+    rebuilt = ya.YouTubeAnalyzer("fake-key", api_endpoint="http://127.0.0.1:9").analyze_raw(raw)
+    assert rebuilt["success"] and rebuilt["data"]["total_comments"] == result["data"]["total_comments"]
+    assert rebuilt["data"]["metrics"]["api_calls"] == 0
+
+    assert next(e for e in cache.stats() if e["key"] == key)["hits"] == {"result": 1, "raw": 1}
+    AnalysisCache(max_entries=0).evict()
+    assert cache.lookup(key, ya.MODEL_VERSION) == (None, None)
+
+
+def test_analysis_job_streams_progress_and_partials():
+    dataset = FakeYouTubeDataset.synthetic(num_videos=2, threads_per_video=150, seed=13)
+    job = AnalysisJob("job", "user", 1, "https://www.youtube.com/@syntheticchannel")
+
+    with FakeYouTubeServer(dataset) as server:
+        analyzer = ya.YouTubeAnalyzer("fake-key", api_endpoint=server.endpoint)
+        result = analyzer.analyze(job.input_url, job.progress_callback, partial_callback=job.partial_callback)
+    job.finish(result)
+
+    events = job.events_after(0)
+    kinds = [e["data"]["kind"] for e in events if e["event"] == "partial"]
+    assert kinds.index("comments") < kinds.index("influencers") < kinds.index("communities")
+    collected = [e["data"]["collected"] for e in events if e["event"] == "partial" and e["data"]["kind"] == "comments"]
+    assert collected == sorted(collected) and collected[-1] == result["data"]["total_comments"]
+    assert events[-1]["event"] == "complete" and job.snapshot()["status"] == "done"
+    assert job.events_after(events[-1]["seq"], timeout=1) == []
+    assert sse_message(events[0]).startswith(f"id: {events[0]['seq']}\nevent: progress\ndata: ")
+
+
+def test_community_members_match_aggregates():
+    dataset = FakeYouTubeDataset.synthetic(num_videos=1, threads_per_video=150, seed=17)
+    video_id = next(iter(dataset.videos))
+
+    with FakeYouTubeServer(dataset) as server:
+        analyzer = ya.YouTubeAnalyzer("fake-key", api_endpoint=server.endpoint)
+        result = analyzer.analyze(f"https://www.youtube.com/watch?v={video_id}")
+
+    communities = result["data"]["community_detection"]
+    members = communities["members"]
+    replied = [i for i in result["data"]["influencers"] if i["indegree"]]
+    assert replied and all(i["pagerank"] > 0 and i["core_number"] >= 1 for i in replied)
+    assert len(members) == len(communities["user_to_community"])
+    for community in communities["communities"]:
+        own = [m for m in members if m["community_id"] == community["community_id"]]
+        assert len(own) == community["size"]
+        assert sum(m["comment_count"] for m in own) == community["total_comments"]
+        counts = {m["author_display_name"]: m["comment_count"] for m in own}
+        assert [counts[name] for name in community["top_members"]] == sorted(counts.values(), reverse=True)[:5]
+        assert 0 <= community["density"] <= 1
+    roots = {node["path"]: node for node in communities["hierarchy"] if node["parent"] is None}
+    assert any(community["keywords"] for community in communities["communities"])
+    assert all(roots[str(c["community_id"])]["keywords"] == c["keywords"] for c in communities["communities"])
+    for pair in communities["bridges"]["pairs"]:
+        assert pair["communities"][0] < pair["communities"][1]
+        assert all(0 < m["participation"] < 1 for m in pair["bridges"])
+
+
+def test_analysis_compression_roundtrip():
+    dataset = FakeYouTubeDataset.synthetic(num_videos=1, threads_per_video=150, seed=19)
+    video_id = next(iter(dataset.videos))
+
+    with FakeYouTubeServer(dataset) as server:
+        analyzer = ya.YouTubeAnalyzer("fake-key", api_endpoint=server.endpoint)
+        data = analyzer.analyze(f"https://www.youtube.com/watch?v={video_id}")["data"]
+
+    stored = bson.decode(bson.encode({"analysis_data": pack_analysis(data)}))["analysis_data"]
+    assert "community_detection" not in stored and stored["total_comments"] == data["total_comments"]
+    assert len(bson.encode(stored)) < len(bson.encode(data))
+    assert bson.decode(bson.encode(unpack_analysis(stored))) == bson.decode(bson.encode(data))
+
+
+def test_recorded_dataset_loads():
+    dataset = FakeYouTubeDataset.from_csv(RECORDED_COMMENTS_CSV)
+    assert dataset.total_comments > 0
+    assert dataset.videos
+
+
+if __name__ == "__main__":
+    for name, fn in list(globals().items()):
+        if name.startswith("test_") and callable(fn):
+            fn()
+            print(f"[OK] {name}")
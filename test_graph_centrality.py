@@ -0,0 +1,66 @@
+"""
+Tests for the reply-graph centrality engine.
+Run: python -m pytest -q test_graph_centrality.py   (or python test_graph_centrality.py)
+"""
+import networkx as nx
+import numpy as np
+
+from services.graph_centrality import core_numbers, hits, pagerank, reply_graph_centrality, reply_matrix
+
+
+def random_replies(seed=3, users=120, replies=900):
+    rng = np.random.default_rng(seed)
+    edges = [{'from': f"u{a}", 'to': f"u{b}"} for a, b in rng.integers(0, users, (replies, 2))]
+    return edges + [{'from': "u0", 'to': "lurker"}]  # a dangling node
+
+
+def dense(reply_edges):
+    nodes, rows, cols, weights = reply_matrix(reply_edges)
+    A = np.zeros((len(nodes), len(nodes)))
+    A[rows, cols] = weights
+    return nodes, rows, cols, weights, A
+
+
+def test_power_iterations_match_dense_solutions():
+    nodes, rows, cols, weights, A = dense(random_replies())
+    n = len(nodes)
+
+    rank, _ = pagerank(rows, cols, weights, n, tol=1e-12, max_iter=500)
+    out = A.sum(axis=1)
+    P = np.where(out[:, None] > 0, A / np.where(out > 0, out, 1)[:, None], 1 / n)
+    google = 0.85 * P + 0.15 / n
+    values, vectors = np.linalg.eig(google.T)
+    expected = np.real(vectors[:, np.argmax(np.real(values))])
+    assert np.allclose(rank, expected / expected.sum(), atol=1e-9)
+
+    hub, authority, _ = hits(rows, cols, weights, n, tol=1e-12, max_iter=1000)
+    u, _, vt = np.linalg.svd(A)
+    assert np.allclose(hub, np.abs(u[:, 0]) / np.abs(u[:, 0]).sum(), atol=1e-8)
+    assert np.allclose(authority, np.abs(vt[0]) / np.abs(vt[0]).sum(), atol=1e-8)
+
+
+def test_core_numbers_match_networkx():
+    nodes, rows, cols, _, _ = dense(random_replies(seed=5, users=200, replies=700))
+    G = nx.Graph((nodes[a], nodes[b]) for a, b in zip(rows, cols))
+
+    expected = nx.core_number(G)
+    assert list(core_numbers(rows, cols, len(nodes))) == [expected[node] for node in nodes]
+
+
+def test_centrality_ranks_the_replied_to_hub_first():
+    edges = [{'from': f"fan{i}", 'to': "creator"} for i in range(20)]
+    edges += [{'from': "creator", 'to': f"fan{i}"} for i in range(3)] + [{'from': "fan1", 'to': "fan1"}]
+
+    centrality, info = reply_graph_centrality(edges)
+
+    assert max(centrality, key=lambda user: centrality[user]['pagerank']) == "creator"
+    assert max(centrality, key=lambda user: centrality[user]['centrality_score']) == "creator"
+    assert centrality["creator"]['core_number'] == 1
+    assert info['users'] == 21 and reply_graph_centrality([]) == ({}, {'users': 0})
+
+
+if __name__ == "__main__":
+    for name, fn in list(globals().items()):
+        if name.startswith("test_") and callable(fn):
+            fn()
+            print(f"[OK] {name}")
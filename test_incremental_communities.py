@@ -0,0 +1,62 @@
+"""
+Tests for warm-started (incremental) community detection.
+Run: python -m pytest -q test_incremental_communities.py   (or python test_incremental_communities.py)
+"""
+import random
+
+import community as community_louvain
+import networkx as nx
+
+from services.incremental_communities import incremental_partition, relabel_to_previous
+
+
+def planted_graph(groups=6, size=30, seed=1):
+    G = nx.planted_partition_graph(groups, size, 0.3, 0.005, seed=seed)
+    return nx.relabel_nodes(G, {node: f"UC{node:04d}" for node in G})
+
+
+def test_new_nodes_join_existing_communities_with_stable_ids():
+    G = planted_graph()
+    previous = community_louvain.best_partition(G, random_state=3)
+    modularity = community_louvain.modularity(previous, G)
+
+    # A few new commenters replying into one community
+    target = previous["UC0000"]
+    members = [node for node, community in previous.items() if community == target]
+    rng = random.Random(5)
+    for i in range(5):
+        for other in rng.sample(members, 4):
+            G.add_edge(f"UCnew{i}", other, weight=1)
+
+    partition, new_modularity, info = incremental_partition(G, previous, modularity)
+
+    assert info["mode"] == "incremental" and info["new_nodes"] == 5
+    assert info["affected_nodes"] < G.number_of_nodes()
+    assert all(partition[node] == community for node, community in previous.items())
+    assert all(partition[f"UCnew{i}"] == target for i in range(5))
+    assert new_modularity >= modularity - 0.05
+
+
+def test_falls_back_to_relabelled_full_run_on_modularity_drop():
+    G = planted_graph(seed=2)
+    rng = random.Random(7)
+    scrambled = {node: rng.randrange(6) for node in G}
+
+    partition, modularity, info = incremental_partition(G, scrambled, previous_modularity=0.9)
+
+    assert info["mode"] == "full" and info["fallback"] == "modularity_drop"
+    assert modularity > info["incremental_modularity"]
+    assert set(partition.values()) & set(range(6))  # ids carried over from the previous run
+
+
+def test_relabel_keeps_previous_ids_for_best_overlap():
+    previous = {"a": 10, "b": 10, "c": 11, "d": 11}
+    current = {"a": 0, "b": 0, "c": 1, "d": 1, "e": 2}
+    assert relabel_to_previous(current, previous) == {"a": 10, "b": 10, "c": 11, "d": 11, "e": 12}
+
+
+if __name__ == "__main__":
+    for name, fn in list(globals().items()):
+        if name.startswith("test_") and callable(fn):
+            fn()
+            print(f"[OK] {name}")
@@ -0,0 +1,64 @@
+"""
+Tests for the per-job profiler.
+Run: python -m pytest -q test_profiler.py   (or python test_profiler.py)
+"""
+import threading
+import time
+import tracemalloc
+
+from services.profiler import JobProfiler
+
+
+def busy_worker(name, stop):
+    def spin():
+        while not stop.is_set():
+            sum(range(1000))
+    thread = threading.Thread(target=spin, name=name, daemon=True)
+    thread.start()
+    return thread
+
+
+def test_overlapping_profilers_share_tracemalloc_and_sample_their_own_workers():
+    assert not tracemalloc.is_tracing()
+    stop = threading.Event()
+    workers = [busy_worker("reply-expand-a_0", stop), busy_worker("reply-expand-b_0", stop)]
+    first = JobProfiler(interval=0.001, worker_prefixes=("reply-expand-a",))
+    second = JobProfiler(interval=0.001, worker_prefixes=("reply-expand-b",))
+    try:
+        first.__enter__()
+        second.__enter__()
+        time.sleep(0.05)
+        first.__exit__(None, None, None)
+        assert tracemalloc.is_tracing()  # the second job is still running
+        time.sleep(0.05)
+        second.__exit__(None, None, None)
+    finally:
+        stop.set()
+        for worker in workers:
+            worker.join()
+
+    assert not tracemalloc.is_tracing()
+    assert first.result["peak_memory_mb"] is not None and first.result["top_allocations"]
+    assert second.result["peak_memory_mb"] is None and second.result["top_allocations"] == []
+    assert "reply-expand-a;" in first.result["collapsed_stacks"]
+    assert "reply-expand-b" not in first.result["collapsed_stacks"]
+    assert "reply-expand-b;" in second.result["collapsed_stacks"]
+    assert "reply-expand-a" not in second.result["collapsed_stacks"]
+
+
+def test_profiler_errors_never_reach_the_job():
+    profiler = JobProfiler(interval=0.001)
+    with profiler:
+        tracemalloc.stop()  # e.g. stopped behind the profiler's back
+    assert profiler.result["peak_memory_mb"] is None
+
+    with JobProfiler(interval=0.001) as broken:
+        broken._sampler.collapsed = None
+    assert broken.result is None and not tracemalloc.is_tracing()
+
+
+if __name__ == "__main__":
+    for name, fn in list(globals().items()):
+        if name.startswith("test_") and callable(fn):
+            fn()
+            print(f"[OK] {name}")
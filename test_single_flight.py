@@ -0,0 +1,74 @@
+"""
+Tests for request coalescing (services/single_flight.py).
+Run: python -m pytest -q test_single_flight.py   (or python test_single_flight.py)
+"""
+import copy
+import threading
+import time
+
+from services.single_flight import SingleFlight
+from services.youtube_analyzer import YouTubeAnalyzer
+
+
+def test_concurrent_calls_share_one_execution():
+    flights = SingleFlight(copy_result=copy.deepcopy)
+    calls = []
+    results = []
+
+    def crawl():
+        calls.append(1)
+        time.sleep(0.2)
+        return {"data": {"total_comments": 42}}
+
+    def request():
+        results.append(flights.do("channel:UCabc", crawl))
+
+    threads = [threading.Thread(target=request) for _ in range(5)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert len(calls) == 1
+    assert sorted(shared for _, shared in results) == [False, True, True, True, True]
+    # Every caller owns its copy
+    results[0][0]["data"]["total_comments"] = 0
+    assert results[1][0]["data"]["total_comments"] == 42
+    assert flights.in_flight() == {}
+
+
+def test_errors_reach_every_waiter():
+    flights = SingleFlight()
+    errors = []
+
+    def failing():
+        time.sleep(0.1)
+        raise RuntimeError("quota exceeded")
+
+    def request():
+        try:
+            flights.do("video:abc", failing)
+        except RuntimeError as e:
+            errors.append(str(e))
+
+    threads = [threading.Thread(target=request) for _ in range(3)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert errors == ["quota exceeded"] * 3
+
+
+def test_canonical_target_normalizes_inputs():
+    analyzer = YouTubeAnalyzer("fake-key", api_endpoint="http://127.0.0.1:9")
+    assert analyzer.canonical_target("https://youtu.be/dQw4w9WgXcQ") == \
+        analyzer.canonical_target("https://www.youtube.com/watch?v=dQw4w9WgXcQ&t=10") == "video:dQw4w9WgXcQ"
+    assert analyzer.canonical_target("https://www.youtube.com/@SomeChannel/videos") == \
+        analyzer.canonical_target("youtube.com/@somechannel") == "handle:somechannel"
+
+
+if __name__ == "__main__":
+    for name, fn in list(globals().items()):
+        if name.startswith("test_") and callable(fn):
+            fn()
+            print(f"[OK] {name}")
@@ -0,0 +1,27 @@
+"""
+Checks that the synthetic benchmark corpus matches the analyzer's comment shape.
+Run: python -m pytest -q test_synthetic_corpus.py   (or python test_synthetic_corpus.py)
+"""
+from benchmarks.synthetic_corpus import COMMENT_FIELDS, SyntheticCorpus
+
+
+def test_records_match_analyzer_shape():
+    comments, edges = SyntheticCorpus(num_comments=2000, num_videos=4, seed=1).generate()
+
+    assert len(comments) == 2000
+    assert all(list(c.keys()) == COMMENT_FIELDS for c in comments)
+    assert len({c["comment_id"] for c in comments}) == len(comments)
+    assert len(edges) == sum(c["is_reply"] for c in comments)
+
+
+def test_deterministic_per_seed():
+    first, _ = SyntheticCorpus(num_comments=500, num_videos=2, seed=5).generate()
+    second, _ = SyntheticCorpus(num_comments=500, num_videos=2, seed=5).generate()
+    assert first == second
+
+
+if __name__ == "__main__":
+    for name, fn in list(globals().items()):
+        if name.startswith("test_") and callable(fn):
+            fn()
+            print(f"[OK] {name}")
@@ -25,4 +25,18 @@ if api_key and api_key != "I have uploaded actually":
     except Exception as e:
         print(f"❌ YouTube API error: {e}")
 else:
-    print("❌ Invalid API key. Please update your .env file with a valid YouTube API key")
\ No newline at end of file
+    print("❌ Invalid API key. Please update your .env file with a valid YouTube API key")
+    print("→ Checking the client against the local fake YouTube API instead...")
+    from benchmarks.fake_youtube_api import FakeYouTubeDataset, FakeYouTubeServer
+
+    with FakeYouTubeServer(FakeYouTubeDataset.synthetic(num_videos=1, threads_per_video=10)) as server:
+        youtube = build('youtube', 'v3', developerKey='fake-key',
+                        client_options={'api_endpoint': server.endpoint})
+        response = youtube.search().list(
+            part="snippet",
+            q="synthetic",
+            maxResults=1,
+            type="channel"
+        ).execute()
+        print("✅ Fake YouTube API connection successful!")
+        print(f"Found {len(response.get('items', []))} items")
\ No newline at end of file
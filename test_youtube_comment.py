@@ -0,0 +1,84 @@
+"""
+Tests for the normalized youtube_comments store.
+Run: python -m pytest -q test_youtube_comment.py   (or python test_youtube_comment.py)
+"""
+from datetime import datetime
+
+from pymongo import UpdateOne
+
+import entity.youtube_comment as youtube_comment
+from benchmarks.synthetic_corpus import SyntheticCorpus
+from entity.youtube_comment import YouTubeComment
+
+SEEN_AT = datetime(2026, 1, 2, 3, 4, 5)
+# Everything the store may $set; derived text features (text_length, ...) are not stored
+STORED_FIELDS = {"video_id", "author_id", "author_name", "text", "like_count", "is_reply", "parent_id",
+                 "is_channel_owner", "total_reply_count", "published_at", "updated_at", "last_seen_at"}
+
+
+class FixedClock(datetime):
+    @classmethod
+    def utcnow(cls):
+        return SEEN_AT
+
+
+class BulkResult:
+    def __init__(self, operations):
+        self.upserted_count = len(operations)
+        self.matched_count = 0
+        self.modified_count = 0
+
+
+class StubCollection:
+    def __init__(self):
+        self.calls = []
+
+    def bulk_write(self, operations, ordered=True):
+        self.calls.append((operations, ordered))
+        return BulkResult(operations)
+
+
+class StubDatabase:
+    def __init__(self):
+        self.youtube_comments = StubCollection()
+
+
+def stored_set(comment):
+    doc = {field: comment.get(field) for field in STORED_FIELDS}
+    doc["published_at"] = datetime.fromisoformat(comment["published_at"].replace("Z", ""))
+    doc["updated_at"] = datetime.fromisoformat(comment["updated_at"].replace("Z", ""))
+    doc["last_seen_at"] = SEEN_AT
+    return doc
+
+
+def upsert(comment, set_doc):
+    return UpdateOne({"comment_id": comment["comment_id"]},
+                     {"$set": set_doc, "$setOnInsert": {"first_seen_at": SEEN_AT}}, upsert=True)
+
+
+def test_comment_store_upserts_by_comment_id():
+    comments, _ = SyntheticCorpus(num_comments=50, num_videos=1, seed=2).generate()
+    db = StubDatabase()
+    original = youtube_comment.get_connection, youtube_comment.datetime
+    youtube_comment.get_connection, youtube_comment.datetime = (lambda: db), FixedClock
+    try:
+        counts = YouTubeComment.upsert_many(comments, batch_size=20)
+    finally:
+        youtube_comment.get_connection, youtube_comment.datetime = original
+
+    assert counts == {"upserted": 50, "matched": 0, "modified": 0}
+    assert [len(operations) for operations, _ in db.youtube_comments.calls] == [20, 20, 10]
+    assert all(ordered is False for _, ordered in db.youtube_comments.calls)
+    # UpdateOne equality compares the $set documents: exactly STORED_FIELDS were written
+    operations = [op for batch, _ in db.youtube_comments.calls for op in batch]
+    assert operations == [upsert(comment, stored_set(comment)) for comment in comments]
+    assert "text_length" not in STORED_FIELDS
+    assert operations != [upsert(comment, dict(stored_set(comment), text_length=comment["text_length"]))
+                          for comment in comments]
+
+
+if __name__ == "__main__":
+    for name, fn in list(globals().items()):
+        if name.startswith("test_") and callable(fn):
+            fn()
+            print(f"[OK] {name}")